@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多账号并发执行模块
+
+各平台脚本共用的多账号执行器：
+- 按平台配置的并发数同时处理多个账号（默认 1，保持原有的逐个执行行为）
+- 每个账号开始前按各自的随机延时错开，避免同一时刻集中请求
+- 结果按账号配置顺序返回，可直接填入原有的汇总结构，推送内容不变
+
+并发数配置优先级：
+    token.json 平台节点中的 concurrency > 环境变量 <平台>_CONCURRENCY > 环境变量 CHECKIN_CONCURRENCY > 1
+
+由统一入口（orchestrator.py）调度时，run_accounts 会把账号任务提交到
+AccountScheduler 的共享线程池，受全局并发上限和平台并发上限共同约束。
+
+使用示例：
+    from account_runner import resolve_concurrency, run_accounts
+
+    results = run_accounts(
+        accounts,
+        process_account,
+        concurrency=resolve_concurrency("sf", sf_config),
+        delay_range=(3, 8),
+    )
+
+Author: ZaiZaiCat
+Date: 2026-10-17
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+logger = logging.getLogger("AccountRunner")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_CONCURRENCY = 1            # 默认并发数（逐个执行）
+MAX_CONCURRENCY = 16               # 并发数上限，避免误配置压垮目标站点
+
+# 当前线程绑定的 (调度器, 平台标识)，由 AccountScheduler.bind 设置
+_binding = threading.local()
+
+
+class AccountScheduler:
+    """
+    多平台共享的账号调度器
+
+    所有平台的账号任务提交到同一个线程池，线程池大小即全局并发上限；
+    每次 run_accounts 调用另有平台级并发上限，超出部分在提交前排队等待。
+    """
+
+    def __init__(self, max_workers: int, platform_limits: Optional[Dict[str, int]] = None):
+        """
+        初始化调度器
+
+        Args:
+            max_workers: 全局并发上限
+            platform_limits: 平台并发上限，配置后覆盖平台自身的并发数
+        """
+        self.max_workers = max(1, int(max_workers))
+        self.platform_limits = {
+            key: max(1, min(MAX_CONCURRENCY, int(value)))
+            for key, value in (platform_limits or {}).items()
+        }
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scheduler")
+        self._results: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def platform_limit(self, platform: str, requested: int) -> int:
+        """
+        计算平台实际可用的并发数
+
+        Args:
+            platform: 平台标识
+            requested: 平台自身配置的并发数
+
+        Returns:
+            int: 平台并发数，不超过全局并发上限
+        """
+        limit = self.platform_limits.get(platform, requested)
+        return max(1, min(int(limit), self.max_workers))
+
+    @contextmanager
+    def bind(self, platform: str) -> Iterator["AccountScheduler"]:
+        """
+        在当前线程内把 run_accounts 的执行交给本调度器
+
+        Args:
+            platform: 平台标识
+        """
+        previous = getattr(_binding, "value", None)
+        _binding.value = (self, platform)
+        try:
+            yield self
+        finally:
+            _binding.value = previous
+
+    def run(self, platform: str, tasks: Sequence[Callable[[], R]], concurrency: int) -> List[R]:
+        """
+        在共享线程池中执行一个平台的账号任务
+
+        Args:
+            platform: 平台标识
+            tasks: 无参任务列表，每个任务处理一个账号
+            concurrency: 平台自身配置的并发数
+
+        Returns:
+            List[R]: 与 tasks 顺序一致的结果列表
+        """
+        slots = threading.BoundedSemaphore(self.platform_limit(platform, concurrency))
+
+        def run_task(task: Callable[[], R]) -> R:
+            try:
+                return task()
+            finally:
+                slots.release()
+
+        futures = []
+        for task in tasks:
+            slots.acquire()
+            futures.append(self._executor.submit(run_task, task))
+        results = [future.result() for future in futures]
+
+        with self._lock:
+            self._results.setdefault(platform, []).extend(results)
+        return results
+
+    def account_results(self, platform: str) -> List[Any]:
+        """获取平台已完成的账号结果"""
+        with self._lock:
+            return list(self._results.get(platform, []))
+
+    def shutdown(self) -> None:
+        """关闭共享线程池"""
+        self._executor.shutdown(wait=True)
+
+
+def resolve_concurrency(platform: str, platform_config: Optional[Dict[str, Any]] = None,
+                        default: int = DEFAULT_CONCURRENCY) -> int:
+    """
+    解析平台的账号并发数
+
+    Args:
+        platform: 平台标识，如 "sf"、"smzdm"，用于拼接环境变量名
+        platform_config: token.json 中该平台的配置节点
+        default: 未配置时的默认并发数
+
+    Returns:
+        int: 并发数，范围 [1, MAX_CONCURRENCY]
+    """
+    candidates = [
+        (platform_config or {}).get("concurrency"),
+        os.environ.get(f"{platform.upper()}_CONCURRENCY"),
+        os.environ.get("CHECKIN_CONCURRENCY"),
+    ]
+    for value in candidates:
+        if value is None or value == "":
+            continue
+        try:
+            return max(1, min(MAX_CONCURRENCY, int(value)))
+        except (TypeError, ValueError):
+            logger.warning(f"并发数配置无效: {value}，已忽略")
+    return max(1, min(MAX_CONCURRENCY, int(default)))
+
+
+def run_accounts(
+    accounts: Sequence[T],
+    worker: Callable[[T], R],
+    *,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    delay_range: Tuple[float, float] = (0.0, 0.0),
+    on_error: Optional[Callable[[T, int, Exception], R]] = None,
+    run_logger: Optional[logging.Logger] = None,
+) -> List[R]:
+    """
+    按并发数执行所有账号
+
+    第 1 个账号立即开始，其余账号在获得执行槽位后先随机等待 delay_range 秒再开始；
+    并发数为 1 时等价于原来"处理一个账号 → 延时 → 处理下一个账号"的串行流程。
+
+    Args:
+        accounts: 账号列表
+        worker: 处理单个账号的函数，返回该账号的结果
+        concurrency: 同时处理的账号数
+        delay_range: 账号开始前的随机延时范围（秒）
+        on_error: worker 抛出异常时生成该账号结果的函数，参数为 (账号, 序号, 异常)；
+            为 None 时异常向上抛出
+        run_logger: 输出进度日志使用的日志器
+
+    Returns:
+        List[R]: 与 accounts 顺序一致的结果列表
+    """
+    log = run_logger or logger
+    total = len(accounts)
+    if total == 0:
+        return []
+
+    concurrency = max(1, min(int(concurrency), total))
+    binding = getattr(_binding, "value", None)
+    if binding is None and concurrency > 1:
+        log.info(f"🚀 并发执行 {total} 个账号，并发数 {concurrency}")
+
+    def run_one(index: int, account: T) -> R:
+        if index > 1 and delay_range[1] > 0:
+            delay = random.uniform(*delay_range)
+            log.info(f"⏳ 第 {index}/{total} 个账号延时 {delay:.2f} 秒后开始...")
+            time.sleep(delay)
+
+        log.info(f"\n{'=' * 60}")
+        log.info(f"处理第 {index}/{total} 个账号")
+        log.info(f"{'=' * 60}")
+        try:
+            return worker(account)
+        except Exception as e:
+            if on_error is None:
+                raise
+            log.error(f"❌ 处理第 {index} 个账号时发生错误: {e}", exc_info=True)
+            return on_error(account, index, e)
+
+    if binding is not None:
+        scheduler, platform = binding
+        tasks = [partial(run_one, index, account) for index, account in enumerate(accounts, 1)]
+        return scheduler.run(platform, tasks, concurrency)
+
+    if concurrency == 1:
+        return [run_one(index, account) for index, account in enumerate(accounts, 1)]
+
+    results: List[Optional[R]] = [None] * total
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="account") as executor:
+        futures = [
+            executor.submit(run_one, index, account)
+            for index, account in enumerate(accounts, 1)
+        ]
+        for position, future in enumerate(futures):
+            results[position] = future.result()
+    return results  # type: ignore[return-value]
@@ -43,14 +43,87 @@ Date: 2025-12-08
 
 import os
 import json
+import random
 import requests
 import logging
+import atexit
 import base64
 import hashlib
 import hmac
+import sqlite3
+import threading
 import time
-from typing import Optional, Dict, Any
-from urllib.parse import quote_plus
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Callable, Iterable, Iterator, List, Mapping, Tuple
+from urllib.parse import quote_plus, urlparse
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import fcntl
+except ImportError:  # Windows 下无 fcntl，退化为不加锁
+    fcntl = None
+
+
+# 并发推送默认参数
+DEFAULT_MAX_WORKERS = 4            # 并发推送的最大线程数
+DEFAULT_SEND_DEADLINE = 30         # 调用方等待推送结果的截止时间（秒）
+
+# 连接池默认参数
+DEFAULT_POOL_CONNECTIONS = 4       # 每个会话缓存的连接池数量
+DEFAULT_POOL_MAXSIZE = 4           # 每个连接池保持的最大连接数
+DEFAULT_MAX_RETRIES = 2            # 连接失败时的重试次数
+DEFAULT_RETRY_BACKOFF = 0.5        # 重试退避系数（秒）
+
+# 企业微信应用 access_token 缓存参数
+QYWX_TOKEN_CACHE_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'config', 'qywx_token_cache.json'
+)
+QYWX_TOKEN_EXPIRY_MARGIN = 300     # 提前刷新的安全余量（秒）
+QYWX_TOKEN_INVALID_CODES = (40014, 42001)  # access_token 无效 / 已过期
+
+# 汇总推送参数
+DIGEST_SPOOL_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'config', 'notification_spool.jsonl'
+)
+DIGEST_SEPARATOR = "\n\n━━━━━━━━━━━━━━━━\n\n"
+
+# 发件箱参数
+OUTBOX_DB_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'config', 'notification_outbox.db'
+)
+OUTBOX_LEASE_SECONDS = 120         # 单条消息投递租约，防止多个进程重复投递
+
+# 限流参数
+RATE_LIMIT_DB_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'config', 'notification_ratelimit.db'
+)
+
+# 各渠道默认限流（每分钟消息数），未列出的渠道不限流；可通过 ratelimit.limits 覆盖
+DEFAULT_CHANNEL_RATE_LIMITS: Dict[str, float] = {
+    'dingtalk': 20,                # 钉钉自定义机器人每分钟最多 20 条
+    'qywx_robot': 20,              # 企业微信群机器人每分钟最多 20 条
+    'feishu': 100,                 # 飞书自定义机器人每分钟最多 100 条
+    'telegram': 20,                # Telegram 同一会话每分钟约 20 条
+    'server': 5,                   # Server酱 Turbo 短时间内频繁推送会被限制
+    'pushplus': 5,                 # PushPlus 短时间内频繁推送会被限制
+    'qmsg': 5,                     # Qmsg酱 短时间内频繁推送会被限制
+}
+
+# 各渠道单条消息内容长度上限: 渠道 -> (上限, 是否按UTF-8字节计算)
+# 未列出的渠道不拆分；上限已为标题等额外内容预留余量
+CHANNEL_CONTENT_LIMITS: Dict[str, Tuple[int, bool]] = {
+    'telegram': (3800, False),     # Telegram sendMessage 上限 4096 字符
+    'dingtalk': (18000, True),     # 钉钉机器人文本消息上限 20000 字节
+    'qywx_robot': (2000, True),    # 企业微信群机器人文本消息上限 2048 字节
+    'bark': (3000, True),          # APNs 负载上限 4KB
+    'server': (30000, True),       # Server酱 desp 上限 32KB
+    'feishu': (30000, True),       # 飞书机器人请求体上限 30KB
+}
 
 
 # 推送级别常量
@@ -98,165 +171,400 @@ class NotificationSound:
     UPDATE = "update"
 
 
-class NotificationManager:
-    """青龙面板通知推送管理器"""
-
-    def __init__(self):
-        """初始化推送管理器"""
-        self.logger = logging.getLogger("NotificationManager")
-        self.config_from_file = self._load_config_from_file()
-
-        self.bark_config = self._load_bark_config()
-        self.server_config = self._load_server_config()
-        self.coolpush_config = self._load_coolpush_config()
-        self.qmsg_config = self._load_qmsg_config()
-        self.telegram_config = self._load_telegram_config()
-        self.feishu_config = self._load_feishu_config()
-        self.dingtalk_config = self._load_dingtalk_config()
-        self.qywx_config = self._load_qywx_config()
-        self.pushplus_config = self._load_pushplus_config()
-        self.gotify_config = self._load_gotify_config()
-        self.ntfy_config = self._load_ntfy_config()
-        self.pushdeer_config = self._load_pushdeer_config()
-
-    def _load_config_from_file(self) -> Dict:
-        """从JSON文件中加载配置"""
-        config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config', 'notification.json')
-        if os.path.exists(config_path):
-            with open(config_path, 'r', encoding='utf-8') as f:
-                try:
-                    return json.load(f)
-                except json.JSONDecodeError:
-                    self.logger.error(f"❌ 配置文件 {config_path} 格式错误")
-                    return {}
-        return {}
-
-    def _get_config_value(self, service: str, key: str, env_var: str, default: Any = None) -> Any:
-        """
-        获取配置值，优先级: 文件 > 环境变量 > 默认值
-        """
-        # 1. 从文件配置中获取
-        file_config = self.config_from_file.get(service, {})
-        value = file_config.get(key)
-
-        # 如果值是字符串，去除首尾空格
-        if isinstance(value, str):
-            value = value.strip()
-
-        # 文件中有非空值，则直接返回
-        if value is not None and value != '':
-            return value
-
-        # 2. 从环境变量中获取
-        env_value = os.environ.get(env_var, '').strip()
-        if env_value:
-            # 对布尔类型的环境变量进行特殊处理
-            if isinstance(default, bool):
-                return env_value.lower() == 'true'
-            return env_value
-
-        # 3. 返回默认值
-        return default
-
-
-    def _load_bark_config(self) -> Dict[str, str]:
-        """加载Bark配置"""
-        return {
-            'push': self._get_config_value('bark', 'push', 'BARK_PUSH', ''),
-            'icon': self._get_config_value('bark', 'icon', 'BARK_ICON', ''),
-            'sound': self._get_config_value('bark', 'sound', 'BARK_SOUND', 'birdsong'),
-            'group': self._get_config_value('bark', 'group', 'BARK_GROUP', ''),
-            'level': self._get_config_value('bark', 'level', 'BARK_LEVEL', ''),
-            'url': self._get_config_value('bark', 'url', 'BARK_URL', ''),
-        }
-
-    def _load_server_config(self) -> Dict[str, str]:
-        """加载Server酱配置"""
-        return {
-            'sckey': self._get_config_value('server', 'sckey', 'SCKEY', ''),
-            'sendkey': self._get_config_value('server', 'sendkey', 'SENDKEY', ''),
-        }
-
-    def _load_coolpush_config(self) -> Dict[str, Any]:
-        """加载CoolPush配置"""
-        return {
-            'skey': self._get_config_value('coolpush', 'skey', 'COOLPUSH_SKEY', ''),
-            'qq': self._get_config_value('coolpush', 'qq', 'COOLPUSH_QQ', True),
-            'wx': self._get_config_value('coolpush', 'wx', 'COOLPUSH_WX', False),
-            'email': self._get_config_value('coolpush', 'email', 'COOLPUSH_EMAIL', False),
-        }
+# 推送配置文件路径
+NOTIFICATION_CONFIG_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'config', 'notification.json'
+)
+
+# 各分区配置项定义: 分区 -> ((配置键, 环境变量, 默认值), ...)
+# 取值优先级: 文件 > 环境变量 > 默认值；默认值的类型决定取值的类型转换
+CONFIG_SPEC: Dict[str, Tuple[Tuple[str, str, Any], ...]] = {
+    'bark': (
+        ('push', 'BARK_PUSH', ''),
+        ('icon', 'BARK_ICON', ''),
+        ('sound', 'BARK_SOUND', 'birdsong'),
+        ('group', 'BARK_GROUP', ''),
+        ('level', 'BARK_LEVEL', ''),
+        ('url', 'BARK_URL', ''),
+    ),
+    'server': (
+        ('sckey', 'SCKEY', ''),
+        ('sendkey', 'SENDKEY', ''),
+    ),
+    'coolpush': (
+        ('skey', 'COOLPUSH_SKEY', ''),
+        ('qq', 'COOLPUSH_QQ', True),
+        ('wx', 'COOLPUSH_WX', False),
+        ('email', 'COOLPUSH_EMAIL', False),
+    ),
+    'qmsg': (
+        ('key', 'QMSG_KEY', ''),
+        ('type', 'QMSG_TYPE', 'private'),
+    ),
+    'telegram': (
+        ('bot_token', 'TG_BOT_TOKEN', ''),
+        ('user_id', 'TG_USER_ID', ''),
+        ('api_host', 'TG_API_HOST', ''),
+        ('proxy', 'TG_PROXY', ''),
+    ),
+    'feishu': (
+        ('key', 'FSKEY', ''),
+    ),
+    'dingtalk': (
+        ('access_token', 'DINGTALK_ACCESS_TOKEN', ''),
+        ('secret', 'DINGTALK_SECRET', ''),
+    ),
+    'qywx': (
+        ('key', 'QYWX_KEY', ''),
+        ('corpid', 'QYWX_CORPID', ''),
+        ('agentid', 'QYWX_AGENTID', ''),
+        ('corpsecret', 'QYWX_CORPSECRET', ''),
+        ('touser', 'QYWX_TOUSER', ''),
+        ('media_id', 'QYWX_MEDIA_ID', ''),
+        ('origin', 'QYWX_ORIGIN', ''),
+        ('token_cache', 'QYWX_TOKEN_CACHE', True),
+    ),
+    'pushplus': (
+        ('token', 'PUSHPLUS_TOKEN', ''),
+        ('topic', 'PUSHPLUS_TOPIC', ''),
+    ),
+    'gotify': (
+        ('url', 'GOTIFY_URL', ''),
+        ('token', 'GOTIFY_TOKEN', ''),
+        ('priority', 'GOTIFY_PRIORITY', '3'),
+    ),
+    'ntfy': (
+        ('url', 'NTFY_URL', 'https://ntfy.sh'),
+        ('topic', 'NTFY_TOPIC', ''),
+        ('priority', 'NTFY_PRIORITY', '3'),
+    ),
+    'pushdeer': (
+        ('pushkey', 'PUSHDEER_PUSHKEY', ''),
+        ('url', 'PUSHDEER_URL', 'https://api2.pushdeer.com/message/push'),
+        ('type', 'PUSHDEER_TYPE', 'text'),
+    ),
+    'digest': (
+        ('enabled', 'NOTIFY_DIGEST', False),
+        ('spool_file', 'NOTIFY_DIGEST_SPOOL', DIGEST_SPOOL_FILE),
+        ('title', 'NOTIFY_DIGEST_TITLE', '📬 签到任务汇总'),
+    ),
+    'outbox': (
+        ('enabled', 'NOTIFY_OUTBOX', False),
+        ('db_file', 'NOTIFY_OUTBOX_DB', OUTBOX_DB_FILE),
+        ('max_attempts', 'NOTIFY_OUTBOX_MAX_ATTEMPTS', 8),
+        ('base_backoff', 'NOTIFY_OUTBOX_BASE_BACKOFF', 30.0),
+        ('max_backoff', 'NOTIFY_OUTBOX_MAX_BACKOFF', 3600.0),
+        ('min_interval', 'NOTIFY_OUTBOX_MIN_INTERVAL', 1.0),
+        ('exit_grace', 'NOTIFY_OUTBOX_EXIT_GRACE', 15.0),
+    ),
+    'ratelimit': (
+        ('enabled', 'NOTIFY_RATE_LIMIT', False),
+        ('db_file', 'NOTIFY_RATE_LIMIT_DB', RATE_LIMIT_DB_FILE),
+        ('max_wait', 'NOTIFY_RATE_LIMIT_MAX_WAIT', 60.0),
+        ('limits', 'NOTIFY_RATE_LIMITS', ''),
+    ),
+    'dispatch': (
+        ('concurrent', 'NOTIFY_CONCURRENT', True),
+        ('max_workers', 'NOTIFY_MAX_WORKERS', DEFAULT_MAX_WORKERS),
+    ),
+    'http': (
+        ('pool_connections', 'NOTIFY_POOL_CONNECTIONS', DEFAULT_POOL_CONNECTIONS),
+        ('pool_maxsize', 'NOTIFY_POOL_MAXSIZE', DEFAULT_POOL_MAXSIZE),
+        ('max_retries', 'NOTIFY_MAX_RETRIES', DEFAULT_MAX_RETRIES),
+        ('backoff_factor', 'NOTIFY_RETRY_BACKOFF', DEFAULT_RETRY_BACKOFF),
+    ),
+}
+
+logger = logging.getLogger("NotificationManager")
+
+
+def _coerce_config_value(value: Any, default: Any) -> Any:
+    """按默认值的类型转换数值类型的配置项"""
+    if isinstance(default, (int, float)) and not isinstance(default, bool):
+        try:
+            return type(default)(value)
+        except (TypeError, ValueError):
+            return default
+    return value
 
-    def _load_qmsg_config(self) -> Dict[str, str]:
-        """加载Qmsg酱配置"""
-        return {
-            'key': self._get_config_value('qmsg', 'key', 'QMSG_KEY', ''),
-            'type': self._get_config_value('qmsg', 'type', 'QMSG_TYPE', 'private'),
-        }
 
-    def _load_telegram_config(self) -> Dict[str, str]:
-        """加载Telegram配置"""
-        return {
-            'bot_token': self._get_config_value('telegram', 'bot_token', 'TG_BOT_TOKEN', ''),
-            'user_id': self._get_config_value('telegram', 'user_id', 'TG_USER_ID', ''),
-            'api_host': self._get_config_value('telegram', 'api_host', 'TG_API_HOST', ''),
-            'proxy': self._get_config_value('telegram', 'proxy', 'TG_PROXY', ''),
+def _get_config_value(file_config: Dict[str, Any], service: str, key: str,
+                      env_var: str, default: Any = None) -> Any:
+    """
+    获取配置值，优先级: 文件 > 环境变量 > 默认值
+    """
+    # 1. 从文件配置中获取
+    section = file_config.get(service) or {}
+    value = section.get(key) if isinstance(section, dict) else None
+
+    # 如果值是字符串，去除首尾空格
+    if isinstance(value, str):
+        value = value.strip()
+
+    # 文件中有非空值，则直接返回
+    if value is not None and value != '':
+        return _coerce_config_value(value, default)
+
+    # 2. 从环境变量中获取
+    env_value = os.environ.get(env_var, '').strip()
+    if env_value:
+        # 对布尔类型的环境变量进行特殊处理
+        if isinstance(default, bool):
+            return env_value.lower() == 'true'
+        return _coerce_config_value(env_value, default)
+
+    # 3. 返回默认值
+    return default
+
+
+def _load_config_file(config_path: str) -> Dict[str, Any]:
+    """从JSON文件中加载配置"""
+    if os.path.exists(config_path):
+        with open(config_path, 'r', encoding='utf-8') as f:
+            try:
+                data = json.load(f)
+                return data if isinstance(data, dict) else {}
+            except json.JSONDecodeError:
+                logger.error(f"❌ 配置文件 {config_path} 格式错误")
+                return {}
+    return {}
+
+
+def _get_file_mtime(config_path: str) -> Optional[float]:
+    """获取配置文件修改时间，文件不存在时返回 None"""
+    try:
+        return os.path.getmtime(config_path)
+    except OSError:
+        return None
+
+
+@dataclass(frozen=True)
+class NotificationConfig:
+    """推送配置（一次性解析，解析后只读）"""
+
+    __slots__ = ('config_path', 'mtime') + tuple(CONFIG_SPEC)
+
+    config_path: str
+    mtime: Optional[float]
+    bark: Mapping[str, Any]
+    server: Mapping[str, Any]
+    coolpush: Mapping[str, Any]
+    qmsg: Mapping[str, Any]
+    telegram: Mapping[str, Any]
+    feishu: Mapping[str, Any]
+    dingtalk: Mapping[str, Any]
+    qywx: Mapping[str, Any]
+    pushplus: Mapping[str, Any]
+    gotify: Mapping[str, Any]
+    ntfy: Mapping[str, Any]
+    pushdeer: Mapping[str, Any]
+    digest: Mapping[str, Any]
+    outbox: Mapping[str, Any]
+    ratelimit: Mapping[str, Any]
+    dispatch: Mapping[str, Any]
+    http: Mapping[str, Any]
+
+    @classmethod
+    def load(cls, config_path: str = NOTIFICATION_CONFIG_FILE) -> "NotificationConfig":
+        """读取配置文件与环境变量，构建只读配置对象"""
+        mtime = _get_file_mtime(config_path)
+        file_config = _load_config_file(config_path)
+        sections = {
+            service: MappingProxyType({
+                key: _get_config_value(file_config, service, key, env_var, default)
+                for key, env_var, default in spec
+            })
+            for service, spec in CONFIG_SPEC.items()
         }
+        return cls(config_path=config_path, mtime=mtime, **sections)
 
-    def _load_feishu_config(self) -> Dict[str, str]:
-        """加载飞书配置"""
-        return {
-            'key': self._get_config_value('feishu', 'key', 'FSKEY', ''),
-        }
+    def is_stale(self) -> bool:
+        """配置文件是否在解析后被修改过"""
+        return _get_file_mtime(self.config_path) != self.mtime
 
-    def _load_dingtalk_config(self) -> Dict[str, str]:
-        """加载钉钉配置"""
-        return {
-            'access_token': self._get_config_value('dingtalk', 'access_token', 'DINGTALK_ACCESS_TOKEN', ''),
-            'secret': self._get_config_value('dingtalk', 'secret', 'DINGTALK_SECRET', ''),
-        }
 
-    def _load_qywx_config(self) -> Dict[str, str]:
-        """加载企业微信配置"""
-        return {
-            'key': self._get_config_value('qywx', 'key', 'QYWX_KEY', ''),
-            'corpid': self._get_config_value('qywx', 'corpid', 'QYWX_CORPID', ''),
-            'agentid': self._get_config_value('qywx', 'agentid', 'QYWX_AGENTID', ''),
-            'corpsecret': self._get_config_value('qywx', 'corpsecret', 'QYWX_CORPSECRET', ''),
-            'touser': self._get_config_value('qywx', 'touser', 'QYWX_TOUSER', ''),
-            'media_id': self._get_config_value('qywx', 'media_id', 'QYWX_MEDIA_ID', ''),
-            'origin': self._get_config_value('qywx', 'origin', 'QYWX_ORIGIN', ''),
-        }
+class NotificationManager:
+    """青龙面板通知推送管理器"""
 
-    def _load_pushplus_config(self) -> Dict[str, str]:
-        """加载PushPlus配置"""
-        return {
-            'token': self._get_config_value('pushplus', 'token', 'PUSHPLUS_TOKEN', ''),
-            'topic': self._get_config_value('pushplus', 'topic', 'PUSHPLUS_TOPIC', ''),
-        }
+    def __init__(self, config: Optional[NotificationConfig] = None):
+        """
+        初始化推送管理器
 
-    def _load_gotify_config(self) -> Dict[str, str]:
-        """加载Gotify配置"""
-        return {
-            'url': self._get_config_value('gotify', 'url', 'GOTIFY_URL', ''),
-            'token': self._get_config_value('gotify', 'token', 'GOTIFY_TOKEN', ''),
-            'priority': self._get_config_value('gotify', 'priority', 'GOTIFY_PRIORITY', '3'),
-        }
+        Args:
+            config (Optional[NotificationConfig]): 推送配置，默认从 config/notification.json 加载
+        """
+        self.logger = logger
+        self.config = config or NotificationConfig.load()
+
+        self._sessions: Dict[str, requests.Session] = {}
+        self._sessions_lock = threading.Lock()
+        self._qywx_tokens: Dict[str, Dict[str, Any]] = {}
+        self._qywx_token_lock = threading.Lock()
+        self._outbox: Optional[NotificationOutbox] = None
+        self._rate_limiter: Optional[ChannelRateLimiter] = None
+        self._drain_thread: Optional[threading.Thread] = None
+        self._drain_pending = threading.Event()
+        self._drain_lock = threading.Lock()
+        self._drain_atexit_registered = False
+        self._channel_last_sent: Dict[str, float] = {}
+
+    def reload_if_changed(self) -> bool:
+        """
+        配置文件修改时间变化时重新加载配置
 
-    def _load_ntfy_config(self) -> Dict[str, str]:
-        """加载Ntfy配置"""
-        return {
-            'url': self._get_config_value('ntfy', 'url', 'NTFY_URL', 'https://ntfy.sh'),
-            'topic': self._get_config_value('ntfy', 'topic', 'NTFY_TOPIC', ''),
-            'priority': self._get_config_value('ntfy', 'priority', 'NTFY_PRIORITY', '3'),
-        }
+        Returns:
+            bool: 是否重新加载了配置
+        """
+        if not self.config.is_stale():
+            return False
 
-    def _load_pushdeer_config(self) -> Dict[str, str]:
-        """加载PushDeer配置"""
-        return {
-            'pushkey': self._get_config_value('pushdeer', 'pushkey', 'PUSHDEER_PUSHKEY', ''),
-            'url': self._get_config_value('pushdeer', 'url', 'PUSHDEER_URL', 'https://api2.pushdeer.com/message/push'),
-            'type': self._get_config_value('pushdeer', 'type', 'PUSHDEER_TYPE', 'text'),
-        }
+        self.logger.info("检测到推送配置文件变化，重新加载配置")
+        old_http = dict(self.config.http)
+        self.config = NotificationConfig.load(self.config.config_path)
+        if dict(self.config.http) != old_http:
+            # 连接池参数变化后需重建会话
+            self.close()
+        return True
+
+    @property
+    def bark_config(self) -> Mapping[str, Any]:
+        """Bark配置"""
+        return self.config.bark
+
+    @property
+    def server_config(self) -> Mapping[str, Any]:
+        """Server酱配置"""
+        return self.config.server
+
+    @property
+    def coolpush_config(self) -> Mapping[str, Any]:
+        """CoolPush配置"""
+        return self.config.coolpush
+
+    @property
+    def qmsg_config(self) -> Mapping[str, Any]:
+        """Qmsg酱配置"""
+        return self.config.qmsg
+
+    @property
+    def telegram_config(self) -> Mapping[str, Any]:
+        """Telegram配置"""
+        return self.config.telegram
+
+    @property
+    def feishu_config(self) -> Mapping[str, Any]:
+        """飞书配置"""
+        return self.config.feishu
+
+    @property
+    def dingtalk_config(self) -> Mapping[str, Any]:
+        """钉钉配置"""
+        return self.config.dingtalk
+
+    @property
+    def qywx_config(self) -> Mapping[str, Any]:
+        """企业微信配置"""
+        return self.config.qywx
+
+    @property
+    def pushplus_config(self) -> Mapping[str, Any]:
+        """PushPlus配置"""
+        return self.config.pushplus
+
+    @property
+    def gotify_config(self) -> Mapping[str, Any]:
+        """Gotify配置"""
+        return self.config.gotify
+
+    @property
+    def ntfy_config(self) -> Mapping[str, Any]:
+        """Ntfy配置"""
+        return self.config.ntfy
+
+    @property
+    def pushdeer_config(self) -> Mapping[str, Any]:
+        """PushDeer配置"""
+        return self.config.pushdeer
+
+    @property
+    def digest_config(self) -> Mapping[str, Any]:
+        """汇总推送配置"""
+        return self.config.digest
+
+    @property
+    def outbox_config(self) -> Mapping[str, Any]:
+        """发件箱配置"""
+        return self.config.outbox
+
+    @property
+    def ratelimit_config(self) -> Mapping[str, Any]:
+        """限流配置"""
+        return self.config.ratelimit
+
+    @property
+    def dispatch_config(self) -> Mapping[str, Any]:
+        """多渠道分发配置"""
+        return self.config.dispatch
+
+    @property
+    def http_config(self) -> Mapping[str, Any]:
+        """推送HTTP连接池配置"""
+        return self.config.http
+
+    def _create_session(self) -> requests.Session:
+        """创建带连接池和重试策略的会话"""
+        max_retries = self.http_config['max_retries']
+        # 连接阶段的失败一定没有发出请求，可安全重试；
+        # 读超时和状态码重试仅对幂等方法生效，避免重复推送
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=self.http_config['backoff_factor'],
+            status_forcelist=(429, 500, 502, 503, 504),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.http_config['pool_connections'],
+            pool_maxsize=self.http_config['pool_maxsize'],
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _get_session(self, url: str) -> requests.Session:
+        """获取目标主机对应的复用会话（按 scheme + host 区分）"""
+        parsed = urlparse(url)
+        key = f"{parsed.scheme}://{parsed.netloc}"
+        with self._sessions_lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._create_session()
+                self._sessions[key] = session
+            return session
+
+    def _http_get(self, url: str, **kwargs) -> requests.Response:
+        """使用复用会话发送GET请求"""
+        return self._get_session(url).get(url, **kwargs)
+
+    def _http_post(self, url: str, **kwargs) -> requests.Response:
+        """使用复用会话发送POST请求"""
+        return self._get_session(url).post(url, **kwargs)
+
+    def close(self) -> None:
+        """关闭所有复用的HTTP会话"""
+        with self._sessions_lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            try:
+                session.close()
+            except Exception:
+                pass
 
     def is_bark_enabled(self) -> bool:
         """检查Bark推送是否已启用"""
@@ -315,9 +623,126 @@ class NotificationManager:
         """检查PushDeer推送是否已启用"""
         return bool(self.pushdeer_config.get('pushkey'))
 
+    def _collect_channel_senders(self, title: str, content: str, timeout: int,
+                                 level: Optional[str], sound: Optional[str],
+                                 group: Optional[str], url: Optional[str]) -> List[Tuple[str, Callable[[], bool]]]:
+        """收集所有已启用的推送渠道及其发送函数"""
+        channels = [
+            ('bark', self.is_bark_enabled,
+             lambda: self.send_bark_notification(title, content, timeout, level, sound, group, url)),
+            ('server', self.is_server_enabled,
+             lambda: self.send_server_notification(title, content, timeout)),
+            ('coolpush', self.is_coolpush_enabled,
+             lambda: self.send_coolpush_notification(title, content, timeout)),
+            ('qmsg', self.is_qmsg_enabled,
+             lambda: self.send_qmsg_notification(content, timeout)),
+            ('telegram', self.is_telegram_enabled,
+             lambda: self.send_telegram_notification(title, content, timeout)),
+            ('feishu', self.is_feishu_enabled,
+             lambda: self.send_feishu_notification(title, content, timeout)),
+            ('dingtalk', self.is_dingtalk_enabled,
+             lambda: self.send_dingtalk_notification(title, content, timeout)),
+            ('qywx_robot', self.is_qywx_robot_enabled,
+             lambda: self.send_qywx_robot_notification(content, timeout)),
+            ('qywx_app', self.is_qywx_app_enabled,
+             lambda: self.send_qywx_app_notification(title, content, timeout)),
+            ('pushplus', self.is_pushplus_enabled,
+             lambda: self.send_pushplus_notification(title, content, timeout)),
+            ('pushdeer', self.is_pushdeer_enabled,
+             lambda: self.send_pushdeer_notification(title, content, timeout)),
+            ('gotify', self.is_gotify_enabled,
+             lambda: self.send_gotify_notification(title, content, timeout)),
+            ('ntfy', self.is_ntfy_enabled,
+             lambda: self.send_ntfy_notification(title, content, timeout)),
+        ]
+        return [(name, sender) for name, is_enabled, sender in channels if is_enabled()]
+
+    @property
+    def rate_limiter(self) -> "ChannelRateLimiter":
+        """跨进程共享的渠道限流器（首次使用时创建）"""
+        db_file = self.ratelimit_config['db_file']
+        if self._rate_limiter is None or self._rate_limiter.db_file != db_file:
+            self._rate_limiter = ChannelRateLimiter(db_file)
+        return self._rate_limiter
+
+    def get_channel_rate_limit(self, channel: str) -> Optional[float]:
+        """获取渠道每分钟允许的消息数，None 表示不限流"""
+        limits = dict(DEFAULT_CHANNEL_RATE_LIMITS)
+        limits.update(_parse_rate_limits(self.ratelimit_config.get('limits')))
+        rate = limits.get(channel)
+        return rate if rate and rate > 0 else None
+
+    def _acquire_rate_limit(self, channel: str, deadline_at: Optional[float] = None) -> Optional[str]:
+        """
+        申请渠道发送令牌，必要时等待
+
+        Args:
+            channel (str): 渠道名
+            deadline_at (Optional[float]): 调用方截止时刻（time.monotonic），等待不超过剩余时间
+
+        Returns:
+            Optional[str]: 无法在 ratelimit.max_wait（及剩余截止时间）内获得令牌时返回错误信息
+        """
+        if not self.ratelimit_config.get('enabled'):
+            return None
+        rate = self.get_channel_rate_limit(channel)
+        if rate is None:
+            return None
+
+        max_wait = self.ratelimit_config['max_wait']
+        if deadline_at is not None:
+            max_wait = min(max_wait, max(0.0, deadline_at - time.monotonic()))
+
+        try:
+            wait_s = self.rate_limiter.reserve(channel, rate, max_wait)
+        except sqlite3.Error as e:
+            # 限流存储异常时不阻塞推送
+            self.logger.warning(f"渠道限流状态读取失败，跳过限流: {e}")
+            return None
+
+        if wait_s is None:
+            self.logger.warning(f"⏳ {channel} 推送触发限流，等待时间超过 {max_wait:.1f} 秒，本次不发送")
+            return "触发限流"
+        if wait_s > 0:
+            self.logger.info(f"⏳ {channel} 推送触发限流，等待 {wait_s:.1f} 秒")
+            time.sleep(wait_s)
+        return None
+
+    def rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """各渠道限流统计（跨进程累计）"""
+        return self.rate_limiter.stats()
+
+    def _run_channel_sender(self, channel: str, sender: Callable[[], bool],
+                            deadline_at: Optional[float] = None) -> Dict[str, Any]:
+        """执行单个渠道的发送函数并记录结果，限流等待不超过调用方截止时刻 deadline_at"""
+        start = time.monotonic()
+        error = self._acquire_rate_limit(channel, deadline_at)
+        if error:
+            return {
+                'success': False,
+                'latency': round(time.monotonic() - start, 3),
+                'error': error,
+            }
+        try:
+            success = bool(sender())
+            if not success:
+                error = "推送失败"
+        except Exception as e:
+            success = False
+            error = str(e)
+            self.logger.error(f"❌ {channel} 推送异常: {e}")
+        return {
+            'success': success,
+            'latency': round(time.monotonic() - start, 3),
+            'error': error,
+        }
+
     def send(self, title: str, content: str, level: Optional[str] = None,
              sound: Optional[str] = None, group: Optional[str] = None,
-             url: Optional[str] = None, timeout: int = 10):
+             url: Optional[str] = None, timeout: int = 10,
+             concurrent: Optional[bool] = None, max_workers: Optional[int] = None,
+             deadline: Optional[float] = DEFAULT_SEND_DEADLINE,
+             channels: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
         """
         统一发送所有已启用的通知
 
@@ -329,33 +754,66 @@ class NotificationManager:
             group (Optional[str]): 推送分组 (Bark专用)
             url (Optional[str]): 跳转链接 (Bark专用)
             timeout (int): 请求超时时间
+            concurrent (Optional[bool]): 是否并发推送到所有渠道，None 时使用 dispatch.concurrent（默认开启）
+            max_workers (Optional[int]): 并发推送的最大线程数，None 时使用 dispatch.max_workers
+            deadline (Optional[float]): 调用方最长等待时间（秒），None 表示不限制；并发推送时超过后不再等待，
+                渠道限流的等待时间也不会超过剩余时间。截止时间只约束本方法何时返回：
+                超时仍在执行的渠道线程不会被中断，进程退出时解释器仍会等待它们结束
+                （最长约为单次请求的 timeout 加上重试耗时）
+            channels (Optional[Iterable[str]]): 仅推送到指定渠道，None 表示所有已启用渠道
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 各渠道推送结果，格式为
+                {渠道名: {'success': bool, 'latency': float, 'error': Optional[str]}}
         """
-        if self.is_bark_enabled():
-            self.send_bark_notification(title, content, timeout, level, sound, group, url)
-        if self.is_server_enabled():
-            self.send_server_notification(title, content, timeout)
-        if self.is_coolpush_enabled():
-            self.send_coolpush_notification(title, content, timeout)
-        if self.is_qmsg_enabled():
-            self.send_qmsg_notification(content, timeout)
-        if self.is_telegram_enabled():
-            self.send_telegram_notification(title, content, timeout)
-        if self.is_feishu_enabled():
-            self.send_feishu_notification(title, content, timeout)
-        if self.is_dingtalk_enabled():
-            self.send_dingtalk_notification(title, content, timeout)
-        if self.is_qywx_robot_enabled():
-            self.send_qywx_robot_notification(content, timeout)
-        if self.is_qywx_app_enabled():
-            self.send_qywx_app_notification(title, content, timeout)
-        if self.is_pushplus_enabled():
-            self.send_pushplus_notification(title, content, timeout)
-        if self.is_pushdeer_enabled():
-            self.send_pushdeer_notification(title, content, timeout)
-        if self.is_gotify_enabled():
-            self.send_gotify_notification(title, content, timeout)
-        if self.is_ntfy_enabled():
-            self.send_ntfy_notification(title, content, timeout)
+        only = set(channels) if channels is not None else None
+        channels = [
+            (name, sender)
+            for name, sender in self._collect_channel_senders(title, content, timeout, level, sound, group, url)
+            if only is None or name in only
+        ]
+        if not channels:
+            return {}
+
+        if concurrent is None:
+            concurrent = bool(self.dispatch_config.get('concurrent'))
+        if max_workers is None:
+            max_workers = self.dispatch_config.get('max_workers') or DEFAULT_MAX_WORKERS
+
+        start = time.monotonic()
+        deadline_at = start + deadline if deadline is not None else None
+
+        if not concurrent:
+            return {name: self._run_channel_sender(name, sender, deadline_at) for name, sender in channels}
+
+        results: Dict[str, Dict[str, Any]] = {}
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(channels))),
+            thread_name_prefix="notify"
+        )
+        try:
+            futures = {
+                executor.submit(self._run_channel_sender, name, sender, deadline_at): name
+                for name, sender in channels
+            }
+            done, not_done = wait(futures, timeout=deadline)
+            for future in done:
+                results[futures[future]] = future.result()
+            for future in not_done:
+                future.cancel()
+                name = futures[future]
+                self.logger.error(f"❌ {name} 推送超过截止时间 {deadline} 秒，已放弃等待")
+                results[name] = {
+                    'success': False,
+                    'latency': round(time.monotonic() - start, 3),
+                    'error': f"超过截止时间 {deadline} 秒",
+                }
+        finally:
+            # 不等待超时的线程结束，避免单个慢渠道拖住调用方（进程退出时仍会等待其结束）
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # 按渠道声明顺序返回结果
+        return {name: results[name] for name, _ in channels}
 
     def send_server_notification(self, title: str, content: str, timeout: int = 10) -> bool:
         """发送Server酱推送"""
@@ -372,7 +830,7 @@ class NotificationManager:
             if sckey:
                 self.logger.info("正在发送Server酱(SCKEY)推送")
                 url = f"https://sc.ftqq.com/{sckey}.send"
-                response = requests.post(url, data=data, timeout=timeout)
+                response = self._http_post(url, data=data, timeout=timeout)
                 if response.json().get("errno") == 0:
                     self.logger.info("✅ Server酱(SCKEY)推送成功")
                 else:
@@ -381,7 +839,7 @@ class NotificationManager:
             if sendkey:
                 self.logger.info("正在发送Server酱(SENDKEY)推送")
                 url = f"https://sctapi.ftqq.com/{sendkey}.send"
-                response = requests.post(url, data=data, timeout=timeout)
+                response = self._http_post(url, data=data, timeout=timeout)
                 if response.json().get("code") == 0:
                     self.logger.info("✅ Server酱(SENDKEY)推送成功")
                 else:
@@ -405,11 +863,11 @@ class NotificationManager:
             self.logger.info("正在发送CoolPush推送")
             base_url = f"https://push.xuthus.cc"
             if self.coolpush_config.get('qq'):
-                requests.post(f"{base_url}/send/{skey}", params=params, timeout=timeout)
+                self._http_post(f"{base_url}/send/{skey}", params=params, timeout=timeout)
             if self.coolpush_config.get('wx'):
-                requests.post(f"{base_url}/wx/{skey}", params=params, timeout=timeout)
+                self._http_post(f"{base_url}/wx/{skey}", params=params, timeout=timeout)
             if self.coolpush_config.get('email'):
-                requests.post(f"{base_url}/email/{skey}", params=params, timeout=timeout)
+                self._http_post(f"{base_url}/email/{skey}", params=params, timeout=timeout)
             self.logger.info("✅ CoolPush推送已提交")
             return True
         except Exception as e:
@@ -429,7 +887,7 @@ class NotificationManager:
 
         try:
             self.logger.info("正在发送Qmsg酱推送")
-            response = requests.get(url, params=params, timeout=timeout)
+            response = self._http_get(url, params=params, timeout=timeout)
             if response.json().get("success"):
                 self.logger.info("✅ Qmsg酱推送成功")
                 return True
@@ -464,7 +922,7 @@ class NotificationManager:
 
         try:
             self.logger.info("正在发送Telegram推送")
-            response = requests.post(url, data=data, proxies=proxies, timeout=timeout)
+            response = self._http_post(url, data=data, proxies=proxies, timeout=timeout)
             if response.json().get('ok'):
                 self.logger.info("✅ Telegram推送成功")
                 return True
@@ -492,7 +950,7 @@ class NotificationManager:
 
         try:
             self.logger.info("正在发送飞书推送")
-            response = requests.post(url, json=data, timeout=timeout)
+            response = self._http_post(url, json=data, timeout=timeout)
             if response.json().get("StatusCode") == 0:
                 self.logger.info("✅ 飞书推送成功")
                 return True
@@ -529,7 +987,7 @@ class NotificationManager:
 
         try:
             self.logger.info("正在发送钉钉推送")
-            response = requests.post(url, json=data, timeout=timeout)
+            response = self._http_post(url, json=data, timeout=timeout)
             if response.json().get("errcode") == 0:
                 self.logger.info("✅ 钉钉推送成功")
                 return True
@@ -552,7 +1010,7 @@ class NotificationManager:
 
         try:
             self.logger.info("正在发送企业微信群机器人推送")
-            response = requests.post(url, json=data, timeout=timeout)
+            response = self._http_post(url, json=data, timeout=timeout)
             if response.json().get("errcode") == 0:
                 self.logger.info("✅ 企业微信群机器人推送成功")
                 return True
@@ -563,6 +1021,85 @@ class NotificationManager:
             self.logger.error(f"❌ 企业微信群机器人推送异常: {e}")
             return False
 
+    @staticmethod
+    def _qywx_token_cache_key(corpid: str, corpsecret: str) -> str:
+        """生成企业微信 access_token 缓存键（不直接落盘 corpsecret）"""
+        return hashlib.sha256(f"{corpid}:{corpsecret}".encode('utf-8')).hexdigest()
+
+    def _read_qywx_token_file(self) -> Dict[str, Any]:
+        """读取磁盘上的企业微信 access_token 缓存"""
+        if not os.path.exists(QYWX_TOKEN_CACHE_FILE):
+            return {}
+        try:
+            with open(QYWX_TOKEN_CACHE_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError) as e:
+            self.logger.warning(f"读取企业微信token缓存失败: {e}")
+            return {}
+
+    def _write_qywx_token_file(self, cache_key: str, entry: Optional[Dict[str, Any]]) -> None:
+        """写入（或删除）磁盘上的企业微信 access_token 缓存"""
+        data = self._read_qywx_token_file()
+        if entry is None:
+            data.pop(cache_key, None)
+        else:
+            data[cache_key] = entry
+        tmp_path = f"{QYWX_TOKEN_CACHE_FILE}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, QYWX_TOKEN_CACHE_FILE)
+        except OSError as e:
+            self.logger.warning(f"写入企业微信token缓存失败: {e}")
+
+    def _get_qywx_access_token(self, corpid: str, corpsecret: str, timeout: int = 10,
+                               force_refresh: bool = False) -> Optional[str]:
+        """
+        获取企业微信应用 access_token，优先使用内存/磁盘缓存
+
+        Args:
+            corpid (str): 企业ID
+            corpsecret (str): 应用Secret
+            timeout (int): 请求超时时间
+            force_refresh (bool): 是否忽略缓存强制刷新
+
+        Returns:
+            Optional[str]: access_token，获取失败返回 None
+        """
+        cache_key = self._qywx_token_cache_key(corpid, corpsecret)
+        use_file_cache = bool(self.qywx_config.get('token_cache'))
+
+        with self._qywx_token_lock:
+            now = time.time()
+            if not force_refresh:
+                entry = self._qywx_tokens.get(cache_key)
+                if entry is None and use_file_cache:
+                    entry = self._read_qywx_token_file().get(cache_key)
+                    if entry:
+                        self._qywx_tokens[cache_key] = entry
+                if entry and entry.get('expires_at', 0) - QYWX_TOKEN_EXPIRY_MARGIN > now:
+                    return entry.get('access_token')
+
+            token_url = f"https://qyapi.weixin.qq.com/cgi-bin/gettoken?corpid={corpid}&corpsecret={corpsecret}"
+            token_res = self._http_get(token_url, timeout=timeout).json()
+            access_token = token_res.get('access_token')
+            if not access_token:
+                self.logger.error(f"❌ 企业微信应用消息获取token失败: {token_res.get('errmsg')}")
+                self._qywx_tokens.pop(cache_key, None)
+                if use_file_cache:
+                    self._write_qywx_token_file(cache_key, None)
+                return None
+
+            entry = {
+                'access_token': access_token,
+                'expires_at': now + int(token_res.get('expires_in') or 7200),
+            }
+            self._qywx_tokens[cache_key] = entry
+            if use_file_cache:
+                self._write_qywx_token_file(cache_key, entry)
+            return access_token
+
     def send_qywx_app_notification(self, title: str, content: str, timeout: int = 10) -> bool:
         """发送企业微信应用消息推送"""
         if not self.is_qywx_app_enabled():
@@ -575,47 +1112,55 @@ class NotificationManager:
         touser = self.qywx_config['touser']
         media_id = self.qywx_config.get('media_id')
 
+        if media_id:
+            data = {
+                "touser": touser,
+                "msgtype": "mpnews",
+                "agentid": agentid,
+                "mpnews": {
+                    "articles": [{
+                        "title": title,
+                        "thumb_media_id": media_id,
+                        "content": content.replace("\n", "<br>"),
+                        "digest": content
+                    }]
+                }
+            }
+        else:
+            data = {
+                "touser": touser,
+                "msgtype": "textcard",
+                "agentid": agentid,
+                "textcard": {
+                    "title": title,
+                    "description": content,
+                    "url": "https://github.com/ZaiZaiCat/ZaiZaiCat-Checkin",
+                    "btntxt": "详情"
+                }
+            }
+
         try:
-            # 获取 access_token
-            token_url = f"https://qyapi.weixin.qq.com/cgi-bin/gettoken?corpid={corpid}&corpsecret={corpsecret}"
-            token_res = requests.get(token_url, timeout=timeout).json()
-            access_token = token_res.get('access_token')
+            # 获取 access_token（命中缓存时跳过 gettoken 请求）
+            access_token = self._get_qywx_access_token(corpid, corpsecret, timeout)
             if not access_token:
-                self.logger.error(f"❌ 企业微信应用消息获取token失败: {token_res.get('errmsg')}")
                 return False
 
-            send_url = f"https://qyapi.weixin.qq.com/cgi-bin/message/send?access_token={access_token}"
-
-            if media_id:
-                data = {
-                    "touser": touser,
-                    "msgtype": "mpnews",
-                    "agentid": agentid,
-                    "mpnews": {
-                        "articles": [{
-                            "title": title,
-                            "thumb_media_id": media_id,
-                            "content": content.replace("\n", "<br>"),
-                            "digest": content
-                        }]
-                    }
-                }
-            else:
-                data = {
-                    "touser": touser,
-                    "msgtype": "textcard",
-                    "agentid": agentid,
-                    "textcard": {
-                        "title": title,
-                        "description": content,
-                        "url": "https://github.com/ZaiZaiCat/ZaiZaiCat-Checkin",
-                        "btntxt": "详情"
-                    }
-                }
-
             self.logger.info("正在发送企业微信应用消息推送")
-            response = requests.post(send_url, json=data, timeout=timeout)
-            if response.json().get("errcode") == 0:
+            send_url = f"https://qyapi.weixin.qq.com/cgi-bin/message/send?access_token={access_token}"
+            response = self._http_post(send_url, json=data, timeout=timeout)
+            errcode = response.json().get("errcode")
+
+            # token 过期或失效时刷新一次并重试
+            if errcode in QYWX_TOKEN_INVALID_CODES:
+                self.logger.info(f"企业微信access_token已失效(errcode={errcode})，刷新后重试")
+                access_token = self._get_qywx_access_token(corpid, corpsecret, timeout, force_refresh=True)
+                if not access_token:
+                    return False
+                send_url = f"https://qyapi.weixin.qq.com/cgi-bin/message/send?access_token={access_token}"
+                response = self._http_post(send_url, json=data, timeout=timeout)
+                errcode = response.json().get("errcode")
+
+            if errcode == 0:
                 self.logger.info("✅ 企业微信应用消息推送成功")
                 return True
             else:
@@ -647,7 +1192,7 @@ class NotificationManager:
 
         try:
             self.logger.info("正在发送PushPlus推送")
-            response = requests.post(url, json=data, timeout=timeout)
+            response = self._http_post(url, json=data, timeout=timeout)
             if response.json().get("code") == 200:
                 self.logger.info("✅ PushPlus推送成功")
                 return True
@@ -677,7 +1222,7 @@ class NotificationManager:
 
         try:
             self.logger.info("正在发送Gotify推送")
-            response = requests.post(url, json=data, timeout=timeout)
+            response = self._http_post(url, json=data, timeout=timeout)
             if response.json().get("id"):
                 self.logger.info("✅ Gotify推送成功")
                 return True
@@ -707,7 +1252,7 @@ class NotificationManager:
 
         try:
             self.logger.info("正在发送Ntfy推送")
-            response = requests.post(url, data=content.encode('utf-8'), headers=headers, timeout=timeout)
+            response = self._http_post(url, data=content.encode('utf-8'), headers=headers, timeout=timeout)
             response.raise_for_status()
             self.logger.info("✅ Ntfy推送成功")
             return True
@@ -758,7 +1303,7 @@ class NotificationManager:
 
         try:
             self.logger.info("正在发送Bark推送")
-            response = requests.post(url_path, json=data, timeout=timeout)
+            response = self._http_post(url_path, json=data, timeout=timeout)
             if response.json().get('code') == 200:
                 self.logger.info("✅ Bark推送成功")
                 return True
@@ -788,7 +1333,7 @@ class NotificationManager:
 
         try:
             self.logger.info("正在发送 PushDeer 推送")
-            response = requests.post(url, data=data, timeout=timeout)
+            response = self._http_post(url, data=data, timeout=timeout)
             # 常见官方在线版返回 status_code 200 表示提交成功；进一步尝试解析 JSON
             if response.status_code == 200:
                 try:
@@ -813,13 +1358,614 @@ class NotificationManager:
             return False
 
 
-# 创建全局通知管理器实例
-notification_manager = NotificationManager()
+    def spool(self, title: str, content: str, level: Optional[str] = None,
+              sound: Optional[str] = None, group: Optional[str] = None,
+              url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        将通知写入汇总暂存文件，等待 flush_digest 合并发送
+
+        Returns:
+            Dict[str, Any]: 写入结果 {'success': bool, 'latency': float, 'error': Optional[str]}
+        """
+        start = time.monotonic()
+        entry = {
+            'title': title,
+            'content': content,
+            'level': level,
+            'sound': sound,
+            'group': group,
+            'url': url,
+            'time': time.time(),
+        }
+        spool_file = self.digest_config['spool_file']
+        try:
+            os.makedirs(os.path.dirname(spool_file) or '.', exist_ok=True)
+            line = json.dumps(entry, ensure_ascii=False) + '\n'
+            while True:
+                with open(spool_file, 'a', encoding='utf-8') as f:
+                    _lock_file(f)
+                    try:
+                        # 打开后文件可能已被 flush_digest 移走，此时写入会丢失，需重新打开当前文件
+                        if not _is_same_file(f, spool_file):
+                            continue
+                        f.write(line)
+                        f.flush()
+                        break
+                    finally:
+                        _unlock_file(f)
+            self.logger.info(f"📥 通知已写入汇总暂存: {title}")
+            error = None
+        except OSError as e:
+            self.logger.error(f"❌ 写入汇总暂存文件失败: {e}")
+            error = str(e)
+        return {
+            'success': error is None,
+            'latency': round(time.monotonic() - start, 3),
+            'error': error,
+        }
+
+    def _take_spooled_entries(self) -> List[Dict[str, Any]]:
+        """取出暂存文件中的全部通知（原子地移走文件，避免与写入方竞争）"""
+        spool_file = self.digest_config['spool_file']
+        taking_file = f"{spool_file}.{os.getpid()}.flushing"
+        try:
+            os.replace(spool_file, taking_file)
+        except FileNotFoundError:
+            return []
+
+        entries = []
+        with open(taking_file, 'r', encoding='utf-8') as f:
+            _lock_file(f)
+            try:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        self.logger.warning(f"跳过无法解析的暂存通知: {line[:80]}")
+            finally:
+                _unlock_file(f)
+        os.remove(taking_file)
+        return entries
+
+    def _restore_spooled_entries(self, entries: List[Dict[str, Any]]) -> None:
+        """发送全部失败时将通知放回暂存文件，等待下次合并"""
+        for entry in entries:
+            self.spool(entry.get('title', ''), entry.get('content', ''), entry.get('level'),
+                       entry.get('sound'), entry.get('group'), entry.get('url'))
+
+    def flush_digest(self, title: Optional[str] = None, timeout: int = 10,
+                     concurrent: Optional[bool] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        将暂存的通知合并为一条汇总消息，按各渠道的长度上限拆分后发送
+
+        Args:
+            title (Optional[str]): 汇总标题，默认使用配置中的 digest.title
+            timeout (int): 请求超时时间
+            concurrent (Optional[bool]): 是否并发推送到各渠道，None 时使用 dispatch.concurrent
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 各渠道推送结果，同一渠道多条消息时全部成功才视为成功
+        """
+        entries = self._take_spooled_entries()
+        if not entries:
+            self.logger.info("没有待汇总的通知")
+            return {}
+
+        entries.sort(key=lambda item: item.get('time', 0))
+        title = title or self.digest_config['title']
+        title = f"{title} ({len(entries)}条)"
+        sections = [
+            f"【{entry.get('title', '')}】\n{entry.get('content', '')}".strip()
+            for entry in entries
+        ]
+        # 任意一条为时效性/警报通知时，汇总消息沿用该级别和声音
+        level = next((e['level'] for e in entries if e.get('level') == NotificationLevel.TIME_SENSITIVE), None)
+        sound = next((e['sound'] for e in entries if e.get('sound') == NotificationSound.ALARM), None)
+
+        enabled = [name for name, _ in self._collect_channel_senders(title, '', timeout, None, None, None, None)]
+        groups: Dict[Optional[Tuple[int, bool]], List[str]] = {}
+        for channel in enabled:
+            groups.setdefault(CHANNEL_CONTENT_LIMITS.get(channel), []).append(channel)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for limit, group_channels in groups.items():
+            chunks = _split_digest(sections, limit)
+            for index, chunk in enumerate(chunks, 1):
+                chunk_title = f"{title} [{index}/{len(chunks)}]" if len(chunks) > 1 else title
+                chunk_results = self.send(chunk_title, chunk, level=level, sound=sound, timeout=timeout,
+                                          concurrent=concurrent, channels=group_channels)
+                for channel, result in chunk_results.items():
+                    merged = results.setdefault(channel, {'success': True, 'latency': 0.0, 'error': None})
+                    merged['success'] = merged['success'] and result['success']
+                    merged['latency'] = round(merged['latency'] + result['latency'], 3)
+                    merged['error'] = merged['error'] or result['error']
+
+        if results and not any(result['success'] for result in results.values()):
+            self.logger.error("❌ 汇总推送全部失败，通知已放回暂存文件")
+            self._restore_spooled_entries(entries)
+        else:
+            self.logger.info(f"✅ 已合并 {len(entries)} 条通知为汇总推送")
+        return results
+
+
+    @property
+    def outbox(self) -> "NotificationOutbox":
+        """持久化发件箱（首次使用时创建）"""
+        db_file = self.outbox_config['db_file']
+        if self._outbox is None or self._outbox.db_file != db_file:
+            self._outbox = NotificationOutbox(db_file)
+        return self._outbox
+
+    def enqueue(self, title: str, content: str, level: Optional[str] = None,
+                sound: Optional[str] = None, group: Optional[str] = None,
+                url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        将通知按渠道写入持久化发件箱，由 drain_outbox 投递
+
+        Returns:
+            Dict[str, Any]: 写入结果 {'success': bool, 'latency': float, 'error': Optional[str]}
+        """
+        start = time.monotonic()
+        channels = [name for name, _ in self._collect_channel_senders(title, content, 10, level, sound, group, url)]
+        error = None
+        try:
+            self.outbox.put(channels, {
+                'title': title,
+                'content': content,
+                'level': level,
+                'sound': sound,
+                'group': group,
+                'url': url,
+            })
+            self.logger.info(f"📮 通知已写入发件箱: {title} ({len(channels)} 个渠道)")
+        except sqlite3.Error as e:
+            self.logger.error(f"❌ 写入发件箱失败: {e}")
+            error = str(e)
+        return {
+            'success': error is None,
+            'latency': round(time.monotonic() - start, 3),
+            'error': error,
+        }
+
+    def _outbox_backoff(self, attempts: int) -> float:
+        """计算第 attempts 次失败后的退避时间（指数退避 + 抖动）"""
+        base = self.outbox_config['base_backoff']
+        delay = min(self.outbox_config['max_backoff'], base * (2 ** max(0, attempts - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def drain_outbox(self, timeout: int = 10, deadline: Optional[float] = None) -> Dict[str, int]:
+        """
+        投递发件箱中所有到期的消息
+
+        失败的消息按指数退避重新排期，超过最大重试次数后标记为放弃；
+        同一渠道两次投递之间至少间隔 outbox.min_interval 秒。
+
+        Args:
+            timeout (int): 单次请求超时时间
+            deadline (Optional[float]): 本次投递的最长耗时（秒），None 表示直到没有到期消息
+
+        Returns:
+            Dict[str, int]: 投递统计 {'delivered': 成功数, 'retrying': 待重试数, 'dead': 放弃数}
+        """
+        stats = {'delivered': 0, 'retrying': 0, 'dead': 0}
+        started = time.monotonic()
+        last_sent = self._channel_last_sent
+        min_interval = self.outbox_config['min_interval']
+        max_attempts = self.outbox_config['max_attempts']
+
+        while deadline is None or time.monotonic() - started < deadline:
+            item = self.outbox.claim_next(OUTBOX_LEASE_SECONDS)
+            if item is None:
+                break
+
+            channel = item['channel']
+            wait_s = min_interval - (time.monotonic() - last_sent.get(channel, float('-inf')))
+            if wait_s > 0:
+                time.sleep(wait_s)
+
+            payload = item['payload']
+            result = self.send(
+                payload.get('title', ''), payload.get('content', ''),
+                level=payload.get('level'), sound=payload.get('sound'),
+                group=payload.get('group'), url=payload.get('url'),
+                timeout=timeout, channels=[channel]
+            ).get(channel)
+            last_sent[channel] = time.monotonic()
+
+            if result is None:
+                # 渠道已被停用，直接丢弃
+                self.logger.warning(f"渠道 {channel} 已停用，丢弃发件箱消息 #{item['id']}")
+                self.outbox.delete(item['id'])
+            elif result['success']:
+                self.outbox.delete(item['id'])
+                stats['delivered'] += 1
+            else:
+                attempts = item['attempts'] + 1
+                if attempts >= max_attempts:
+                    self.logger.error(f"❌ {channel} 消息 #{item['id']} 重试 {attempts} 次仍失败，已放弃")
+                    self.outbox.mark_dead(item['id'], attempts, result['error'])
+                    stats['dead'] += 1
+                else:
+                    delay = self._outbox_backoff(attempts)
+                    self.logger.warning(f"⚠️ {channel} 消息 #{item['id']} 投递失败，{delay:.0f} 秒后重试")
+                    self.outbox.reschedule(item['id'], attempts, time.time() + delay, result['error'])
+                    stats['retrying'] += 1
+
+        return stats
+
+    def _background_drain_loop(self) -> None:
+        """后台投递线程主循环：有新消息写入时继续投递，否则退出"""
+        while True:
+            self._drain_pending.clear()
+            try:
+                self.drain_outbox()
+            except Exception as e:
+                self.logger.error(f"❌ 后台投递发件箱异常: {e}")
+            with self._drain_lock:
+                if not self._drain_pending.is_set():
+                    self._drain_thread = None
+                    return
+
+    def start_background_drain(self) -> None:
+        """启动（或唤醒）后台投递线程，进程退出前最多等待 outbox.exit_grace 秒"""
+        with self._drain_lock:
+            self._drain_pending.set()
+            if self._drain_thread is not None:
+                return
+            self._drain_thread = threading.Thread(
+                target=self._background_drain_loop, name="notify-outbox", daemon=True
+            )
+            self._drain_thread.start()
+            if not self._drain_atexit_registered:
+                atexit.register(self.wait_background_drain)
+                self._drain_atexit_registered = True
+
+    def wait_background_drain(self, timeout: Optional[float] = None) -> None:
+        """等待后台投递线程结束，超时后未投递的消息留在发件箱中下次再发"""
+        thread = self._drain_thread
+        if thread is not None:
+            thread.join(self.outbox_config['exit_grace'] if timeout is None else timeout)
+
+
+class NotificationOutbox:
+    """基于 SQLite 的持久化通知发件箱（每条记录对应一个渠道的一次投递）"""
+
+    def __init__(self, db_file: str = OUTBOX_DB_FILE):
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(db_file) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS outbox (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    channel TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL,
+                    locked_until REAL NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    created_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """打开自动提交模式的数据库连接，用完即关闭"""
+        conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def put(self, channels: Iterable[str], payload: Dict[str, Any]) -> None:
+        """为每个渠道写入一条待投递记录"""
+        now = time.time()
+        data = json.dumps(payload, ensure_ascii=False)
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO outbox (channel, payload, next_attempt_at, created_at) VALUES (?, ?, ?, ?)",
+                [(channel, data, now, now) for channel in channels]
+            )
+
+    def claim_next(self, lease_seconds: float) -> Optional[Dict[str, Any]]:
+        """领取一条到期且未被其他进程占用的记录"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                """
+                SELECT id, channel, payload, attempts FROM outbox
+                WHERE status = 'pending' AND next_attempt_at <= ? AND locked_until <= ?
+                ORDER BY next_attempt_at, id LIMIT 1
+                """,
+                (now, now)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute("UPDATE outbox SET locked_until = ? WHERE id = ?", (now + lease_seconds, row[0]))
+            conn.execute("COMMIT")
+        return {'id': row[0], 'channel': row[1], 'payload': json.loads(row[2]), 'attempts': row[3]}
+
+    def delete(self, item_id: int) -> None:
+        """删除已投递的记录"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM outbox WHERE id = ?", (item_id,))
+
+    def reschedule(self, item_id: int, attempts: int, next_attempt_at: float, error: Optional[str]) -> None:
+        """记录失败并安排下次重试"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET attempts = ?, next_attempt_at = ?, locked_until = 0, last_error = ? WHERE id = ?",
+                (attempts, next_attempt_at, error, item_id)
+            )
+
+    def mark_dead(self, item_id: int, attempts: int, error: Optional[str]) -> None:
+        """超过最大重试次数，标记为放弃（保留记录便于排查）"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET status = 'dead', attempts = ?, locked_until = 0, last_error = ? WHERE id = ?",
+                (attempts, error, item_id)
+            )
+
+    def pending_count(self) -> int:
+        """待投递的记录数"""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM outbox WHERE status = 'pending'").fetchone()[0]
+
+
+class ChannelRateLimiter:
+    """
+    基于 SQLite 的跨进程令牌桶限流器
+
+    每个渠道一个令牌桶，容量等于每分钟允许的消息数。令牌不足时预占未来的令牌
+    （令牌数可为负），调用方按返回的等待时间休眠，多个进程之间保持先到先得。
+    """
+
+    def __init__(self, db_file: str = RATE_LIMIT_DB_FILE):
+        self.db_file = db_file
+        os.makedirs(os.path.dirname(db_file) or '.', exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS buckets (
+                    channel TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    acquired INTEGER NOT NULL DEFAULT 0,
+                    throttled INTEGER NOT NULL DEFAULT 0,
+                    rejected INTEGER NOT NULL DEFAULT 0,
+                    waited_s REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """打开自动提交模式的数据库连接，用完即关闭"""
+        conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def reserve(self, channel: str, rate_per_minute: float, max_wait: float) -> Optional[float]:
+        """
+        预占一个令牌
+
+        Args:
+            channel (str): 渠道名
+            rate_per_minute (float): 每分钟允许的消息数（同时作为桶容量）
+            max_wait (float): 最长可接受的等待时间（秒）
+
+        Returns:
+            Optional[float]: 需要等待的秒数；超过 max_wait 时不预占并返回 None
+        """
+        capacity = max(1.0, float(rate_per_minute))
+        refill_per_second = float(rate_per_minute) / 60
+        now = time.time()
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE channel = ?", (channel,)
+            ).fetchone()
+            if row is None:
+                tokens = capacity
+                conn.execute(
+                    "INSERT INTO buckets (channel, tokens, updated_at) VALUES (?, ?, ?)",
+                    (channel, tokens, now)
+                )
+            else:
+                tokens = min(capacity, row[0] + max(0.0, now - row[1]) * refill_per_second)
+
+            wait_s = 0.0 if tokens >= 1 else (1 - tokens) / refill_per_second
+            if wait_s > max_wait:
+                conn.execute(
+                    "UPDATE buckets SET tokens = ?, updated_at = ?, rejected = rejected + 1 WHERE channel = ?",
+                    (tokens, now, channel)
+                )
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                """
+                UPDATE buckets SET tokens = ?, updated_at = ?, acquired = acquired + 1,
+                    throttled = throttled + ?, waited_s = waited_s + ?
+                WHERE channel = ?
+                """,
+                (tokens - 1, now, 1 if wait_s > 0 else 0, wait_s, channel)
+            )
+            conn.execute("COMMIT")
+        return wait_s
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        各渠道限流计数
+
+        Returns:
+            Dict[str, Dict[str, Any]]: {渠道: {'acquired': 发送次数, 'throttled': 等待次数,
+                'rejected': 超时放弃次数, 'waited_s': 累计等待秒数}}
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT channel, acquired, throttled, rejected, waited_s FROM buckets ORDER BY channel"
+            ).fetchall()
+        return {
+            row[0]: {
+                'acquired': row[1],
+                'throttled': row[2],
+                'rejected': row[3],
+                'waited_s': round(row[4], 3),
+            }
+            for row in rows
+        }
+
+
+def _parse_rate_limits(value: Any) -> Dict[str, float]:
+    """解析限流覆盖配置，支持字典或 "dingtalk=20,pushplus=5" 格式的字符串"""
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, str) and value:
+        items = (part.split('=', 1) for part in value.split(',') if '=' in part)
+    else:
+        return {}
+
+    limits = {}
+    for channel, rate in items:
+        try:
+            limits[str(channel).strip()] = float(rate)
+        except (TypeError, ValueError):
+            continue
+    return limits
+
+
+def _lock_file(f) -> None:
+    """对文件加排他锁（仅 POSIX）"""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def _is_same_file(f, path: str) -> bool:
+    """已打开的文件是否仍是 path 指向的文件（文件被改名或删除后返回 False）"""
+    try:
+        opened, current = os.fstat(f.fileno()), os.stat(path)
+    except FileNotFoundError:
+        return False
+    return (opened.st_dev, opened.st_ino) == (current.st_dev, current.st_ino)
+
+
+def _unlock_file(f) -> None:
+    """释放文件锁（仅 POSIX）"""
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _content_size(text: str, by_bytes: bool) -> int:
+    """计算内容长度（字符数或UTF-8字节数）"""
+    return len(text.encode('utf-8')) if by_bytes else len(text)
+
+
+def _split_oversized(text: str, max_size: int, by_bytes: bool) -> List[str]:
+    """将超过上限的单段内容按行拆分，单行仍超限时强制截断"""
+    pieces: List[str] = []
+    current = ''
+    for line in text.split('\n'):
+        while _content_size(line, by_bytes) > max_size:
+            cut = max_size
+            while _content_size(line[:cut], by_bytes) > max_size:
+                cut -= 1
+            if current:
+                pieces.append(current)
+                current = ''
+            pieces.append(line[:cut])
+            line = line[cut:]
+        candidate = f"{current}\n{line}" if current else line
+        if _content_size(candidate, by_bytes) > max_size:
+            pieces.append(current)
+            current = line
+        else:
+            current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _split_digest(sections: List[str], limit: Optional[Tuple[int, bool]]) -> List[str]:
+    """
+    将多段通知内容合并为若干条消息，每条不超过渠道的长度上限
+
+    Args:
+        sections (List[str]): 各条通知内容
+        limit (Optional[Tuple[int, bool]]): (上限, 是否按字节计算)，None 表示不拆分
+
+    Returns:
+        List[str]: 合并后的消息内容列表
+    """
+    if limit is None:
+        return [DIGEST_SEPARATOR.join(sections)]
+
+    max_size, by_bytes = limit
+    chunks: List[str] = []
+    current = ''
+    for section in sections:
+        parts = [section]
+        if _content_size(section, by_bytes) > max_size:
+            parts = _split_oversized(section, max_size, by_bytes)
+        for part in parts:
+            candidate = f"{current}{DIGEST_SEPARATOR}{part}" if current else part
+            if _content_size(candidate, by_bytes) > max_size:
+                chunks.append(current)
+                current = part
+            else:
+                current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# 全局通知管理器实例（首次使用时创建）
+_notification_manager: Optional[NotificationManager] = None
+_notification_manager_lock = threading.Lock()
+
+
+def get_notification_manager() -> NotificationManager:
+    """
+    获取全局通知管理器
+
+    首次调用时才解析配置并创建实例；之后每次调用会检查配置文件修改时间，
+    文件变化时自动重新加载配置。
+    """
+    global _notification_manager
+    with _notification_manager_lock:
+        if _notification_manager is None:
+            _notification_manager = NotificationManager()
+        else:
+            _notification_manager.reload_if_changed()
+        return _notification_manager
+
+
+def __getattr__(name: str) -> Any:
+    """兼容旧代码中直接访问的 notification_manager 全局变量"""
+    if name == 'notification_manager':
+        return get_notification_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def send_notification(title: str, content: str, level: Optional[str] = None,
                      sound: Optional[str] = None, group: Optional[str] = None,
-                     url: Optional[str] = None):
+                     url: Optional[str] = None, concurrent: Optional[bool] = None,
+                     deadline: Optional[float] = DEFAULT_SEND_DEADLINE) -> Dict[str, Dict[str, Any]]:
     """
     便捷函数：发送通知
 
@@ -830,20 +1976,61 @@ def send_notification(title: str, content: str, level: Optional[str] = None,
         sound (Optional[str]): 推送声音 (Bark专用)
         group (Optional[str]): 推送分组 (Bark专用)
         url (Optional[str]): 跳转链接 (Bark专用)
+        concurrent (Optional[bool]): 是否并发推送到所有渠道，None 时使用配置 dispatch.concurrent（默认开启）
+        deadline (Optional[float]): 调用方最长等待时间（秒），不限制进程退出前等待慢渠道的时间
+
+    Returns:
+        Dict[str, Dict[str, Any]]: 各渠道推送结果；启用汇总推送时返回 {'spool': 写入结果}，
+            启用发件箱时返回 {'outbox': 写入结果}
     """
-    notification_manager.send(title, content, level=level, sound=sound, group=group, url=url)
+    manager = get_notification_manager()
+    if manager.digest_config.get('enabled'):
+        return {'spool': manager.spool(title, content, level=level, sound=sound, group=group, url=url)}
+    if manager.outbox_config.get('enabled'):
+        result = manager.enqueue(title, content, level=level, sound=sound, group=group, url=url)
+        manager.start_background_drain()
+        return {'outbox': result}
+    return manager.send(
+        title, content, level=level, sound=sound, group=group, url=url,
+        concurrent=concurrent, deadline=deadline
+    )
 
 
 if __name__ == "__main__":
     """测试推送功能"""
+    import argparse
     import sys
 
+    parser = argparse.ArgumentParser(description="青龙面板通知推送")
+    parser.add_argument("--flush", action="store_true", help="合并发送汇总暂存文件中的通知")
+    parser.add_argument("--drain", action="store_true", help="投递发件箱中所有到期的通知")
+    parser.add_argument("--rate-stats", action="store_true", help="查看各渠道限流统计")
+    args = parser.parse_args()
+
     # 设置日志
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
 
+    notification_manager = get_notification_manager()
+
+    if args.flush:
+        flush_results = notification_manager.flush_digest()
+        sys.exit(0 if not flush_results or any(r['success'] for r in flush_results.values()) else 1)
+
+    if args.rate_stats:
+        for channel, stat in notification_manager.rate_limit_stats().items():
+            print(f"{channel}: 发送 {stat['acquired']} 次, 限流等待 {stat['throttled']} 次 "
+                  f"(累计 {stat['waited_s']} 秒), 超时放弃 {stat['rejected']} 次")
+        sys.exit(0)
+
+    if args.drain:
+        drain_stats = notification_manager.drain_outbox()
+        print(f"📮 发件箱投递完成: 成功 {drain_stats['delivered']} 条, "
+              f"待重试 {drain_stats['retrying']} 条, 放弃 {drain_stats['dead']} 条")
+        sys.exit(0)
+
     # 检查是否有任何推送方式被启用
     if not any([
         notification_manager.is_bark_enabled(),
@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+new Env('全平台统一执行');
+cron: 1 1 1 1 1
+"""
+
+"""
+全平台统一执行入口
+
+在一个进程内执行所有已配置的平台脚本：
+- config/token.json 只解析一次（token_config 缓存），平台脚本读取各自配置时直接使用缓存
+- 平台脚本按需导入，未配置账号的平台不会导入其依赖（PIL、numpy、Crypto 等）
+- 所有平台的账号任务在同一个共享线程池中执行，受全局并发上限和平台并发上限约束
+- 执行结束后输出一份汇总结果，可选写入 JSON 文件或推送汇总通知
+
+各平台脚本仍可单独运行，行为不变。
+
+调度配置（token.json，可选）：
+    "orchestrator": {
+        "max_workers": 8,                      # 全局并发上限
+        "platforms": ["sf", "smzdm"],          # 只执行指定平台，默认执行全部已配置平台
+        "platform_limits": {"sf": 2}           # 平台并发上限，覆盖平台自身的 concurrency
+    }
+
+使用示例：
+    python orchestrator.py
+    python orchestrator.py --platforms sf,enshan --max-workers 4 --json result.json
+    python orchestrator.py --check-imports     # 只按顺序导入全部平台脚本，检查模块隔离
+
+Author: ZaiZaiCat
+Date: 2026-10-17
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from account_runner import AccountScheduler
+from notification import send_notification, NotificationSound
+from token_config import load_token_config
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("Orchestrator")
+
+DEFAULT_CONFIG_PATH = project_root / "config" / "token.json"
+DEFAULT_MAX_WORKERS = 8            # 默认全局并发上限
+MODULE_PREFIX = "checkin"          # 平台模块在 sys.modules 中的名称前缀
+
+
+@dataclass(frozen=True)
+class PlatformSpec:
+    """平台脚本描述"""
+    key: str                                # 平台标识，同时用作调度器中的平台名
+    name: str                               # 平台显示名称
+    script: str                             # 入口脚本路径（相对项目根目录）
+    config_keys: Tuple[str, ...]            # token.json 中平台配置节点的路径
+    argv: Optional[Tuple[str, ...]] = None  # 入口函数接收命令行参数时传入的参数
+
+    @property
+    def script_path(self) -> Path:
+        return project_root / self.script
+
+    @property
+    def module_root(self) -> Path:
+        """平台目录（script/<平台>），该目录下新导入的同级模块会被隔离"""
+        return project_root / Path(self.script).parts[0] / Path(self.script).parts[1]
+
+
+PLATFORMS: Tuple[PlatformSpec, ...] = (
+    PlatformSpec("sf", "顺丰速运", "script/sf/main.py", ("sf",)),
+    PlatformSpec("enshan", "恩山论坛", "script/enshan/sign_in.py", ("enshan",)),
+    PlatformSpec("kanxue", "看雪论坛", "script/kanxue/sign_in.py", ("kanxue",)),
+    PlatformSpec("shyp", "上海杨浦", "script/shyp/main.py", ("shyp",)),
+    PlatformSpec("huaruntong_999", "华润通-万象星", "script/huaruntong/999/main.py", ("huaruntong", "999")),
+    PlatformSpec("huaruntong_wx", "华润通-微信版", "script/huaruntong/huaruntong_wx/main.py",
+                 ("huaruntong", "huaruntong_wx")),
+    PlatformSpec("huaruntong_ole", "华润通-Ole'", "script/huaruntong/ole/main.py", ("huaruntong", "ole")),
+    PlatformSpec("huaruntong_wentiweilaihui", "华润通-文体未来荟", "script/huaruntong/wentiweilaihui/main.py",
+                 ("huaruntong", "wentiweilaihui")),
+    PlatformSpec("erke", "鸿星尔克", "script/erke/main.py", ("erke",)),
+    PlatformSpec("wps", "WPS Office", "script/wps/main.py", ("wps",)),
+    PlatformSpec("smzdm", "什么值得买", "script/smzdm/sign_daily_task/main.py", ("smzdm",)),
+    PlatformSpec("dachao", "大潮App", "script/dachao/main.py", ("dachao",), argv=()),
+)
+
+# 平台脚本导入时会临时修改 sys.path 和 sys.modules，需串行进行
+_import_lock = threading.Lock()
+
+
+@dataclass
+class PlatformResult:
+    """单个平台的执行结果"""
+    key: str
+    name: str
+    success: bool = False
+    exit_code: int = 0
+    accounts: int = 0
+    failed_accounts: int = 0
+    duration: float = 0.0
+    error: str = ""
+
+
+def get_platform_section(config: Dict[str, Any], spec: PlatformSpec) -> Dict[str, Any]:
+    """
+    获取平台的配置节点
+
+    Args:
+        config: token.json 配置内容
+        spec: 平台描述
+
+    Returns:
+        Dict: 平台配置节点，不存在时返回空字典
+    """
+    section: Any = config
+    for key in spec.config_keys:
+        section = section.get(key, {}) if isinstance(section, dict) else {}
+    if not isinstance(section, dict):
+        return {}
+    # 兼容看雪论坛的嵌套结构
+    nested = section.get(spec.config_keys[-1])
+    if 'accounts' not in section and isinstance(nested, dict):
+        return nested
+    return section
+
+
+def load_platform_module(spec: PlatformSpec) -> ModuleType:
+    """
+    导入平台入口脚本
+
+    平台脚本以 `from api import ...` 的方式导入同目录模块，多个平台的同名模块
+    在同一进程内会相互覆盖。导入时把脚本所在目录放到 sys.path 最前面，导入完成后
+    将该平台目录下新导入的模块改名为 checkin_<平台>.<模块名>，下一个平台即可导入自己的同名模块。
+
+    Args:
+        spec: 平台描述
+
+    Returns:
+        ModuleType: 平台入口模块
+    """
+    with _import_lock:
+        module_name = f"{MODULE_PREFIX}_{spec.key}"
+        if module_name in sys.modules:
+            return sys.modules[module_name]
+
+        saved_path = list(sys.path)
+        loaded_before = set(sys.modules)
+        sys.path.insert(0, str(spec.script_path.parent))
+        try:
+            module_spec = importlib.util.spec_from_file_location(module_name, spec.script_path)
+            module = importlib.util.module_from_spec(module_spec)
+            sys.modules[module_name] = module
+            try:
+                module_spec.loader.exec_module(module)
+            except BaseException:
+                sys.modules.pop(module_name, None)
+                raise
+            return module
+        finally:
+            sys.path[:] = saved_path
+            _isolate_platform_modules(spec, loaded_before)
+
+
+def _isolate_platform_modules(spec: PlatformSpec, loaded_before: set) -> None:
+    """把平台目录下新导入的同级模块移出顶层命名空间"""
+    root = spec.module_root.resolve()
+    for name in set(sys.modules) - loaded_before:
+        if name.startswith(f"{MODULE_PREFIX}_"):
+            continue
+        if not _module_under(sys.modules.get(name), root):
+            continue
+        sys.modules[f"{MODULE_PREFIX}_{spec.key}.{name}"] = sys.modules.pop(name)
+
+
+def _module_under(module: Optional[ModuleType], root: Path) -> bool:
+    """判断模块是否来自 root 目录（没有 __file__ 的命名空间包按 __path__ 判断）"""
+    locations = []
+    module_file = getattr(module, '__file__', None)
+    if module_file:
+        locations.append(module_file)
+    locations.extend(getattr(module, '__path__', None) or [])
+    for location in locations:
+        try:
+            Path(location).resolve().relative_to(root)
+        except ValueError:
+            continue
+        return True
+    return False
+
+
+def _account_succeeded(result: Any) -> bool:
+    """判断单个账号结果是否成功，兼容各平台不同的结果结构"""
+    if isinstance(result, dict):
+        if 'success' in result:
+            return bool(result.get('success'))
+        return not result.get('error')
+    return not getattr(result, 'error', '')
+
+
+def run_platform(spec: PlatformSpec, scheduler: AccountScheduler) -> PlatformResult:
+    """
+    执行单个平台
+
+    Args:
+        spec: 平台描述
+        scheduler: 共享账号调度器
+
+    Returns:
+        PlatformResult: 平台执行结果
+    """
+    result = PlatformResult(key=spec.key, name=spec.name)
+    start = time.monotonic()
+    logger.info(f"▶️ [{spec.name}] 开始执行")
+
+    try:
+        module = load_platform_module(spec)
+        with scheduler.bind(spec.key):
+            if spec.argv is not None:
+                exit_code = module.main(list(spec.argv))
+            else:
+                exit_code = module.main()
+        result.exit_code = exit_code if isinstance(exit_code, int) else 0
+    except SystemExit as e:
+        if e.code is None:
+            result.exit_code = 0
+        else:
+            result.exit_code = e.code if isinstance(e.code, int) else 1
+    except Exception as e:
+        result.exit_code = 1
+        result.error = str(e)
+        logger.error(f"❌ [{spec.name}] 执行异常: {e}", exc_info=True)
+
+    account_results = scheduler.account_results(spec.key)
+    result.accounts = len(account_results)
+    result.failed_accounts = sum(1 for r in account_results if not _account_succeeded(r))
+    result.success = result.exit_code == 0 and not result.error and result.failed_accounts == 0
+    result.duration = time.monotonic() - start
+
+    status = "✅" if result.success else "❌"
+    logger.info(f"{status} [{spec.name}] 执行结束，退出码 {result.exit_code}，耗时 {result.duration:.1f} 秒")
+    return result
+
+
+def select_platforms(config: Dict[str, Any], keys: Optional[Sequence[str]] = None) -> List[PlatformSpec]:
+    """
+    筛选需要执行的平台
+
+    Args:
+        config: token.json 配置内容
+        keys: 指定的平台标识，为空时执行全部已配置账号的平台
+
+    Returns:
+        List[PlatformSpec]: 需要执行的平台列表
+    """
+    known = {spec.key: spec for spec in PLATFORMS}
+    if keys:
+        unknown = [key for key in keys if key not in known]
+        if unknown:
+            logger.warning(f"⚠️ 未知平台已忽略: {', '.join(unknown)}")
+        candidates = [known[key] for key in keys if key in known]
+    else:
+        candidates = list(PLATFORMS)
+
+    selected = []
+    for spec in candidates:
+        if get_platform_section(config, spec).get('accounts'):
+            selected.append(spec)
+        else:
+            logger.info(f"⏭️ [{spec.name}] 未配置账号，跳过")
+    return selected
+
+
+def resolve_max_workers(orchestrator_config: Dict[str, Any], override: Optional[int] = None) -> int:
+    """
+    解析全局并发上限
+
+    优先级：命令行参数 > token.json orchestrator.max_workers > 环境变量 CHECKIN_MAX_WORKERS > 默认值
+
+    Args:
+        orchestrator_config: token.json 中的 orchestrator 节点
+        override: 命令行指定的并发上限
+
+    Returns:
+        int: 全局并发上限
+    """
+    for value in (override, orchestrator_config.get('max_workers'), os.environ.get('CHECKIN_MAX_WORKERS')):
+        if value is None or value == "":
+            continue
+        try:
+            return max(1, int(value))
+        except (TypeError, ValueError):
+            logger.warning(f"全局并发上限配置无效: {value}，已忽略")
+    return DEFAULT_MAX_WORKERS
+
+
+def run_all(config_path: Path = DEFAULT_CONFIG_PATH, platform_keys: Optional[Sequence[str]] = None,
+            max_workers: Optional[int] = None) -> List[PlatformResult]:
+    """
+    执行所有平台
+
+    每个平台的入口函数在独立的协调线程中运行，账号任务统一提交到共享线程池。
+
+    Args:
+        config_path: token.json 路径
+        platform_keys: 指定的平台标识
+        max_workers: 全局并发上限
+
+    Returns:
+        List[PlatformResult]: 按平台注册顺序排列的执行结果
+    """
+    logger.info(f"正在读取配置文件: {config_path}")
+    config = load_token_config(config_path)
+    orchestrator_config = config.get('orchestrator', {})
+
+    platforms = select_platforms(config, platform_keys or orchestrator_config.get('platforms'))
+    if not platforms:
+        logger.warning("没有需要执行的平台")
+        return []
+
+    scheduler = AccountScheduler(
+        resolve_max_workers(orchestrator_config, max_workers),
+        orchestrator_config.get('platform_limits'),
+    )
+    logger.info(f"🚀 共 {len(platforms)} 个平台，全局并发上限 {scheduler.max_workers}")
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(platforms), thread_name_prefix="platform") as executor:
+            futures = [executor.submit(run_platform, spec, scheduler) for spec in platforms]
+            return [future.result() for future in futures]
+    finally:
+        scheduler.shutdown()
+
+
+def format_summary(results: List[PlatformResult], start_time: datetime, end_time: datetime) -> str:
+    """
+    生成汇总文本
+
+    Args:
+        results: 平台执行结果
+        start_time: 开始时间
+        end_time: 结束时间
+
+    Returns:
+        str: 汇总文本
+    """
+    duration = (end_time - start_time).total_seconds()
+    success_count = sum(1 for r in results if r.success)
+
+    content_parts = [
+        "📊 执行统计:",
+        f"✅ 成功平台: {success_count}/{len(results)}",
+        f"👥 账号总数: {sum(r.accounts for r in results)}",
+        f"❌ 失败账号: {sum(r.failed_accounts for r in results)}",
+        "",
+        "📝 详情:",
+    ]
+    for r in results:
+        status = "✅" if r.success else "❌"
+        line = f"  {status} [{r.name}] 账号 {r.accounts - r.failed_accounts}/{r.accounts}，耗时 {int(r.duration)}秒"
+        if r.error:
+            line += f"，错误: {r.error[:50]}"
+        content_parts.append(line)
+
+    content_parts.append("")
+    content_parts.append(f"⏱️ 执行耗时: {int(duration)}秒")
+    content_parts.append(f"🕐 完成时间: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    return "\n".join(content_parts)
+
+
+def check_imports(keys: Optional[Sequence[str]] = None) -> int:
+    """
+    按 PLATFORMS 顺序导入平台入口脚本（不执行任务），检查同名模块隔离是否生效
+
+    Args:
+        keys: 指定的平台标识，为空时检查全部平台
+
+    Returns:
+        int: 失败的平台数量
+    """
+    failed = 0
+    for spec in PLATFORMS:
+        if keys and spec.key not in keys:
+            continue
+        try:
+            load_platform_module(spec)
+            logger.info(f"✅ [{spec.name}] 导入成功")
+        except Exception as e:
+            failed += 1
+            logger.error(f"❌ [{spec.name}] 导入失败: {e}")
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """主函数"""
+    parser = argparse.ArgumentParser(description="全平台统一执行入口")
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG_PATH), help="token.json 路径")
+    parser.add_argument("--platforms", help="只执行指定平台，逗号分隔，如 sf,enshan")
+    parser.add_argument("--max-workers", type=int, help="全局并发上限")
+    parser.add_argument("--json", dest="json_path", help="将汇总结果写入指定 JSON 文件")
+    parser.add_argument("--notify", action="store_true", help="额外推送一条全平台汇总通知")
+    parser.add_argument("--list", action="store_true", help="列出支持的平台")
+    parser.add_argument("--check-imports", action="store_true", help="按顺序导入所有平台脚本并检查，不执行任务")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for spec in PLATFORMS:
+            print(f"{spec.key:<28}{spec.name}")
+        return 0
+
+    platform_keys = [key.strip() for key in args.platforms.split(",") if key.strip()] if args.platforms else None
+
+    if args.check_imports:
+        return 1 if check_imports(platform_keys) else 0
+
+    start_time = datetime.now()
+    logger.info("=" * 60)
+    logger.info(f"全平台统一执行开始 - {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    logger.info("=" * 60)
+
+    results = run_all(Path(args.config), platform_keys, args.max_workers)
+
+    end_time = datetime.now()
+    summary = format_summary(results, start_time, end_time)
+    logger.info("=" * 60)
+    logger.info(f"全平台统一执行完成 - {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    for line in summary.splitlines():
+        logger.info(line)
+    logger.info("=" * 60)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'start_time': start_time.isoformat(timespec='seconds'),
+                'end_time': end_time.isoformat(timespec='seconds'),
+                'platforms': [asdict(r) for r in results],
+            }, f, ensure_ascii=False, indent=2)
+        logger.info(f"汇总结果已写入: {args.json_path}")
+
+    failed_count = sum(1 for r in results if not r.success)
+    if args.notify and results:
+        if failed_count == 0:
+            title, sound = "全平台签到完成 ✅", NotificationSound.BIRDSONG
+        elif failed_count == len(results):
+            title, sound = "全平台签到失败 ❌", NotificationSound.ALARM
+        else:
+            title, sound = "全平台签到部分成功 ⚠️", NotificationSound.BELL
+        try:
+            send_notification(title=title, content=summary, sound=sound)
+        except Exception as e:
+            logger.error(f"❌ 推送汇总通知失败: {e}", exc_info=True)
+
+    if failed_count > 0:
+        return 1 if failed_count == len(results) else 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
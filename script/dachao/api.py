@@ -17,13 +17,18 @@ from __future__ import annotations
 
 import base64
 import hashlib
+import heapq
 import json
 import logging
+import os
 import random
+import threading
 import time
 import uuid
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional, Tuple
 from urllib.parse import parse_qs, quote, urlparse
 
 import requests
@@ -46,8 +51,19 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_TIMEOUT = (10, 30)
 
+# 登录态缓存：保存 vapp 登录上下文、签到/阅读 tid 与 aihoge member，member 过期前跳过整条登录链
+LOGIN_CACHE_FILE = Path(__file__).resolve().parent.parent.parent / "config" / "dachao_login_cache.json"
+LOGIN_CACHE_EXPIRE_MARGIN = 600     # member 过期前提前失效的秒数，避免任务执行中途过期
+_login_cache_lock = threading.Lock()
+
 REDEEM_ALREADY_RECEIVED_CODES = {"is_receive_packet"}
 
+# 抽奖与现金红包兑换
+LOTTERY_DRAW_CONCURRENCY = 2    # 同一活动每批并发发起的抽奖请求数
+REDEEM_WORKERS = 2              # 后台兑换现金红包的线程数
+REDEEM_QUEUE_SIZE = 8           # 未完成兑换的上限，达到上限时暂停抽奖等待兑换腾出位置
+REDEEM_POLL_INTERVAL = 0.2      # 等待后台抽奖/兑换完成时的轮询间隔（秒）
+
 
 def interpret_redeem_response(resp: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -562,6 +578,32 @@ class AihogeClient:
         self.account_name = account_name
         self._rsa = RsaEncryptor()
         self._captcha_verified = False
+        self._executors: Dict[str, ThreadPoolExecutor] = {}
+        self._executors_lock = threading.Lock()
+
+    def executor(self, name: str, max_workers: int) -> ThreadPoolExecutor:
+        """
+        本账号复用的后台线程池（按用途区分，首次使用时创建，签到抽奖与阅读抽奖共用，close 时关闭）
+
+        Args:
+            name: 用途，如 "draw"（抽奖）、"redeem"（红包兑换）
+            max_workers: 首次创建时的线程数
+        """
+        with self._executors_lock:
+            executor = self._executors.get(name)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=max(1, int(max_workers)), thread_name_prefix=f"dachao-{name}")
+                self._executors[name] = executor
+            return executor
+
+    def close(self) -> None:
+        """等待后台任务结束并关闭线程池与会话"""
+        with self._executors_lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown(wait=True)
+        self.session.close()
 
     def _common_headers(self, *, limit_id: str, referer_url: str) -> Dict[str, str]:
         # aihoge 侧通用头：
@@ -718,7 +760,7 @@ class AihogeClient:
         if not request_id or not img_url:
             return result
 
-        tn_x = calculate_slide_offset(img_url)
+        tn_x = calculate_slide_offset(img_url, session=self.session)
         if tn_x is None:
             return result
 
@@ -1033,19 +1075,182 @@ def discover_news_read_tid(buoy_resp: Dict[str, Any]) -> Tuple[str, str]:
     return "", ""
 
 
+def _login_cache_key(cfg: NewDachaoAccountConfig) -> str:
+    """生成登录态缓存键（不直接落盘手机号）"""
+    return hashlib.sha256(f"{cfg.tenant_id}:{cfg.phone_number}".encode("utf-8")).hexdigest()
+
+
+def _member_expires_at(member_header: str, now: float) -> float:
+    """
+    解析 member 的 expire 字段，换算为缓存失效的 Unix 时间戳（秒）
+
+    expire 兼容三种写法：毫秒时间戳、秒级时间戳、剩余有效秒数；缺失时返回 0（不缓存）。
+    """
+    try:
+        expire = int(json.loads(member_header).get("expire") or 0)
+    except (ValueError, TypeError, AttributeError):
+        return 0
+    if expire <= 0:
+        return 0
+    if expire > 10**12:
+        expire_at = expire / 1000
+    elif expire > 10**9:
+        expire_at = float(expire)
+    else:
+        expire_at = now + expire
+    return expire_at - LOGIN_CACHE_EXPIRE_MARGIN
+
+
+def _read_login_cache() -> Dict[str, Any]:
+    """读取磁盘上的登录态缓存"""
+    if not LOGIN_CACHE_FILE.exists():
+        return {}
+    try:
+        with open(LOGIN_CACHE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"读取登录态缓存失败: {e}")
+        return {}
+
+
+def _write_login_cache(cache_key: str, entry: Optional[Dict[str, Any]]) -> None:
+    """写入（或删除）磁盘上的登录态缓存，同时清理已过期的条目"""
+    with _login_cache_lock:
+        now = time.time()
+        data = {
+            key: value
+            for key, value in _read_login_cache().items()
+            if isinstance(value, dict) and value.get("expires_at", 0) > now
+        }
+        if entry is None:
+            data.pop(cache_key, None)
+        else:
+            data[cache_key] = entry
+        tmp_path = f"{LOGIN_CACHE_FILE}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, LOGIN_CACHE_FILE)
+        except OSError as e:
+            logger.warning(f"写入登录态缓存失败: {e}")
+
+
+def load_cached_login(cfg: NewDachaoAccountConfig) -> Optional[Dict[str, Any]]:
+    """
+    读取账号未过期的缓存登录态
+
+    Returns:
+        {"ctx": DachaoLoginContext, "sign_page_url", "sign_tid", "news_entry_url", "news_tid", "member_header"}
+        缓存不存在、已过期或内容不完整时返回 None
+    """
+    with _login_cache_lock:
+        entry = _read_login_cache().get(_login_cache_key(cfg))
+    if not isinstance(entry, dict) or entry.get("expires_at", 0) <= time.time():
+        return None
+    try:
+        ctx = DachaoLoginContext(**entry["ctx"])
+    except (KeyError, TypeError):
+        return None
+    if not ctx.session_id or not ctx.account_id or not entry.get("member_header") or not entry.get("sign_tid"):
+        return None
+    return {
+        "ctx": ctx,
+        "sign_page_url": str(entry.get("sign_page_url") or ""),
+        "sign_tid": str(entry["sign_tid"]),
+        "news_entry_url": str(entry.get("news_entry_url") or ""),
+        "news_tid": str(entry.get("news_tid") or ""),
+        "member_header": str(entry["member_header"]),
+    }
+
+
+def save_cached_login(
+    cfg: NewDachaoAccountConfig,
+    *,
+    ctx: DachaoLoginContext,
+    sign_page_url: str,
+    sign_tid: str,
+    news_entry_url: str,
+    news_tid: str,
+    member_header: str,
+) -> None:
+    """保存账号登录态，有效期取 member 的 expire；member 未给出 expire 时不缓存"""
+    now = time.time()
+    expires_at = _member_expires_at(member_header, now)
+    if expires_at <= now:
+        return
+    _write_login_cache(
+        _login_cache_key(cfg),
+        {
+            "ctx": asdict(ctx),
+            "sign_page_url": sign_page_url,
+            "sign_tid": sign_tid,
+            "news_entry_url": news_entry_url,
+            "news_tid": news_tid,
+            "member_header": member_header,
+            "cached_at": int(now),
+            "expires_at": int(expires_at),
+        },
+    )
+
+
+def clear_cached_login(cfg: NewDachaoAccountConfig) -> None:
+    """删除账号的缓存登录态（登录态失效时调用）"""
+    _write_login_cache(_login_cache_key(cfg), None)
+
+
 def login_build_clients(
-    cfg: NewDachaoAccountConfig, *, account_name: str = ""
+    cfg: NewDachaoAccountConfig, *, account_name: str = "", use_cache: bool = True
 ) -> Tuple[str, DachaoLoginContext, str, str, str, AihogeClient]:
     """
     完整流程：passport -> vapp -> (discover sign tid) -> aihoge member -> AihogeClient
 
+    use_cache=True 时优先复用 member 未过期的缓存登录态：跳过 passport/vapp 登录与 member 构建，
+    只重新发现签到/阅读 tid；签到 tid 变化时仅用缓存的 vapp 登录态重建 member，
+    发现失败（vapp 登录态失效）时清除缓存并走完整登录。
+
     Returns:
-        (passport_code, ctx, sign_page_url, sign_tid, news_tid, aihoge_client)
+        (passport_code, ctx, sign_page_url, sign_tid, news_tid, aihoge_client)，复用缓存时 passport_code 为空
     """
-    passport = TmuyunPassportClient()
     vapp = TmuyunVappClient()
-
     name = account_name or cfg.account_name
+
+    cached = load_cached_login(cfg) if use_cache else None
+    if cached:
+        logger.info(f"[{name}] 使用缓存登录态，跳过登录：{_mask_mobile(cfg.phone_number)}")
+        ctx = cached["ctx"]
+        try:
+            sign_page_url, sign_tid, news_entry_url, news_tid = _discover_activities(vapp, ctx, cfg, name)
+        except Exception as e:
+            logger.warning(f"[{name}] 缓存登录态已失效，重新登录: {e}")
+            clear_cached_login(cfg)
+            cached = None
+
+    if cached:
+        auth_code = ""
+        member_header = cached["member_header"]
+        if sign_tid != cached["sign_tid"]:
+            logger.info(f"[{name}] 签到活动tid已变化（{cached['sign_tid']} -> {sign_tid}），重新构建member")
+            member_header = _build_member_header(cfg, ctx, sign_tid, sign_page_url, name)
+        if (sign_page_url, sign_tid, news_entry_url, news_tid, member_header) != (
+            cached["sign_page_url"],
+            cached["sign_tid"],
+            cached["news_entry_url"],
+            cached["news_tid"],
+            cached["member_header"],
+        ):
+            save_cached_login(
+                cfg,
+                ctx=ctx,
+                sign_page_url=sign_page_url,
+                sign_tid=sign_tid,
+                news_entry_url=news_entry_url,
+                news_tid=news_tid,
+                member_header=member_header,
+            )
+        return auth_code, ctx, sign_page_url, sign_tid, news_tid, _build_aihoge_client(cfg, ctx, member_header, name)
+
+    passport = TmuyunPassportClient()
     logger.info(f"[{name}] 开始登录：{_mask_mobile(cfg.phone_number)}")
 
     # Step 1) 账号密码登录：向 passport 申请 authorization_code（登录 code）
@@ -1093,6 +1298,33 @@ def login_build_clients(
         account_name=name,
     )
 
+    # Step 3/4) 发现签到与阅读有礼活动
+    sign_page_url, sign_tid, news_entry_url, news_tid = _discover_activities(vapp, ctx, cfg, name)
+
+    # Step 5) 用 vapp 的 account/session 构建 aihoge member（后续 aihoge 所有接口都需要 header: member）
+    member_header = _build_member_header(cfg, ctx, sign_tid, sign_page_url, name)
+    if use_cache:
+        save_cached_login(
+            cfg,
+            ctx=ctx,
+            sign_page_url=sign_page_url,
+            sign_tid=sign_tid,
+            news_entry_url=news_entry_url,
+            news_tid=news_tid,
+            member_header=member_header,
+        )
+    return auth_code, ctx, sign_page_url, sign_tid, news_tid, _build_aihoge_client(cfg, ctx, member_header, name)
+
+
+def _discover_activities(
+    vapp: TmuyunVappClient, ctx: DachaoLoginContext, cfg: NewDachaoAccountConfig, name: str
+) -> Tuple[str, str, str, str]:
+    """
+    发现签到与阅读有礼活动
+
+    Returns:
+        (sign_page_url, sign_tid, news_entry_url, news_tid)，news_tid 可能为空
+    """
     # Step 3) 拉取「我的」页面模块列表，提取签到入口 url 与 tid
     mypage = vapp.mypage_list(ctx, user_agent=cfg.user_agent, cookies=cfg.vapp_cookies, account_name=name)
     sign_page_url, sign_tid = discover_sign_page_and_tid(mypage)
@@ -1110,8 +1342,13 @@ def login_build_clients(
     else:
         logger.info(f"[{name}] 未找到阅读有礼入口（可能账号无该浮标/活动未开启）")
     # news_tid 可为空（部分账号/版本可能无“阅读有礼”浮标）
+    return sign_page_url, sign_tid, news_entry_url, news_tid
 
-    # Step 5) 用 vapp 的 account/session 构建 aihoge member（后续 aihoge 所有接口都需要 header: member）
+
+def _build_member_header(
+    cfg: NewDachaoAccountConfig, ctx: DachaoLoginContext, sign_tid: str, sign_page_url: str, name: str
+) -> str:
+    """用 vapp 的 account/session 构建 aihoge member 请求头"""
     member_builder = AihogeMemberBuilder()
     member_header, _raw_member = member_builder.build_member(
         ctx=ctx,
@@ -1129,8 +1366,13 @@ def login_build_clients(
         logger.info(f"[{name}] 构建member成功: id={member_id} expire={expire}")
     except Exception:
         logger.info(f"[{name}] 构建member成功")
+    return member_header
 
-    aihoge = AihogeClient(
+
+def _build_aihoge_client(
+    cfg: NewDachaoAccountConfig, ctx: DachaoLoginContext, member_header: str, name: str
+) -> AihogeClient:
+    return AihogeClient(
         member_header=member_header,
         account_id=ctx.account_id,
         session_id=ctx.session_id,
@@ -1141,13 +1383,125 @@ def login_build_clients(
         redeem_user_agent=cfg.redeem_user_agent,
         account_name=name,
     )
-    return auth_code, ctx, sign_page_url, sign_tid, news_tid, aihoge
 
 
 def run_sign_flow(aihoge: AihogeClient, *, sign_tid: str, sign_page_url: str) -> Dict[str, Any]:
     return aihoge.sign_in(activity_id=sign_tid, sign_page_url=sign_page_url)
 
 
+def describe_redeem_result(prize_desc: str, redeem_resp: Dict[str, Any]) -> str:
+    """把红包兑换结果拼接到奖品描述后"""
+    redeem_meta = interpret_redeem_response(redeem_resp)
+    if redeem_meta["ok"]:
+        return f"{prize_desc} ({'已领取' if redeem_meta['already_received'] else '已兑换'})"
+    err = redeem_meta.get("message") or "未知错误"
+    code_text = redeem_meta.get("code") or ""
+    suffix = f"{code_text}:{err}" if code_text else err
+    return f"{prize_desc} (兑换失败: {suffix})"
+
+
+class RedeemQueue:
+    """
+    后台现金红包兑换队列
+
+    抽到现金红包后提交兑换码即可继续抽奖，兑换（含 redeem_red_packet_with_retry 对每个兑换码的重试等待）
+    在账号复用的 "redeem" 线程池中执行；未完成的兑换达到 max_pending 时 has_capacity 返回 False，由调用方等待。
+    """
+
+    def __init__(self, aihoge: AihogeClient, *, workers: int = REDEEM_WORKERS, max_pending: int = REDEEM_QUEUE_SIZE):
+        self.aihoge = aihoge
+        self.max_pending = max(1, int(max_pending))
+        self._executor = aihoge.executor("redeem", workers)
+        self._futures: Dict[int, Future] = {}
+
+    def has_capacity(self) -> bool:
+        return sum(1 for future in self._futures.values() if not future.done()) < self.max_pending
+
+    def submit(self, index: int, code: str) -> None:
+        self._futures[index] = self._executor.submit(self.aihoge.redeem_red_packet_with_retry, code)
+
+    def done(self) -> bool:
+        return all(future.done() for future in self._futures.values())
+
+    def results(self) -> Dict[int, Any]:
+        """返回 {抽奖序号: 兑换返回}，兑换抛出异常时为异常对象"""
+        outcomes: Dict[int, Any] = {}
+        for index, future in self._futures.items():
+            try:
+                outcomes[index] = future.result()
+            except Exception as e:
+                outcomes[index] = e
+        return outcomes
+
+
+def iter_lottery_draws(
+    aihoge: AihogeClient,
+    *,
+    lottery_id: str,
+    limit_id: str,
+    referer_url: str,
+    remain: int,
+    draw_concurrency: int = LOTTERY_DRAW_CONCURRENCY,
+) -> Generator[float, None, List[str]]:
+    """
+    执行抽奖（生成器版本，等待通过 yield 交给调用方调度）
+
+    - 每批并发发起 draw_concurrency 次抽奖，批次之间保留 1~3 秒间隔
+    - 抽奖请求在账号复用的 "draw" 线程池中执行，等待结果时 yield 轮询间隔，不阻塞其他账号的流程
+    - 抽到现金红包(type=3)时把兑换码交给 RedeemQueue 后台兑换，不阻塞后续抽奖
+    - 全部抽完后等待兑换结束，把兑换结果合并回对应的奖品描述
+
+    Returns:
+        按抽奖顺序排列的奖品描述列表
+    """
+    if remain <= 0:
+        return []
+
+    results: List[str] = [""] * remain
+    cash_prizes: Dict[int, str] = {}
+    batch_size = max(1, int(draw_concurrency))
+    redeem_queue = RedeemQueue(aihoge)
+    draw_executor = aihoge.executor("draw", batch_size)
+    for start in range(0, remain, batch_size):
+        batch = [
+            (
+                index,
+                draw_executor.submit(
+                    aihoge.draw_lottery, lottery_id=lottery_id, limit_id=limit_id, referer_url=referer_url
+                ),
+            )
+            for index in range(start, min(start + batch_size, remain))
+        ]
+        for index, future in batch:
+            while not future.done():
+                yield REDEEM_POLL_INTERVAL
+            try:
+                res = future.result()
+                prize_desc = aihoge.parse_lottery_result(res)
+                # 现金红包：拿到 code 后交给后台自动兑换
+                if res.get("type") == 3:
+                    if aihoge.account_name:
+                        logger.info(f"[{aihoge.account_name}] 获取到现金红包兑换码，加入后台兑换队列...")
+                    while not redeem_queue.has_capacity():
+                        yield REDEEM_POLL_INTERVAL
+                    redeem_queue.submit(index, str(res.get("code") or ""))
+                    cash_prizes[index] = prize_desc
+                results[index] = prize_desc
+            except Exception as e:
+                results[index] = f"抽奖失败: {e}"
+        if start + batch_size < remain:
+            yield random.uniform(1.0, 3.0)
+
+    while not redeem_queue.done():
+        yield REDEEM_POLL_INTERVAL
+    for index, outcome in redeem_queue.results().items():
+        if isinstance(outcome, Exception):
+            results[index] = f"{cash_prizes[index]} (兑换失败: {outcome})"
+        else:
+            results[index] = describe_redeem_result(cash_prizes[index], outcome)
+    return results
+
+
 def run_sign_lottery_flow(
     aihoge: AihogeClient,
     *,
@@ -1166,29 +1520,9 @@ def run_sign_lottery_flow(
     except Exception:
         remain = 0
 
-    results: List[str] = []
-    for i in range(remain):
-        try:
-            res = aihoge.draw_lottery(lottery_id=sign_lottery_id, limit_id=sign_tid, referer_url=referer_url)
-            prize_desc = aihoge.parse_lottery_result(res)
-            # 现金红包：拿到 code 后自动兑换
-            if res.get("type") == 3:
-                redeem_code = str(res.get("code") or "")
-                redeem_resp = aihoge.redeem_red_packet_with_retry(redeem_code)
-                redeem_meta = interpret_redeem_response(redeem_resp)
-                if redeem_meta["ok"]:
-                    prize_desc = f"{prize_desc} ({'已领取' if redeem_meta['already_received'] else '已兑换'})"
-                else:
-                    err = redeem_meta.get("message") or "未知错误"
-                    code_text = redeem_meta.get("code") or ""
-                    suffix = f"{code_text}:{err}" if code_text else err
-                    prize_desc = f"{prize_desc} (兑换失败: {suffix})"
-            results.append(prize_desc)
-        except Exception as e:
-            results.append(f"抽奖失败: {e}")
-        if i < remain - 1:
-            time.sleep(random.uniform(1.0, 3.0))
-
+    results = drive_flow(
+        iter_lottery_draws(aihoge, lottery_id=sign_lottery_id, limit_id=sign_tid, referer_url=referer_url, remain=remain)
+    )
     return {"lottery_id": sign_lottery_id, "lottery_count": remain, "lottery_results": results}
 
 
@@ -1206,6 +1540,97 @@ def run_read_flow(
     sleep_enabled: bool = True,
     account_name: str = "",
 ) -> Dict[str, Any]:
+    return drive_flow(
+        iter_read_flow(
+            aihoge,
+            vapp,
+            ctx,
+            news_tid=news_tid,
+            news_entry_url=news_entry_url,
+            vapp_user_agent=vapp_user_agent,
+            vapp_cookies=vapp_cookies,
+            read_delay_range_s=read_delay_range_s,
+            sleep_enabled=sleep_enabled,
+            account_name=account_name,
+        )
+    )
+
+
+def drive_flow(flow: Generator[float, None, Any]) -> Any:
+    """顺序执行生成器流程：按 yield 的秒数 sleep，返回流程结果"""
+    try:
+        delay = next(flow)
+        while True:
+            if delay > 0:
+                time.sleep(delay)
+            delay = next(flow)
+    except StopIteration as stop:
+        return stop.value
+
+
+def run_flows_interleaved(flows: List[Generator[float, None, Any]]) -> List[Any]:
+    """
+    在同一个定时循环里交错执行多个生成器流程
+
+    每个流程 yield 的等待秒数只推迟它自己的下一步，到期最早的流程先执行，
+    各流程的空闲等待互相重叠：N 个账号的阅读总耗时接近单个账号，而不是 N 倍。
+
+    Args:
+        flows: 生成器流程列表（如 iter_read_flow 的返回值）
+
+    Returns:
+        与 flows 顺序一致的结果列表；流程抛出异常时对应位置为该异常对象
+    """
+    results: List[Any] = [None] * len(flows)
+    # 定时堆：(到期时间, 序号, 流程下标)，序号保证同一时刻按入堆顺序执行
+    heap: List[Tuple[float, int, int]] = []
+    seq = 0
+    now = time.monotonic()
+    for index in range(len(flows)):
+        heapq.heappush(heap, (now, seq, index))
+        seq += 1
+
+    while heap:
+        due, _, index = heapq.heappop(heap)
+        wait = due - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            delay = next(flows[index])
+        except StopIteration as stop:
+            results[index] = stop.value
+            continue
+        except Exception as e:
+            results[index] = e
+            continue
+        heapq.heappush(heap, (time.monotonic() + max(0.0, float(delay)), seq, index))
+        seq += 1
+    return results
+
+
+def iter_read_flow(
+    aihoge: AihogeClient,
+    vapp: TmuyunVappClient,
+    ctx: DachaoLoginContext,
+    *,
+    news_tid: str,
+    news_entry_url: str,
+    vapp_user_agent: str,
+    vapp_cookies: str = "",
+
+    read_delay_range_s: Tuple[float, float] = (20.0, 30.0),
+    sleep_enabled: bool = True,
+    account_name: str = "",
+) -> Generator[float, None, Dict[str, Any]]:
+    """
+    阅读任务流程（生成器版本）
+
+    流程中的每次等待不直接 sleep，而是 yield 等待秒数交给调用方调度，
+    便于 run_flows_interleaved 把多个账号的阅读等待重叠在同一个定时循环里。
+
+    Returns:
+        生成器结束时返回阅读统计，字段同 run_read_flow
+    """
     # 阅读任务流程：
     # 1) 拉取阅读列表（news/list/{tid}）
     # 2) 对未完成的文章调用 readArticle（params RSA）
@@ -1259,7 +1684,7 @@ def run_read_flow(
             if sleep_enabled and delay_s > 0:
                 if account_name:
                     logger.info(f"[{account_name}] 等待 {delay_s:.2f} 秒后上报阅读时间...")
-                time.sleep(delay_s)
+                yield delay_s
             else:
                 # 调试模式可跳过等待，但仍要给 vapp/read_time 一个合理的 read_time 参数（避免 0）
                 delay_ms = 1000
@@ -1283,10 +1708,10 @@ def run_read_flow(
             delay = random.uniform(2.0, 5.0)
             if account_name and error_code == "click_quick":
                 logger.info(f"[{account_name}] 请求过快，等待 {delay:.2f} 秒后继续...")
-            time.sleep(delay)
+            yield delay
 
         if idx < len(candidates):
-            time.sleep(random.uniform(2.0, 5.0))
+            yield random.uniform(2.0, 5.0)
 
     lottery_results: List[str] = []
     lottery_count = 0
@@ -1296,27 +1721,9 @@ def run_read_flow(
         except Exception:
             remain = 0
         lottery_count = remain
-        for i in range(remain):
-            try:
-                res = aihoge.draw_lottery(lottery_id=award_activity_id, limit_id=news_tid, referer_url=referer_url)
-                prize_desc = aihoge.parse_lottery_result(res)
-                if res.get("type") == 3:
-                    redeem_code = str(res.get("code") or "")
-                    logger.info("获取到现金红包兑换码，准备自动兑换...")
-                    redeem_resp = aihoge.redeem_red_packet_with_retry(redeem_code)
-                    redeem_meta = interpret_redeem_response(redeem_resp)
-                    if redeem_meta["ok"]:
-                        prize_desc = f"{prize_desc} ({'已领取' if redeem_meta['already_received'] else '已兑换'})"
-                    else:
-                        err = redeem_meta.get("message") or "未知错误"
-                        code_text = redeem_meta.get("code") or ""
-                        suffix = f"{code_text}:{err}" if code_text else err
-                        prize_desc = f"{prize_desc} (兑换失败: {suffix})"
-                lottery_results.append(prize_desc)
-            except Exception as e:
-                lottery_results.append(f"抽奖失败: {e}")
-            if i < remain - 1:
-                time.sleep(random.uniform(1.0, 3.0))
+        lottery_results = yield from iter_lottery_draws(
+            aihoge, lottery_id=award_activity_id, limit_id=news_tid, referer_url=referer_url, remain=remain
+        )
 
     return {
         "total": len(candidates),
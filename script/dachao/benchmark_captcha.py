@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+滑动验证码求解性能对比
+
+在合成的三段式验证码图片（带缺口背景 / 滑块 / 完整背景）上对比：
+- 原逐行、逐窗口循环实现（保留在本文件中作为对照）
+- captcha.solve_slide_offset 向量化实现
+
+并校验两者在每张图片上得到的三种方法结果及最终偏移量完全一致。
+
+使用方法：
+    python benchmark_captcha.py [--images 50] [--width 320] [--height 160]
+
+Author: ZaiZaiCat
+Date: 2026-10-17
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from captcha import (
+    _calculate_offset_method1,
+    _calculate_offset_method2,
+    _calculate_offset_method3,
+    solve_slide_offset,
+)
+
+SLIDER_WIDTH = 50
+
+
+def legacy_method1(part1_with_gap: np.ndarray, part3_complete: np.ndarray) -> Optional[int]:
+    diff = np.abs(part1_with_gap.astype(int) - part3_complete.astype(int))
+    diff_gray = np.sum(diff, axis=2) if len(diff.shape) == 3 else diff
+
+    edge_positions = []
+    for row in range(diff_gray.shape[0]):
+        row_diff = diff_gray[row, :]
+        if np.max(row_diff) > 30:
+            significant = np.where(row_diff > 30)[0]
+            if len(significant) > 0:
+                edge_positions.append(significant[0])
+
+    if edge_positions:
+        return int(np.median(edge_positions))
+    return None
+
+
+def legacy_method2(part2_slider: np.ndarray, part3_complete: np.ndarray, slider_width: int = SLIDER_WIDTH) -> int:
+    slider = part2_slider[:, 0:slider_width]
+    min_diff = float("inf")
+    best_x = 0
+    for x in range(0, part3_complete.shape[1] - slider_width):
+        region = part3_complete[:, x : x + slider_width, :]
+        diff = np.sum((slider.astype(int) - region.astype(int)) ** 2)
+        if diff < min_diff:
+            min_diff = diff
+            best_x = x
+    return best_x
+
+
+def legacy_method3(part1_with_gap: np.ndarray, part3_complete: np.ndarray) -> Optional[int]:
+    diff = np.abs(part1_with_gap.astype(int) - part3_complete.astype(int))
+    col_diff = np.sum(diff, axis=(0, 2))
+    threshold = np.mean(col_diff) + 0.8 * np.std(col_diff)
+    gap_cols = np.where(col_diff > threshold)[0]
+    if len(gap_cols) > 0:
+        return int(gap_cols[0])
+    return None
+
+
+def split_parts(img_array: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    part_height = img_array.shape[0] // 3
+    return (
+        img_array[0:part_height, :],
+        img_array[part_height : part_height * 2, :],
+        img_array[part_height * 2 : part_height * 3, :],
+    )
+
+
+def legacy_solve(img_array: np.ndarray) -> Tuple[List[Optional[int]], Optional[int]]:
+    part1, part2, part3 = split_parts(img_array)
+    methods = [legacy_method1(part1, part3), legacy_method2(part2, part3), legacy_method3(part1, part3)]
+    results = [r for r in methods if r is not None]
+    return methods, (int(np.median(results)) if results else None)
+
+
+def vectorized_methods(img_array: np.ndarray) -> List[Optional[int]]:
+    part1, part2, part3 = split_parts(img_array.astype(np.int32))
+    return [
+        _calculate_offset_method1(part1, part3),
+        _calculate_offset_method2(part2, part3),
+        _calculate_offset_method3(part1, part3),
+    ]
+
+
+def make_captcha(rng: np.random.Generator, width: int, height: int) -> Tuple[np.ndarray, int]:
+    """生成三段式验证码图片，返回 (图片, 真实缺口位置)"""
+    # 平滑的彩色背景 + 噪声纹理
+    xs = np.linspace(0, 4 * np.pi, width)
+    ys = np.linspace(0, 2 * np.pi, height)
+    base = 120 + 60 * np.sin(xs[np.newaxis, :] + rng.uniform(0, np.pi)) * np.cos(ys[:, np.newaxis])
+    background = np.stack([base + rng.uniform(-40, 40) for _ in range(3)], axis=2)
+    background = np.clip(background + rng.normal(0, 12, background.shape), 0, 255).astype(np.uint8)
+
+    gap_x = int(rng.integers(SLIDER_WIDTH + 10, width - SLIDER_WIDTH - 10))
+    gap_y = int(rng.integers(10, height - SLIDER_WIDTH - 10))
+    gap = (slice(gap_y, gap_y + SLIDER_WIDTH), slice(gap_x, gap_x + SLIDER_WIDTH))
+
+    with_gap = background.copy()
+    with_gap[gap] = (with_gap[gap] * 0.4).astype(np.uint8)
+
+    slider = np.zeros_like(background)
+    slider[gap_y:gap_y + SLIDER_WIDTH, 0:SLIDER_WIDTH] = background[gap]
+
+    return np.concatenate([with_gap, slider, background], axis=0), gap_x
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="滑动验证码求解性能对比")
+    parser.add_argument("--images", type=int, default=50, help="合成图片数量")
+    parser.add_argument("--width", type=int, default=320, help="图片宽度")
+    parser.add_argument("--height", type=int, default=160, help="每一段的高度")
+    parser.add_argument("--seed", type=int, default=20261017, help="随机种子")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    images = [make_captcha(rng, args.width, args.height)[0] for _ in range(args.images)]
+
+    mismatches = 0
+    for index, img in enumerate(images):
+        legacy, legacy_final = legacy_solve(img)
+        current = vectorized_methods(img)
+        current_final = solve_slide_offset(img)
+        if legacy != current or legacy_final != current_final:
+            mismatches += 1
+            print(f"❌ 第 {index} 张不一致: 原实现 {legacy} -> {legacy_final}，向量化 {current} -> {current_final}")
+
+    start = time.perf_counter()
+    for img in images:
+        legacy_solve(img)
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for img in images:
+        solve_slide_offset(img)
+    vectorized_elapsed = time.perf_counter() - start
+
+    print(f"图片: {args.images} 张，{args.width}x{args.height * 3}")
+    print(f"原实现:   {legacy_elapsed / args.images * 1000:.2f} ms/张")
+    print(f"向量化:   {vectorized_elapsed / args.images * 1000:.2f} ms/张")
+    print(f"提升:     {legacy_elapsed / vectorized_elapsed:.1f} 倍")
+    print("✅ 结果完全一致" if mismatches == 0 else f"❌ {mismatches} 张结果不一致")
+    return 0 if mismatches == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
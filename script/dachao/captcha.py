@@ -6,74 +6,164 @@
 说明：
 - 该逻辑从 script/dachao_bak/captcha.py 迁移而来，保持算法一致，供 dachao 阅读任务验证码使用。
 - 需要依赖：numpy、Pillow、requests（项目 requirements.txt 通常已包含）。
+- 下载可复用调用方的 requests.Session；图片只解码一次为连续的 int32 数组，各方法共用其切片视图。
+- 同一张验证码（按 URL 或内容哈希）重复求解时直接返回缓存的偏移量。
 """
 
 from __future__ import annotations
 
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
 from io import BytesIO
-from typing import Optional
+from typing import Optional, Tuple
 
 import numpy as np
 import requests
+from numpy.lib.stride_tricks import sliding_window_view
 from PIL import Image
 
 logger = logging.getLogger(__name__)
 
 
-def download_captcha_image(url: str) -> Optional[np.ndarray]:
+OFFSET_CACHE_SIZE = 64  # 偏移量 LRU 缓存条目数
+
+# 偏移量缓存：键为 "url:<图片地址>" 或 "sha1:<图片内容哈希>"
+_offset_cache: "OrderedDict[str, Optional[int]]" = OrderedDict()
+_offset_cache_lock = threading.Lock()
+
+
+def _download_captcha_bytes(url: str, session: Optional[requests.Session] = None) -> Optional[bytes]:
     try:
-        response = requests.get(url, timeout=10)
+        response = (session or requests).get(url, timeout=10)
         response.raise_for_status()
-        img = Image.open(BytesIO(response.content))
+        return response.content
+    except Exception as e:
+        logger.error(f"下载验证码图片失败: {e}")
+        return None
+
+
+def decode_captcha_image(content: bytes) -> Optional[np.ndarray]:
+    """解码为 (高, 宽, 3) 的连续 int32 数组（只做一次类型转换）"""
+    try:
+        img = Image.open(BytesIO(content))
         if img.mode != "RGB":
             img = img.convert("RGB")
-        return np.array(img)
+        return np.ascontiguousarray(np.asarray(img), dtype=np.int32)
     except Exception as e:
-        logger.error(f"下载验证码图片失败: {e}")
+        logger.error(f"解码验证码图片失败: {e}")
+        return None
+
+
+def download_captcha_image(url: str, session: Optional[requests.Session] = None) -> Optional[np.ndarray]:
+    content = _download_captcha_bytes(url, session)
+    if content is None:
         return None
+    return decode_captcha_image(content)
 
 
-def _calculate_offset_method1(part1_with_gap: np.ndarray, part3_complete: np.ndarray) -> Optional[int]:
-    diff = np.abs(part1_with_gap.astype(int) - part3_complete.astype(int))
-    diff_gray = np.sum(diff, axis=2) if len(diff.shape) == 3 else diff
+def _get_cached_offset(key: str) -> Tuple[bool, Optional[int]]:
+    with _offset_cache_lock:
+        if key not in _offset_cache:
+            return False, None
+        _offset_cache.move_to_end(key)
+        return True, _offset_cache[key]
 
-    height = diff_gray.shape[0]
-    edge_positions = []
 
-    for row in range(height):
-        row_diff = diff_gray[row, :]
-        threshold = 30
-        if np.max(row_diff) > threshold:
-            significant = np.where(row_diff > threshold)[0]
-            if len(significant) > 0:
-                edge_positions.append(significant[0])
+def _put_cached_offset(offset: Optional[int], *keys: str) -> None:
+    with _offset_cache_lock:
+        for key in keys:
+            _offset_cache[key] = offset
+            _offset_cache.move_to_end(key)
+        while len(_offset_cache) > OFFSET_CACHE_SIZE:
+            _offset_cache.popitem(last=False)
+
+
+def clear_offset_cache() -> None:
+    with _offset_cache_lock:
+        _offset_cache.clear()
+
+
+EDGE_THRESHOLD = 30  # 方法1：逐行差异超过该值的第一个像素视为缺口左边缘
+
+
+def _as_int32(array: np.ndarray) -> np.ndarray:
+    """转换为 int32；已经是 int32 时直接返回原数组（不复制）"""
+    return array if array.dtype == np.int32 else array.astype(np.int32)
+
+
+def _gap_diff(part1_with_gap: np.ndarray, part3_complete: np.ndarray) -> np.ndarray:
+    """带缺口背景与完整背景逐像素差异（各通道求和），方法1和方法3共用"""
+    diff = np.abs(_as_int32(part1_with_gap) - _as_int32(part3_complete))
+    if diff.ndim != 3:
+        return diff
+    # 通道数很少，逐通道相加比 np.sum(axis=2) 快得多
+    diff_gray = diff[:, :, 0].copy()
+    for channel in range(1, diff.shape[2]):
+        diff_gray += diff[:, :, channel]
+    return diff_gray
 
-    if edge_positions:
-        return int(np.median(edge_positions))
-    return None
+
+def _calculate_offset_method1(part1_with_gap: np.ndarray, part3_complete: np.ndarray,
+                              diff_gray: Optional[np.ndarray] = None) -> Optional[int]:
+    if diff_gray is None:
+        diff_gray = _gap_diff(part1_with_gap, part3_complete)
+
+    # 每一行第一个超过阈值的位置；没有超过阈值的行不参与统计
+    significant = diff_gray > EDGE_THRESHOLD
+    has_edge = significant.any(axis=1)
+    if not has_edge.any():
+        return None
+
+    edge_positions = significant.argmax(axis=1)[has_edge]
+    return int(np.median(edge_positions))
 
 
 def _calculate_offset_method2(part2_slider: np.ndarray, part3_complete: np.ndarray, slider_width: int = 50) -> int:
-    slider = part2_slider[:, 0:slider_width]
+    """
+    滑块模板匹配：一次性计算所有窗口位置的平方差和（SSD），取最小值所在位置。
 
-    min_diff = float("inf")
-    best_x = 0
+    SSD(x) = Σregion² - 2·Σ(slider·region) + Σslider²：
+    - Σregion² 由列平方和的前缀和得到
+    - 互相关项先用一次矩阵乘法求出滑块每一列与背景每一列的内积，再沿对角线（sliding_window_view）求和
+    各项均为不超过 2^53 的整数，float64 矩阵乘法结果精确，与逐个窗口计算完全一致。
+    """
     img_width = part3_complete.shape[1]
+    window_count = img_width - slider_width
+    if window_count <= 0:
+        return 0
 
-    for x in range(0, img_width - slider_width):
-        region = part3_complete[:, x : x + slider_width, :] if len(part3_complete.shape) == 3 else part3_complete[:, x : x + slider_width]
-        diff = np.sum((slider.astype(int) - region.astype(int)) ** 2)
-        if diff < min_diff:
-            min_diff = diff
-            best_x = x
+    complete = _as_int32(part3_complete)
+    slider = _as_int32(part2_slider[:, 0:slider_width])
+    if complete.ndim == 2:
+        complete = complete[:, :, np.newaxis]
+        slider = slider[:, :, np.newaxis]
 
-    return best_x
+    # Σregion²：按列求平方和后做前缀和，任意窗口的和为两个前缀和之差
+    col_sq = np.zeros(img_width + 1, dtype=np.int64)
+    np.cumsum(np.einsum("hwc,hwc->w", complete, complete, dtype=np.int64), out=col_sq[1:])
+    region_sq = col_sq[slider_width:slider_width + window_count] - col_sq[:window_count]
 
+    # 列内积矩阵 dots[k, j] = Σ_{h,c} slider[h, k, c]·complete[h, j, c]
+    slider_cols = slider.transpose(1, 0, 2).reshape(slider_width, -1).astype(np.float64)
+    complete_cols = complete.transpose(1, 0, 2).reshape(img_width, -1).astype(np.float64)
+    dots = slider_cols @ complete_cols.T
 
-def _calculate_offset_method3(part1_with_gap: np.ndarray, part3_complete: np.ndarray) -> Optional[int]:
-    diff = np.abs(part1_with_gap.astype(int) - part3_complete.astype(int))
-    col_diff = np.sum(diff, axis=(0, 2)) if len(diff.shape) == 3 else np.sum(diff, axis=0)
+    # Σ(slider·region)[x] = Σ_k dots[k, x + k]：每一行错开 k 列后按列求和
+    shifted = sliding_window_view(dots.ravel(), window_count)[:: img_width + 1][:slider_width]
+    cross = np.rint(shifted.sum(axis=0)).astype(np.int64)
+
+    slider_sq = int(np.einsum("hwc,hwc->", slider, slider, dtype=np.int64))
+    ssd = region_sq - 2 * cross + slider_sq
+    return int(np.argmin(ssd))
+
+
+def _calculate_offset_method3(part1_with_gap: np.ndarray, part3_complete: np.ndarray,
+                              diff_gray: Optional[np.ndarray] = None) -> Optional[int]:
+    if diff_gray is None:
+        diff_gray = _gap_diff(part1_with_gap, part3_complete)
+    col_diff = np.sum(diff_gray, axis=0)
 
     threshold = np.mean(col_diff) + 0.8 * np.std(col_diff)
     gap_cols = np.where(col_diff > threshold)[0]
@@ -83,7 +173,12 @@ def _calculate_offset_method3(part1_with_gap: np.ndarray, part3_complete: np.nda
     return None
 
 
-def calculate_slide_offset(image_url: str) -> Optional[int]:
+def calculate_slide_offset(
+    image_url: str,
+    session: Optional[requests.Session] = None,
+    *,
+    use_cache: bool = True,
+) -> Optional[int]:
     """
     计算滑动验证码的偏移量 tn_x。
 
@@ -91,25 +186,66 @@ def calculate_slide_offset(image_url: str) -> Optional[int]:
     1) 带缺口的背景
     2) 滑块
     3) 完整背景
+
+    session 传入调用方（如 AihogeClient）的会话以复用连接；
+    use_cache 为 True 时，同一 URL 或同一图片内容直接返回缓存结果。
     """
-    img_array = download_captcha_image(image_url)
+    url_key = f"url:{image_url}"
+    if use_cache:
+        hit, offset = _get_cached_offset(url_key)
+        if hit:
+            logger.info(f"验证码偏移量命中缓存: tn_x = {offset}")
+            return offset
+
+    content = _download_captcha_bytes(image_url, session)
+    if content is None:
+        return None
+
+    content_key = f"sha1:{hashlib.sha1(content).hexdigest()}"
+    if use_cache:
+        hit, offset = _get_cached_offset(content_key)
+        if hit:
+            logger.info(f"验证码偏移量命中缓存: tn_x = {offset}")
+            _put_cached_offset(offset, url_key)
+            return offset
+
+    img_array = decode_captcha_image(content)
     if img_array is None:
         return None
 
+    offset = solve_slide_offset(img_array)
+    if use_cache and offset is not None:
+        _put_cached_offset(offset, url_key, content_key)
+    return offset
+
+
+def solve_slide_offset(img_array: np.ndarray) -> Optional[int]:
+    """
+    根据验证码图片像素计算偏移量，取三种方法结果的中位数。
+
+    图片只转换一次为 int32（已是 int32 时不复制），三部分均为该数组的切片视图。
+    """
     height = img_array.shape[0]
     if height % 3 != 0:
         logger.warning("验证码图片高度不是3的倍数")
         return None
 
+    pixels = _as_int32(img_array)
     part_height = height // 3
-    part1_with_gap = img_array[0:part_height, :]
-    part2_slider = img_array[part_height : part_height * 2, :]
-    part3_complete = img_array[part_height * 2 : part_height * 3, :]
+    part1_with_gap = pixels[0:part_height, :]
+    part2_slider = pixels[part_height : part_height * 2, :]
+    part3_complete = pixels[part_height * 2 : part_height * 3, :]
 
     results = []
 
+    diff_gray = None
+    try:
+        diff_gray = _gap_diff(part1_with_gap, part3_complete)
+    except Exception as e:
+        logger.debug(f"缺口差异计算失败: {e}")
+
     try:
-        offset1 = _calculate_offset_method1(part1_with_gap, part3_complete)
+        offset1 = _calculate_offset_method1(part1_with_gap, part3_complete, diff_gray)
         if offset1 is not None:
             results.append(offset1)
     except Exception as e:
@@ -123,7 +259,7 @@ def calculate_slide_offset(image_url: str) -> Optional[int]:
         logger.debug(f"方法2计算失败: {e}")
 
     try:
-        offset3 = _calculate_offset_method3(part1_with_gap, part3_complete)
+        offset3 = _calculate_offset_method3(part1_with_gap, part3_complete, diff_gray)
         if offset3 is not None:
             results.append(offset3)
     except Exception as e:
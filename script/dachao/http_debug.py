@@ -5,15 +5,24 @@ HTTP 调试日志工具（结构化输出）
 
 当根 logger 开启 DEBUG 时：
 - 输出每次请求/响应的 URL、headers、params、body、status_code、response headers、response json/text
-- 默认对 cookie/token/password/member 等敏感字段做脱敏
+- 默认对 cookie/token/password/member 等敏感字段做脱敏，大结构按层数/元素数/节点数截断
+- 也可通过 configure_debug_file 把每次请求写成一行紧凑 JSON 到单独的调试文件
+
+无论是否开启 DEBUG，request_json 都会把每次请求的耗时记录到 timing_collector，
+按「方法 + 域名 + 路径模板」汇总 p50/p95/max，便于定位拖慢整体运行的接口。
 """
 
 from __future__ import annotations
 
 import json
 import logging
+import math
+import re
+import threading
 import time
-from typing import Any, Dict, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
 
 import requests
 
@@ -35,9 +44,140 @@ _SENSITIVE_KEYWORDS = (
 )
 
 
+# 路径中的动态段（纯数字、长十六进制、UUID、带数字的长 id）统一替换为 {id}
+_DYNAMIC_SEGMENT = re.compile(
+    r"^(?:\d+|[0-9a-fA-F]{16,}|[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|(?=[A-Za-z0-9_-]*\d)[A-Za-z0-9_-]{12,})$"
+)
+
+
+def path_template(path: str) -> str:
+    """把 URL 路径中的动态段替换为 {id}，如 /api/news/list/123 -> /api/news/list/{id}"""
+    return "/".join("{id}" if _DYNAMIC_SEGMENT.match(seg) else seg for seg in (path or "/").split("/"))
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """最近秩法求百分位（sorted_values 已升序且非空）"""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class HttpTimingCollector:
+    """
+    HTTP 请求耗时收集器（线程安全）
+
+    按 (方法, 域名, 路径模板) 记录每次请求的状态码、响应字节数与耗时，
+    汇总出各接口的次数、p50/p95/max 与累计耗时。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # {(method, host, template): {"latencies": [...], "bytes": int, "statuses": {status: count}}}
+        self._endpoints: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+
+    def record(self, *, method: str, url: str, status: Optional[int], nbytes: int, elapsed_s: float) -> None:
+        parts = urlsplit(url)
+        key = (method.upper(), parts.netloc, path_template(parts.path))
+        status_key = str(status) if status is not None else "error"
+        with self._lock:
+            entry = self._endpoints.setdefault(key, {"latencies": [], "bytes": 0, "statuses": {}})
+            entry["latencies"].append(elapsed_s)
+            entry["bytes"] += nbytes
+            entry["statuses"][status_key] = entry["statuses"].get(status_key, 0) + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        Returns:
+            List[Dict]: 各接口的汇总，按累计耗时降序
+        """
+        with self._lock:
+            snapshot = [(key, list(e["latencies"]), e["bytes"], dict(e["statuses"])) for key, e in self._endpoints.items()]
+
+        rows = []
+        for (method, host, template), latencies, nbytes, statuses in snapshot:
+            latencies.sort()
+            rows.append(
+                {
+                    "method": method,
+                    "host": host,
+                    "path": template,
+                    "count": len(latencies),
+                    "p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+                    "p95_ms": round(_percentile(latencies, 95) * 1000, 1),
+                    "max_ms": round(latencies[-1] * 1000, 1),
+                    "total_s": round(sum(latencies), 3),
+                    "bytes": nbytes,
+                    "statuses": statuses,
+                }
+            )
+        rows.sort(key=lambda row: row["total_s"], reverse=True)
+        return rows
+
+    def format_table(self) -> str:
+        """生成汇总表格文本"""
+        rows = self.summary()
+        if not rows:
+            return "（无 HTTP 请求记录）"
+        lines = [f"{'次数':>4} {'p50(ms)':>9} {'p95(ms)':>9} {'max(ms)':>9} {'累计(s)':>8} {'字节':>9}  接口"]
+        for row in rows:
+            statuses = ",".join(f"{code}x{count}" for code, count in sorted(row["statuses"].items()))
+            lines.append(
+                f"{row['count']:>4} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['max_ms']:>9.1f} "
+                f"{row['total_s']:>8.2f} {row['bytes']:>9}  {row['method']} {row['host']}{row['path']} [{statuses}]"
+            )
+        return "\n".join(lines)
+
+    def write_json(self, path: Union[str, Path]) -> None:
+        """把汇总写入 JSON 文件"""
+        payload = {"generated_at": int(time.time()), "endpoints": self.summary()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+
+
+# 进程内共享的耗时收集器，request_json 自动记录
+timing_collector = HttpTimingCollector()
+
+
+# 预编译的敏感字段匹配：字段名（小写）包含任一关键字即视为敏感
+_SENSITIVE_KEY_PATTERN = re.compile("|".join(re.escape(word) for word in _SENSITIVE_KEYWORDS))
+
+# 脱敏输出的规模上限：超过后截断，避免大响应（news/list、myPage/list）拖慢请求
+REDACT_MAX_DEPTH = 6            # 最大嵌套层数，更深的结构只输出类型与长度
+REDACT_MAX_ITEMS = 20           # 每个 dict/list 最多输出的元素数
+REDACT_MAX_NODES = 500          # 单个结构最多遍历的节点数，用完后其余部分只输出类型与长度
+REDACT_MAX_TEXT = 1500          # 非 JSON 响应文本最多输出的字符数
+PARSE_MAX_CHARS = 256 * 1024    # 响应文本超过该长度时不再为调试解析 JSON，直接截断输出文本
+
+# 调试 JSONL 文件：设置后每次请求以一行紧凑 JSON 追加写入（不依赖 DEBUG 级别）
+_debug_file: Optional[Path] = None
+_debug_file_lock = threading.Lock()
+
+
+def configure_debug_file(path: Union[str, Path, None]) -> None:
+    """
+    设置（path 为空时关闭）HTTP 调试 JSONL 文件
+
+    Args:
+        path: 输出文件路径，每行一个请求/响应记录
+    """
+    global _debug_file
+    _debug_file = Path(path) if path else None
+
+
+_sensitive_key_cache: Dict[str, bool] = {}
+
+
 def _is_sensitive_key(key: str) -> bool:
-    k = str(key or "").lower()
-    return any(word in k for word in _SENSITIVE_KEYWORDS)
+    k = str(key or "")
+    hit = _sensitive_key_cache.get(k)
+    if hit is None:
+        hit = _SENSITIVE_KEY_PATTERN.search(k.lower()) is not None
+        if len(_sensitive_key_cache) < 4096:
+            _sensitive_key_cache[k] = hit
+    return hit
 
 
 def _mask_string(value: Any, *, keep_head: int = 4, keep_tail: int = 4) -> Any:
@@ -53,30 +193,58 @@ def _mask_string(value: Any, *, keep_head: int = 4, keep_tail: int = 4) -> Any:
     return f"{s[:keep_head]}...{s[-keep_tail:]}(len={len(s)})"
 
 
-def redact(obj: Any) -> Any:
+def _summarize(obj: Any) -> str:
+    return f"<{type(obj).__name__} len={len(obj)}>"
+
+
+def redact(
+    obj: Any,
+    *,
+    max_depth: int = REDACT_MAX_DEPTH,
+    max_items: int = REDACT_MAX_ITEMS,
+    max_nodes: int = REDACT_MAX_NODES,
+) -> Any:
     """
     递归脱敏：对 dict/list 结构中可能包含的 token/cookie/password/member 等字段做脱敏。
+
+    同时限制输出规模：超过 max_depth 层、每层超过 max_items 个元素或累计超过 max_nodes 个节点的部分
+    不再展开，只保留类型与长度，因此耗时与原始结构大小无关。
     """
-    if isinstance(obj, dict):
-        out: Dict[str, Any] = {}
-        for k, v in obj.items():
-            if _is_sensitive_key(k):
-                out[str(k)] = _mask_string(v)
-            else:
-                out[str(k)] = redact(v)
-        return out
-    if isinstance(obj, list):
-        return [redact(x) for x in obj]
-    if isinstance(obj, str):
-        # 对明显的长字符串做轻度脱敏（避免把 RSA 密文/长 token 打满屏）
-        if len(obj) >= 120:
-            return _mask_string(obj)
-        return obj
-    return obj
+    budget = [max_nodes]
+
+    def walk(value: Any, depth: int) -> Any:
+        if isinstance(value, (dict, list)):
+            if depth >= max_depth or budget[0] <= 0:
+                return _summarize(value)
+            budget[0] -= 1
+            if isinstance(value, dict):
+                out: Dict[str, Any] = {}
+                for index, (k, v) in enumerate(value.items()):
+                    if index >= max_items or budget[0] <= 0:
+                        out["..."] = f"{len(value) - index} more"
+                        break
+                    out[str(k)] = _mask_string(v) if _is_sensitive_key(k) else walk(v, depth + 1)
+                return out
+            items = []
+            for index, v in enumerate(value):
+                if index >= max_items or budget[0] <= 0:
+                    items.append(f"...{len(value) - index} more")
+                    break
+                items.append(walk(v, depth + 1))
+            return items
+        budget[0] -= 1
+        if isinstance(value, str):
+            # 对明显的长字符串做轻度脱敏（避免把 RSA 密文/长 token 打满屏）
+            if len(value) >= 120:
+                return _mask_string(value)
+            return value
+        return value
+
+    return walk(obj, 0)
 
 
 def _try_parse_json(text: str) -> Optional[Any]:
-    if not text:
+    if not text or len(text) > PARSE_MAX_CHARS:
         return None
     t = text.lstrip()
     if not (t.startswith("{") or t.startswith("[")):
@@ -99,11 +267,18 @@ def log_http_exchange(
     timeout: Any = None,
     response: requests.Response,
     elapsed_s: float,
+    response_json: Any = None,
 ) -> None:
     """
-    以结构化 JSON 输出请求/响应信息（DEBUG 级别）。
+    以结构化 JSON 输出请求/响应信息。
+
+    - 根 logger 开启 DEBUG 时输出到日志
+    - 通过 configure_debug_file 设置调试文件时，以紧凑 JSON 行追加写入该文件
+    两者都未开启时直接返回，不做任何序列化。response_json 为调用方已解析的响应 JSON，传入时不再重复解析。
     """
-    if not logger.isEnabledFor(logging.DEBUG):
+    to_log = logger.isEnabledFor(logging.DEBUG)
+    debug_file = _debug_file
+    if not to_log and debug_file is None:
         return
 
     req_payload: Dict[str, Any] = {
@@ -118,26 +293,37 @@ def log_http_exchange(
     if json_body is not None:
         req_payload["json"] = redact(json_body)
 
-    resp_headers = dict(response.headers or {})
-    try:
-        resp_text = response.text or ""
-    except Exception:
-        resp_text = ""
-
-    resp_json = _try_parse_json(resp_text)
     resp_payload: Dict[str, Any] = {
         "status_code": response.status_code,
         "elapsed_s": round(elapsed_s, 3),
-        "headers": redact(resp_headers),
+        "headers": redact(dict(response.headers or {})),
     }
-    if resp_json is not None:
-        resp_payload["json"] = redact(resp_json)
+    if response_json is None:
+        try:
+            resp_text = response.text or ""
+        except Exception:
+            resp_text = ""
+        response_json = _try_parse_json(resp_text)
+    if response_json is not None:
+        resp_payload["json"] = redact(response_json)
     else:
-        resp_payload["text"] = (resp_text[:1500] + "...(truncated)") if len(resp_text) > 1500 else resp_text
+        resp_payload["text"] = (
+            (resp_text[:REDACT_MAX_TEXT] + "...(truncated)") if len(resp_text) > REDACT_MAX_TEXT else resp_text
+        )
 
     block = {"request": req_payload, "response": resp_payload}
-    prefix = f"[{account_name}] " if account_name else ""
-    logger.debug("%sHTTP 调试信息:\n%s", prefix, json.dumps(block, ensure_ascii=False, indent=2))
+    if debug_file is not None:
+        line = json.dumps(
+            {"ts": round(time.time(), 3), "account": account_name, **block}, ensure_ascii=False, separators=(",", ":")
+        )
+        try:
+            with _debug_file_lock, open(debug_file, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            logger.warning(f"写入 HTTP 调试文件失败: {e}")
+    if to_log:
+        prefix = f"[{account_name}] " if account_name else ""
+        logger.debug("%sHTTP 调试信息:\n%s", prefix, json.dumps(block, ensure_ascii=False, indent=2))
 
 
 def request_json(
@@ -155,9 +341,22 @@ def request_json(
     """
     发起 HTTP 请求并返回 JSON（自动 raise_for_status），并在 DEBUG 时打印请求/响应详细信息。
     """
-    start = time.time()
-    resp = session.request(method=method, url=url, headers=headers, params=params, data=data, json=json_body, timeout=timeout)
-    elapsed = time.time() - start
+    start = time.perf_counter()
+    try:
+        resp = session.request(
+            method=method, url=url, headers=headers, params=params, data=data, json=json_body, timeout=timeout
+        )
+    except Exception:
+        timing_collector.record(method=method, url=url, status=None, nbytes=0, elapsed_s=time.perf_counter() - start)
+        raise
+    elapsed = time.perf_counter() - start
+    timing_collector.record(
+        method=method, url=url, status=resp.status_code, nbytes=len(resp.content or b""), elapsed_s=elapsed
+    )
+    try:
+        payload = resp.json()
+    except ValueError:
+        payload = None
     log_http_exchange(
         account_name=account_name,
         method=method,
@@ -169,6 +368,10 @@ def request_json(
         timeout=timeout,
         response=resp,
         elapsed_s=elapsed,
+        response_json=payload,
     )
     resp.raise_for_status()
-    return resp.json()
+    if payload is None:
+        # 非 JSON 响应：按原行为由 resp.json() 抛出解析异常
+        return resp.json()
+    return payload
@@ -6,7 +6,6 @@ cron: 30 10,14,18 * * *
 """
 
 import argparse
-import json
 import logging
 import random
 import sys
@@ -14,18 +13,23 @@ import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Generator, List, Optional, Tuple
 
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from account_runner import resolve_concurrency, run_accounts
 from notification import NotificationSound, send_notification
+from token_config import get_platform_accounts, get_platform_config
 
+from http_debug import configure_debug_file, timing_collector
 from api import (
     NewDachaoAccountConfig,
     TmuyunVappClient,
     discover_news_read_tid,
+    iter_read_flow,
     login_build_clients,
+    run_flows_interleaved,
     run_read_flow,
     run_sign_flow,
     run_sign_lottery_flow,
@@ -34,6 +38,8 @@ from api import (
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+HTTP_TIMING_FILE = project_root / "config" / "dachao_http_timing.json"   # 本次运行各接口耗时汇总
+
 
 @dataclass
 class AccountResult:
@@ -49,11 +55,6 @@ class AccountResult:
     error: str = ""
 
 
-def load_config(path: Path) -> Dict[str, Any]:
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
 def log_task_header(title: str, timestamp: datetime) -> None:
     logger.info("=" * 60)
     logger.info(f"{title} - {timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
@@ -64,6 +65,42 @@ def _account_section(account_name: str, title: str) -> None:
     logger.info(f"[{account_name}] ===== {title} =====")
 
 
+def _apply_read_stats(result: AccountResult, read_stats: Dict[str, Any]) -> None:
+    result.read_total = int(read_stats.get("total") or 0)
+    result.read_completed = int(read_stats.get("completed") or 0)
+    result.news_lottery_count = int(read_stats.get("lottery_count") or 0)
+    result.news_lottery_results = list(read_stats.get("lottery_results") or [])
+
+    logger.info(f"[{result.account_name}] 阅读抽奖剩余次数: {result.news_lottery_count}")
+    if result.news_lottery_count <= 0:
+        logger.info(f"[{result.account_name}] 没有可用的阅读抽奖次数")
+    else:
+        for prize in result.news_lottery_results:
+            logger.info(f"[{result.account_name}] 阅读抽奖结果: {prize}")
+
+
+def _closing_flow(flow: Generator[float, None, Any], aihoge: Any) -> Generator[float, None, Any]:
+    """阅读流程结束（或被关闭）后关闭账号的 aihoge 客户端及其后台线程池"""
+    try:
+        return (yield from flow)
+    finally:
+        aihoge.close()
+
+
+def run_deferred_reads(deferred_reads: List[Tuple[AccountResult, Generator[float, None, Dict[str, Any]]]]) -> None:
+    """把各账号延后的阅读流程放到同一个定时循环里执行，空闲等待在账号间重叠"""
+    if not deferred_reads:
+        return
+    logger.info(f"开始重叠执行 {len(deferred_reads)} 个账号的阅读任务")
+    outcomes = run_flows_interleaved([flow for _, flow in deferred_reads])
+    for (result, _), outcome in zip(deferred_reads, outcomes):
+        if isinstance(outcome, Exception):
+            result.error = str(outcome)
+            logger.error(f"处理账号 {result.account_name} 的阅读任务时发生错误: {outcome}")
+        else:
+            _apply_read_stats(result, outcome or {})
+
+
 def run_account(
     cfg: NewDachaoAccountConfig,
     mode: str,
@@ -72,14 +109,26 @@ def run_account(
     read_delay_min: float,
     read_delay_max: float,
     sleep_enabled: bool,
+    use_login_cache: bool = True,
+    deferred_reads: Optional[List[Tuple[AccountResult, Generator[float, None, Dict[str, Any]]]]] = None,
 ) -> AccountResult:
+    """
+    执行单个账号的任务
+
+    deferred_reads 不为 None 时阅读任务不在本函数内执行，而是把阅读流程追加到该列表，
+    由 run_deferred_reads 与其他账号的阅读流程重叠执行。
+    """
     account_name = cfg.account_name
     result = AccountResult(account_name=account_name)
+    aihoge = None
+    read_deferred = False
 
     try:
         logger.info(f"开始处理账号: {account_name}")
         _account_section(account_name, "登录模块")
-        _auth_code, ctx, sign_page_url, sign_tid, news_tid, aihoge = login_build_clients(cfg, account_name=account_name)
+        _auth_code, ctx, sign_page_url, sign_tid, news_tid, aihoge = login_build_clients(
+            cfg, account_name=account_name, use_cache=use_login_cache
+        )
 
         if mode in ("all", "sign"):
             _account_section(account_name, "签到模块")
@@ -128,7 +177,7 @@ def run_account(
             if delay_min > delay_max:
                 delay_min, delay_max = delay_max, delay_min
 
-            read_stats = run_read_flow(
+            read_kwargs = dict(
                 aihoge=aihoge,
                 vapp=vapp,
                 ctx=ctx,
@@ -140,17 +189,12 @@ def run_account(
                 sleep_enabled=bool(sleep_enabled),
                 account_name=account_name,
             )
-            result.read_total = int(read_stats.get("total") or 0)
-            result.read_completed = int(read_stats.get("completed") or 0)
-            result.news_lottery_count = int(read_stats.get("lottery_count") or 0)
-            result.news_lottery_results = list(read_stats.get("lottery_results") or [])
-
-            logger.info(f"[{account_name}] 阅读抽奖剩余次数: {result.news_lottery_count}")
-            if result.news_lottery_count <= 0:
-                logger.info(f"[{account_name}] 没有可用的阅读抽奖次数")
+            if deferred_reads is not None:
+                deferred_reads.append((result, _closing_flow(iter_read_flow(**read_kwargs), aihoge)))
+                read_deferred = True
+                logger.info(f"[{account_name}] 阅读任务已加入重叠调度队列")
             else:
-                for prize in result.news_lottery_results:
-                    logger.info(f"[{account_name}] 阅读抽奖结果: {prize}")
+                _apply_read_stats(result, run_read_flow(**read_kwargs))
 
         return result
 
@@ -158,6 +202,10 @@ def run_account(
         result.error = str(e)
         logger.error(f"处理账号 {account_name} 时发生错误: {e}")
         return result
+    finally:
+        # 阅读流程延后执行时由 _closing_flow 负责关闭
+        if aihoge is not None and not read_deferred:
+            aihoge.close()
 
 
 def _send_summary_notification(results: List[AccountResult], start_time: datetime, end_time: datetime, mode: str) -> None:
@@ -231,7 +279,19 @@ def _send_summary_notification(results: List[AccountResult], start_time: datetim
         logger.error(f"❌ 发送任务汇总推送失败: {str(e)}", exc_info=True)
 
 
-def main() -> int:
+def _report_http_timing(output_path: str) -> None:
+    """输出本次运行各接口的耗时汇总表，并写入 JSON 文件"""
+    logger.info("HTTP 接口耗时汇总（按累计耗时排序）:\n" + timing_collector.format_table())
+    if not output_path:
+        return
+    try:
+        timing_collector.write_json(output_path)
+        logger.info(f"HTTP 耗时汇总已写入: {output_path}")
+    except OSError as e:
+        logger.warning(f"写入 HTTP 耗时汇总失败: {e}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--config", default=str(project_root / "config" / "token.json"))
     parser.add_argument("--mode", choices=["all", "sign", "read"], default="all")
@@ -243,29 +303,49 @@ def main() -> int:
     # - --fast：快捷组合参数，方便在 IDE 调试时快速跑通
     parser.add_argument("--no-sleep", action="store_true", help="不等待直接上报阅读时间（调试用）")
     parser.add_argument("--fast", action="store_true", help="调试快捷模式（等同于 --max-articles 2 --read-delay-min 1 --read-delay-max 2）")
-    args = parser.parse_args()
+    parser.add_argument(
+        "--overlap-read",
+        action="store_true",
+        help="所有账号签到完成后，在同一个定时循环里重叠执行阅读任务（也可在配置中设置 dachao.read_overlap）",
+    )
+    parser.add_argument(
+        "--timing-json",
+        default=str(HTTP_TIMING_FILE),
+        help="HTTP 接口耗时汇总 JSON 输出路径（传空字符串则只打印汇总表）",
+    )
+    parser.add_argument(
+        "--debug-file",
+        default="",
+        help="把每次请求/响应（已脱敏）以 JSON 行写入该文件，无需开启 DEBUG 日志（也可配置 dachao.debug_file）",
+    )
+    args = parser.parse_args(argv)
 
     start_time = datetime.now()
     log_task_header("大潮App新流程开始执行", start_time)
+    # 计时汇总是进程级的，同一进程内多次调用 main（如 orchestrator）时只统计本次运行
+    timing_collector.reset()
 
     try:
         cfg_path = Path(args.config)
         logger.info(f"正在读取配置文件: {cfg_path}")
-        raw = load_config(cfg_path).get("dachao", {})
-        accounts_raw = raw.get("accounts", [])
+        raw = get_platform_config("dachao", config_path=cfg_path)
         debug = bool(raw.get("debug") or False)
         if debug:
             logging.getLogger().setLevel(logging.DEBUG)
             # 我们会在 api.py 里输出结构化 HTTP 调试信息；
             # urllib3 自带的 connectionpool DEBUG 会非常吵，调试时建议压制为 WARNING。
             logging.getLogger("urllib3").setLevel(logging.WARNING)
-
-        accounts: List[NewDachaoAccountConfig] = []
-        for a in accounts_raw:
-            try:
-                accounts.append(NewDachaoAccountConfig.from_dict(a))
-            except Exception as e:
-                logger.error(f"账号配置异常: {e}")
+        debug_file = args.debug_file or str(raw.get("debug_file") or "")
+        if debug_file:
+            configure_debug_file(debug_file)
+            logger.info(f"HTTP 调试记录写入: {debug_file}")
+
+        accounts: List[NewDachaoAccountConfig] = get_platform_accounts(
+            "dachao",
+            factory=NewDachaoAccountConfig.from_dict,
+            config_path=cfg_path,
+            load_logger=logger,
+        )
 
         if not accounts:
             logger.warning("配置文件中没有找到大潮账号信息")
@@ -280,28 +360,28 @@ def main() -> int:
 
         logger.info(f"开始执行任务，共 {len(accounts)} 个账号")
 
-        results: List[AccountResult] = []
-        for i, acc in enumerate(accounts, 1):
-            logger.info(f"\n{'=' * 60}")
-            logger.info(f"处理第 {i}/{len(accounts)} 个账号")
-            logger.info(f"{'=' * 60}")
-
-            results.append(
-                run_account(
-                    acc,
-                    mode=args.mode,
-                    max_articles=args.max_articles,
-                    read_delay_min=args.read_delay_min,
-                    read_delay_max=args.read_delay_max,
-                    sleep_enabled=(not args.no_sleep),
-                )
-            )
-            logger.info(f"账号 {i} 处理完成")
-
-            if i < len(accounts):
-                account_delay = random.uniform(3.0, 8.0)
-                logger.info(f"账号切换延时 {account_delay:.2f} 秒...")
-                time.sleep(account_delay)
+        overlap_read = args.overlap_read or bool(raw.get("read_overlap") or False)
+        deferred_reads: Optional[List[Tuple[AccountResult, Generator[float, None, Dict[str, Any]]]]] = (
+            [] if overlap_read else None
+        )
+        results: List[AccountResult] = run_accounts(
+            accounts,
+            lambda acc: run_account(
+                acc,
+                mode=args.mode,
+                max_articles=args.max_articles,
+                read_delay_min=args.read_delay_min,
+                read_delay_max=args.read_delay_max,
+                sleep_enabled=(not args.no_sleep),
+                use_login_cache=bool(raw.get("login_cache", True)),
+                deferred_reads=deferred_reads,
+            ),
+            concurrency=resolve_concurrency("dachao", raw),
+            delay_range=(3.0, 8.0),
+            run_logger=logger,
+        )
+        if deferred_reads:
+            run_deferred_reads(deferred_reads)
 
         logger.info("所有账号任务处理完成")
 
@@ -336,6 +416,9 @@ def main() -> int:
 
         return 1
 
+    finally:
+        _report_http_timing(args.timing_json)
+
 
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -6,20 +6,129 @@
 提供恩山论坛签到相关的API接口
 """
 
+import hashlib
 import json
 import logging
+import os
 import re
-from typing import Dict, Optional, List
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional, List, Tuple
 
 import requests
 
 logger = logging.getLogger(__name__)
 
+# WAF clearance cookie 与 formhash 的磁盘缓存：服务端重新下发挑战前不再重复求解
+CLEARANCE_COOKIE_NAME = "https_ydclearance"
+COOKIE_DOMAIN = "www.right.com.cn"   # 配置中的 Cookie 写入会话 Cookie 罐时使用的域名
+CLEARANCE_CACHE_FILE = Path(__file__).resolve().parent.parent.parent / "config" / "enshan_clearance_cache.json"
+CLEARANCE_DEFAULT_TTL = 3600        # 挑战脚本未声明有效期时的默认缓存时长（秒）
+CLEARANCE_EXPIRE_MARGIN = 60        # 提前失效的秒数
+_clearance_cache_lock = threading.Lock()
+
+# WAF挑战页解析：一次扫描定位 oo 数组、wi、各解密循环入口与跳过间隔
+_WAF_OO = re.compile(r"oo\s*=\s*\[([^\]]+)\]")
+_WAF_TOKEN = re.compile(
+    r'setTimeout\("\w+\((?P<wi>\d+)\)"'
+    r"|(?P<do>qo\s*=\s*\d+;\s*do\s*\{)"
+    r"|(?P<for>qo\s*=\s*1;\s*for\s*\()"
+    r"|qo\s*%\s*(?P<mod>\d+)"
+)
+_WAF_NUMBER = re.compile(r"0x[0-9a-fA-F]+|\d+")
+_WAF_WI_FALLBACK = re.compile(r"\b\w+\((\d+)\)")
+# 以下循环模式只在 _WAF_TOKEN 找到的循环入口处做锚定匹配
+_WAF_LOOP1 = re.compile(
+    r"qo\s*=\s*(?P<start>\d+);\s*do\{.*?oo\[qo\]=\(-oo\[qo\]\)&0xff;.*?"
+    r"oo\[qo\]=\(\(\(oo\[qo\]>>(?P<shift_r>\d+)\)\|\(\(oo\[qo\]<<(?P<shift_l>\d+)\)&0xff\)\)\-(?P<sub>\d+)\)&0xff;.*?"
+    r"\}\s*while\(--qo>=2\);",
+    re.S,
+)
+_WAF_LOOP2 = re.compile(
+    r"qo\s*=\s*(?P<start>\d+);\s*do\s*\{[^}]*?oo\[qo\]\s*=\s*\(oo\[qo\]\s*-\s*oo\[qo\s*-\s*1\]\)\s*&\s*0xff;"
+    r"[^}]*?\}\s*while\s*\(\s*--\s*qo\s*>=\s*3\s*\)",
+    re.S,
+)
+_WAF_LOOP3 = re.compile(r"qo\s*=\s*1;\s*for\s*\(.*?\)\s*\{(?P<block>.*?)\}\s*po\s*=", re.S)
+_WAF_LOOP3_UPPER = re.compile(r"qo\s*>\s*(\d+)\)\s*break")
+_WAF_LOOP3_ASSIGN = re.compile(r"oo\[qo\]\s*=\s*(.+?);", re.S)
+_WAF_ADD = re.compile(r"\+\s*(\d+)")
+_WAF_SHIFT = re.compile(r"(?:<<|>>)\s*(\d+)")
+_WAF_COOKIE = re.compile(r"document\.cookie=['\"]([^'\"]+)['\"]")
+_WAF_COOKIE_MAX_AGE = re.compile(r"max-age\s*=\s*(\d+)", re.I)
+_WAF_COOKIE_EXPIRES = re.compile(r"expires\s*=\s*([^;]+)", re.I)
+_FORMHASH = re.compile(r"member\.php\?mod=logging(?:&amp;|&)action=logout(?:&amp;|&)formhash=([0-9a-fA-F]+)")
+
+
+def _scan_waf_tokens(html: str, pos: int) -> Dict[str, Any]:
+    """从 pos 开始顺序扫描一次，记录首个 wi、跳过间隔与三段解密循环"""
+    parts: Dict[str, Any] = {"wi": None, "mod": None, "loop1": None, "loop2": None, "loop3": None}
+    for token in _WAF_TOKEN.finditer(html, pos):
+        kind = token.lastgroup
+        if kind in ("wi", "mod"):
+            if parts[kind] is None:
+                parts[kind] = int(token.group(kind))
+        elif kind == "do":
+            if parts["loop1"] is None:
+                parts["loop1"] = _WAF_LOOP1.match(html, token.start())
+                if parts["loop1"]:
+                    continue
+            if parts["loop2"] is None:
+                parts["loop2"] = _WAF_LOOP2.match(html, token.start())
+        elif kind == "for" and parts["loop3"] is None:
+            block = _WAF_LOOP3.match(html, token.start())
+            parts["loop3"] = _parse_loop3_block(block.group("block")) if block else None
+    return parts
+
+
+@lru_cache(maxsize=None)
+def _add_table(k: int) -> bytes:
+    """x -> (x + k) & 0xff 的 translate 查表"""
+    return bytes((b + k) & 0xFF for b in range(256))
+
+
+@lru_cache(maxsize=None)
+def _xor_table(k: int) -> bytes:
+    """x -> x ^ k 的 translate 查表"""
+    return bytes(b ^ k for b in range(256))
+
+
+@lru_cache(maxsize=None)
+def _shift_or_table(shift_r: int, shift_l: int) -> bytes:
+    """x -> (x >> shift_r) | ((x << shift_l) & 0xff) 的 translate 查表，shift_r + shift_l == 8 时即循环右移"""
+    return bytes((b >> shift_r) | ((b << shift_l) & 0xFF) for b in range(256))
+
+
+_NEG_TABLE = bytes((-b) & 0xFF for b in range(256))
+
+
+def _parse_loop3_block(block: str) -> Optional[Dict[str, int]]:
+    """解析第三段 for 循环体：上限、两个加数与循环左移位数"""
+    upper = _WAF_LOOP3_UPPER.search(block)
+    assign = _WAF_LOOP3_ASSIGN.search(block)
+    if not upper or not assign:
+        return None
+    expr = assign.group(1)
+    adds = _WAF_ADD.findall(expr)
+    shifts = _WAF_SHIFT.findall(expr)
+    if len(adds) < 2 or len(shifts) < 2:
+        return None
+    return {"upper": int(upper.group(1)), "add1": int(adds[0]), "add2": int(adds[1]), "rot_l": int(shifts[0])}
+
 
 class EnshanAPI:
     """恩山论坛API类"""
 
-    def __init__(self, cookies: str, formhash: Optional[str] = None, user_agent: Optional[str] = None):
+    def __init__(
+        self,
+        cookies: str,
+        formhash: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        use_cache: bool = True
+    ):
         """
         初始化API类
 
@@ -27,9 +136,14 @@ class EnshanAPI:
             cookies: 用户的Cookie字符串
             formhash: 表单hash值，用于验证请求（可选，自动获取）
             user_agent: 用户代理字符串，可选
+            use_cache: 是否在 config/enshan_clearance_cache.json 缓存WAF cookie与formhash
         """
+        # 挑战页、签到页与签到接口共用一个连接池会话，Cookie 由会话的 Cookie 罐维护
+        self.session = requests.Session()
         self.cookies = cookies
         self.formhash = formhash or ""
+        self.use_cache = use_cache
+        self.clearance_ttl: Optional[int] = None
         self.user_agent = user_agent or (
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) '
             'AppleWebKit/537.36 (KHTML, like Gecko) '
@@ -38,6 +152,48 @@ class EnshanAPI:
         self.sign_url = 'https://www.right.com.cn/forum/plugin.php?id=erling_qd:action&action=sign'
         self.sign_in_page_url = 'https://www.right.com.cn/forum/erling_qd-sign_in.html'
         self.base_url = 'https://www.right.com.cn/forum'
+        # 缓存键基于配置中的登录 Cookie 计算，不受请求过程中服务端下发的 Cookie 影响
+        self._cache_key = self._clearance_cache_key(cookies, self.user_agent)
+
+    @property
+    def cookies(self) -> str:
+        """当前会话的 Cookie，按配置文件格式（name=value; name2=value2）序列化"""
+        return '; '.join(f"{cookie.name}={cookie.value}" for cookie in self.session.cookies)
+
+    @cookies.setter
+    def cookies(self, cookie_string: str) -> None:
+        """用配置文件格式的 Cookie 字符串重置会话 Cookie 罐"""
+        self.session.cookies.clear()
+        for part in (cookie_string or '').split(';'):
+            self._set_cookie(part)
+
+    def _set_cookie(self, cookie_kv: str) -> None:
+        """写入单个 name=value，先移除同名 Cookie（无论由配置还是服务端写入）"""
+        if not cookie_kv or '=' not in cookie_kv:
+            return
+        name, value = cookie_kv.split('=', 1)
+        name = name.strip()
+        if not name:
+            return
+        self._drop_cookie(name)
+        self.session.cookies.set(name, value.strip(), domain=COOKIE_DOMAIN, path='/')
+
+    def _drop_cookie(self, name: str, keep: Any = None) -> None:
+        """移除 Cookie 罐中名为 name 的 Cookie（keep 指定的那一个除外）"""
+        jar = self.session.cookies
+        for cookie in [c for c in jar if c.name == name and c is not keep]:
+            jar.clear(cookie.domain, cookie.path, cookie.name)
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """通过会话发起请求，服务端下发的 Cookie 覆盖配置中的同名 Cookie"""
+        response = self.session.request(method, url, timeout=30, **kwargs)
+        issued = {}
+        for resp in (*response.history, response):
+            issued.update((cookie.name, cookie.value) for cookie in resp.cookies)
+        for name, value in issued.items():
+            latest = [c for c in self.session.cookies if c.name == name and c.value == value]
+            self._drop_cookie(name, keep=latest[-1] if latest else None)
+        return response
 
     @staticmethod
     def _rotl8(x: int, r: int) -> int:
@@ -54,120 +210,61 @@ class EnshanAPI:
         return (x >> r) | ((x << (8 - r)) & 0xFF)
 
     @staticmethod
-    def _extract_oo(html: str) -> Optional[List[int]]:
-        match = re.search(r"oo\s*=\s*\[([^\]]+)\]", html)
-        if not match:
-            return None
-        tokens = re.findall(r"0x[0-9a-fA-F]+|\d+", match.group(1))
-        if not tokens:
-            return None
-        values = []
-        for token in tokens:
-            if token.lower().startswith("0x"):
-                values.append(int(token, 16))
-            else:
-                values.append(int(token))
-        return values
-
-    @staticmethod
-    def _extract_wi(html: str) -> Optional[int]:
-        match = re.search(r'setTimeout\("\w+\((\d+)\)"', html)
-        if match:
-            return int(match.group(1))
-        match = re.search(r"\b\w+\((\d+)\)", html)
-        if match:
-            return int(match.group(1))
-        return None
-
-    @staticmethod
-    def _extract_loop1_params(html: str) -> Optional[Dict[str, int]]:
-        pattern = (
-            r"qo\s*=\s*(\d+);\s*do\{.*?oo\[qo\]=\(-oo\[qo\]\)&0xff;.*?"
-            r"oo\[qo\]=\(\(\(oo\[qo\]>>(\d+)\)\|\(\(oo\[qo\]<<(\d+)\)&0xff\)\)\-(\d+)\)&0xff;.*?"
-            r"\}\s*while\(--qo>=2\);"
-        )
-        match = re.search(pattern, html, re.S)
-        if not match:
-            return None
-        return {
-            "start": int(match.group(1)),
-            "shift_r": int(match.group(2)),
-            "shift_l": int(match.group(3)),
-            "sub": int(match.group(4)),
-        }
+    def _parse_challenge(html: str) -> Optional[Tuple[List[int], int, Dict[str, int]]]:
+        """
+        单遍解析WAF挑战页，提取 oo 数组、wi 与三段解密循环的参数
 
-    @staticmethod
-    def _extract_loop2_start(html: str) -> Optional[int]:
-        match = re.search(
-            r"qo\s*=\s*(\d+);\s*do\s*\{[^}]*?oo\[qo\]\s*=\s*\(oo\[qo\]\s*-\s*oo\[qo\s*-\s*1\]\)\s*&\s*0xff;[^}]*?\}\s*while\s*\(\s*--\s*qo\s*>=\s*3\s*\)",
-            html,
-            re.S,
-        )
-        if not match:
-            return None
-        return int(match.group(1))
+        先定位 oo 数组，再用预编译的 _WAF_TOKEN 从数组之后顺序扫描一次脚本，
+        遇到循环入口时只在入口处做锚定匹配，不再对整页多次 re.search。
 
-    @staticmethod
-    def _extract_loop3_params(html: str) -> Optional[Dict[str, int]]:
-        block_match = re.search(
-            r"qo\s*=\s*1;\s*for\s*\(.*?\)\s*\{(.*?)\}\s*po\s*=",
-            html,
-            re.S,
-        )
-        if not block_match:
+        Returns:
+            (oo, wi, params) | None: 页面不是挑战页或参数不完整时返回 None
+        """
+        oo_match = _WAF_OO.search(html)
+        if not oo_match:
             return None
-        block = block_match.group(1)
-
-        upper_match = re.search(r"qo\s*>\s*(\d+)\)\s*break", block)
-        if not upper_match:
+        oo = [int(num, 16) if num[:2].lower() == "0x" else int(num) for num in _WAF_NUMBER.findall(oo_match.group(1))]
+        if not oo:
             return None
-        upper = int(upper_match.group(1))
 
-        assign_match = re.search(r"oo\[qo\]\s*=\s*(.+?);", block, re.S)
-        if not assign_match:
+        parts = _scan_waf_tokens(html, oo_match.end())
+        if parts["loop1"] is None or parts["loop2"] is None or parts["loop3"] is None:
+            # 解密循环不在 oo 数组之后的非常规页面，退回整页扫描
+            parts = _scan_waf_tokens(html, 0)
+
+        wi = parts["wi"]
+        if wi is None:
+            fallback = _WAF_WI_FALLBACK.search(html)
+            wi = int(fallback.group(1)) if fallback else None
+        loop1, loop2, loop3 = parts["loop1"], parts["loop2"], parts["loop3"]
+        if wi is None or not loop1 or not loop2 or not loop3:
             return None
-        expr = assign_match.group(1)
 
-        add_nums = re.findall(r"\+\s*(\d+)", expr)
-        if len(add_nums) < 2:
-            return None
-        add1 = int(add_nums[0])
-        add2 = int(add_nums[1])
-
-        shift_nums = re.findall(r"<<\s*(\d+)|>>\s*(\d+)", expr)
-        shifts = []
-        for left, right in shift_nums:
-            if left:
-                shifts.append(int(left))
-            if right:
-                shifts.append(int(right))
-        if len(shifts) < 2:
-            return None
-        rot_l = shifts[0]
-        return {
-            "upper": upper,
-            "add1": add1,
-            "add2": add2,
-            "rot_l": rot_l,
+        return oo, wi, {
+            "loop1_start": int(loop1.group("start")),
+            "loop2_start": int(loop2.group("start")),
+            "loop3_upper": loop3["upper"],
+            "shift_r": int(loop1.group("shift_r")),
+            "shift_l": int(loop1.group("shift_l")),
+            "sub": int(loop1.group("sub")),
+            "add1": loop3["add1"],
+            "add2": loop3["add2"],
+            "rot_l": loop3["rot_l"],
+            "mod_skip": parts["mod"] if parts["mod"] is not None else 7,
         }
 
-    @staticmethod
-    def _extract_mod_skip(html: str) -> int:
-        match = re.search(r"qo\s*%\s*(\d+)", html)
-        if not match:
-            return 7
-        return int(match.group(1))
-
     def _decode_po(self, oo_hex: List[int], wi: int, params: Dict[str, int]) -> str:
-        oo = [b & 0xFF for b in oo_hex]
+        """
+        还原挑战页 JS 的三段解密循环，得到设置 cookie 的脚本
+
+        第一、三段循环是逐字节的独立变换，拆成取负、移位、加常量等 256 项查表后用 bytes.translate 整段处理；
+        第二段循环倒序执行，每个字节减去的是前一个字节尚未被本段修改的值，等价于整段做一次差分。
+        """
+        oo = bytearray(b & 0xFF for b in oo_hex)
         if len(oo) < 6:
             return ""
 
         last_index = len(oo) - 1
-
-        loop1_start = params["loop1_start"]
-        loop2_start = params["loop2_start"]
-        loop3_upper = params["loop3_upper"]
         shift_r = params["shift_r"]
         shift_l = params["shift_l"]
         sub = params["sub"]
@@ -176,39 +273,40 @@ class EnshanAPI:
         rot_l = params["rot_l"]
         mod_skip = params["mod_skip"]
 
-        qo = min(loop1_start, last_index - 1)
-        while True:
-            oo[qo] = (-oo[qo]) & 0xFF
-            if (shift_r + shift_l) == 8:
-                oo[qo] = (self._rotr8(oo[qo], shift_r) - sub) & 0xFF
-            else:
-                oo[qo] = (((oo[qo] >> shift_r) | ((oo[qo] << shift_l) & 0xFF)) - sub) & 0xFF
-            qo -= 1
-            if qo < 2:
-                break
-
-        qo = min(loop2_start, last_index - 2)
-        while True:
+        # 第一段：qo 从 loop1_start 递减到 2（do-while 至少执行一次）
+        qo = min(params["loop1_start"], last_index - 1)
+        low = min(2, qo)
+        if (shift_r + shift_l) == 8:
+            rotate = _shift_or_table(shift_r & 7, (8 - shift_r) & 7)
+        else:
+            rotate = _shift_or_table(shift_r, shift_l)
+        oo[low:qo + 1] = oo[low:qo + 1].translate(_NEG_TABLE).translate(rotate).translate(_add_table((-sub) & 0xFF))
+
+        # 第二段：qo 从 loop2_start 递减到 3，oo[qo] -= oo[qo - 1]
+        qo = min(params["loop2_start"], last_index - 2)
+        if qo >= 3:
+            prev = oo[2:qo]
+            oo[3:qo + 1] = bytes((cur - before) & 0xFF for cur, before in zip(oo[3:qo + 1], prev))
+        else:
             oo[qo] = (oo[qo] - oo[qo - 1]) & 0xFF
-            qo -= 1
-            if qo < 3:
-                break
-
-        for qo in range(1, min(loop3_upper, last_index - 1) + 1):
-            x = (oo[qo] + add1) & 0xFF
-            x = (x + add2) & 0xFF
-            oo[qo] = self._rotl8(x, rot_l)
 
-        po_chars = []
-        for qo in range(1, last_index):
-            if qo % mod_skip != 0:
-                po_chars.append(chr((oo[qo] ^ (wi & 0xFF)) & 0xFF))
+        # 第三段：qo 从 1 到 loop3_upper，加两次常量后循环左移
+        upper = min(params["loop3_upper"], last_index - 1)
+        if upper >= 1:
+            rot = rot_l & 7
+            oo[1:upper + 1] = oo[1:upper + 1].translate(_add_table((add1 + add2) & 0xFF)).translate(
+                _shift_or_table((8 - rot) & 7, rot)
+            )
 
-        return "".join(po_chars)
+        # 输出：qo 从 1 到倒数第二个，跳过 qo % mod_skip == 0 的位置，与 wi 异或
+        po = oo[1:last_index].translate(_xor_table(wi & 0xFF))
+        if mod_skip > 0:
+            del po[mod_skip - 1::mod_skip]
+        return po.decode("latin-1")
 
     @staticmethod
     def _extract_cookie_kv(decoded_js: str) -> Optional[str]:
-        match = re.search(r"document\.cookie=['\"]([^'\"]+)['\"]", decoded_js)
+        match = _WAF_COOKIE.search(decoded_js)
         if not match:
             return None
         cookie_str = match.group(1).strip()
@@ -216,39 +314,9 @@ class EnshanAPI:
             return None
         return cookie_str.split(';', 1)[0].strip()
 
-    @staticmethod
-    def _upsert_cookie(base_cookies: str, new_cookie_kv: str) -> str:
-        if not new_cookie_kv or '=' not in new_cookie_kv:
-            return base_cookies
-        new_key, new_value = new_cookie_kv.split('=', 1)
-        new_key = new_key.strip()
-        new_value = new_value.strip()
-
-        parts = []
-        replaced = False
-        for raw in base_cookies.split(';'):
-            part = raw.strip()
-            if not part or '=' not in part:
-                continue
-            key, value = part.split('=', 1)
-            key = key.strip()
-            if key == new_key:
-                parts.append(f"{new_key}={new_value}")
-                replaced = True
-            else:
-                parts.append(f"{key}={value.strip()}")
-
-        if not replaced:
-            parts.append(f"{new_key}={new_value}")
-
-        return '; '.join(parts)
-
     @staticmethod
     def _extract_formhash(html: str) -> Optional[str]:
-        match = re.search(
-            r"member\.php\?mod=logging(?:&amp;|&)action=logout(?:&amp;|&)formhash=([0-9a-fA-F]+)",
-            html,
-        )
+        match = _FORMHASH.search(html)
         if not match:
             return None
         return match.group(1)
@@ -274,82 +342,188 @@ class EnshanAPI:
             'Sec-Fetch-User': '?1',
             'Sec-Fetch-Dest': 'document',
             'Referer': self.sign_in_page_url,
-            'Cookie': self.cookies
         }
 
-    def _merge_response_cookies(self, response: requests.Response) -> None:
-        for name, value in response.cookies.items():
-            self.cookies = self._upsert_cookie(self.cookies, f"{name}={value}")
+    @staticmethod
+    def _extract_cookie_lifetime(decoded_js: str) -> Optional[int]:
+        """从挑战脚本设置的 cookie 属性（max-age / expires）中读取有效期（秒）"""
+        match = _WAF_COOKIE.search(decoded_js)
+        if not match:
+            return None
+        attrs = match.group(1)
+        max_age = _WAF_COOKIE_MAX_AGE.search(attrs)
+        if max_age:
+            return int(max_age.group(1))
+        expires = _WAF_COOKIE_EXPIRES.search(attrs)
+        if expires:
+            try:
+                return int(parsedate_to_datetime(expires.group(1).strip()).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return None
+        return None
+
+    @classmethod
+    def _is_challenge(cls, html: str) -> bool:
+        """响应是否为WAF挑战页"""
+        return "oo" in html and cls._parse_challenge(html) is not None
+
+    def _solve_challenge(self, html: str) -> bool:
+        """
+        求解WAF挑战页并写入 https_ydclearance cookie
+
+        Returns:
+            bool: 是否成功获取 cookie
+        """
+        challenge = self._parse_challenge(html)
+        if not challenge:
+            logger.warning("WAF响应解析失败，无法提取解密参数")
+            return False
+        oo, wi, params = challenge
+
+        decoded_js = self._decode_po(oo, wi, params)
+        cookie_kv = self._extract_cookie_kv(decoded_js)
+        if not cookie_kv:
+            logger.warning("WAF解密成功但未找到cookie")
+            return False
+
+        self._set_cookie(cookie_kv)
+        lifetime = self._extract_cookie_lifetime(decoded_js)
+        self.clearance_ttl = lifetime if lifetime and lifetime > 0 else CLEARANCE_DEFAULT_TTL
+        logger.info("已获取并更新 https_ydclearance cookie")
+        return True
 
     def _refresh_clearance_cookie(self) -> Optional[str]:
         try:
-            response = requests.get(
-                self.sign_in_page_url,
-                headers=self._get_clearance_headers(),
-                timeout=30
-            )
+            response = self._request('GET', self.sign_in_page_url, headers=self._get_clearance_headers())
         except requests.RequestException as exc:
             logger.warning("获取WAF页面失败，可能影响签到: %s", exc)
             return None
-        # print(response.text)
-        self._merge_response_cookies(response)
 
         if "oo" not in response.text:
             formhash = self._extract_formhash(response.text)
             if formhash:
                 self.formhash = formhash
+                self._save_clearance_cache()
             return response.text
 
-        oo = self._extract_oo(response.text)
-        wi = self._extract_wi(response.text)
-        if not oo or wi is None:
-            logger.warning("WAF响应解析失败，无法提取解密参数")
-            return None
-
-        loop1 = self._extract_loop1_params(response.text)
-        loop2_start = self._extract_loop2_start(response.text)
-        loop3 = self._extract_loop3_params(response.text)
-        if not loop1 or loop2_start is None or not loop3:
-            logger.warning("WAF解密参数提取失败")
-            return None
-
-        mod_skip = self._extract_mod_skip(response.text)
-        params = {
-            "loop1_start": loop1["start"],
-            "loop2_start": loop2_start,
-            "loop3_upper": loop3["upper"],
-            "shift_r": loop1["shift_r"],
-            "shift_l": loop1["shift_l"],
-            "sub": loop1["sub"],
-            "add1": loop3["add1"],
-            "add2": loop3["add2"],
-            "rot_l": loop3["rot_l"],
-            "mod_skip": mod_skip,
-        }
-
-        decoded_js = self._decode_po(oo, wi, params)
-        cookie_kv = self._extract_cookie_kv(decoded_js)
-        if not cookie_kv:
-            logger.warning("WAF解密成功但未找到cookie")
+        if not self._solve_challenge(response.text):
             return None
 
-        self.cookies = self._upsert_cookie(self.cookies, cookie_kv)
-        logger.info("已获取并更新 https_ydclearance cookie")
-
         try:
-            follow = requests.get(
-                self.sign_in_page_url,
-                headers=self._get_clearance_headers(),
-                timeout=30
-            )
+            follow = self._request('GET', self.sign_in_page_url, headers=self._get_clearance_headers())
         except requests.RequestException:
             return None
-        self._merge_response_cookies(follow)
         formhash = self._extract_formhash(follow.text)
         if formhash:
             self.formhash = formhash
+        self._save_clearance_cache()
         return follow.text
 
+    # -------- clearance 缓存 --------
+
+    @staticmethod
+    def _clearance_cache_key(config_cookies: str, user_agent: str) -> str:
+        """
+        以配置中的登录 Cookie（去掉 clearance）与 UA 生成缓存键（不直接落盘 Cookie）
+
+        只依赖配置文件中的 Cookie 字符串，服务端在请求过程中下发或轮换的 Cookie
+        不会改变缓存键，下一次运行用同一份配置即可命中。
+
+        Args:
+            config_cookies: 配置文件中的 Cookie 字符串
+            user_agent: 用户代理字符串
+
+        Returns:
+            str: sha256 缓存键
+        """
+        parts = {}
+        for part in (config_cookies or '').split(';'):
+            if '=' not in part:
+                continue
+            name, value = part.split('=', 1)
+            name = name.strip()
+            if name and name != CLEARANCE_COOKIE_NAME:
+                parts[name] = value.strip()
+        base = '; '.join(f"{name}={parts[name]}" for name in sorted(parts))
+        return hashlib.sha256(f"{base}\n{user_agent}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _read_clearance_cache() -> Dict[str, Any]:
+        """读取磁盘上的 clearance 缓存"""
+        if not CLEARANCE_CACHE_FILE.exists():
+            return {}
+        try:
+            with open(CLEARANCE_CACHE_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"读取WAF缓存失败: {e}")
+            return {}
+
+    @classmethod
+    def _write_clearance_cache(cls, cache_key: str, entry: Optional[Dict[str, Any]]) -> None:
+        """写入（或删除）clearance 缓存，同时清理已过期的条目"""
+        with _clearance_cache_lock:
+            now = time.time()
+            data = {
+                key: value for key, value in cls._read_clearance_cache().items()
+                if isinstance(value, dict) and value.get('expires_at', 0) > now
+            }
+            if entry is None:
+                data.pop(cache_key, None)
+            else:
+                data[cache_key] = entry
+            tmp_path = f"{CLEARANCE_CACHE_FILE}.{os.getpid()}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, CLEARANCE_CACHE_FILE)
+            except OSError as e:
+                logger.warning(f"写入WAF缓存失败: {e}")
+
+    def _current_clearance(self) -> str:
+        for cookie in self.session.cookies:
+            if cookie.name == CLEARANCE_COOKIE_NAME:
+                return f"{cookie.name}={cookie.value}"
+        return ""
+
+    def _load_clearance_cache(self) -> bool:
+        """
+        应用未过期的缓存 clearance cookie 与 formhash
+
+        Returns:
+            bool: 是否命中缓存
+        """
+        if not self.use_cache:
+            return False
+        with _clearance_cache_lock:
+            entry = self._read_clearance_cache().get(self._cache_key)
+        if not isinstance(entry, dict) or entry.get('expires_at', 0) <= time.time() or not entry.get('formhash'):
+            return False
+        if entry.get('clearance'):
+            self._set_cookie(entry['clearance'])
+        self.formhash = entry['formhash']
+        logger.info("使用缓存的WAF cookie与formhash，跳过挑战页")
+        return True
+
+    def _save_clearance_cache(self) -> None:
+        """保存当前 clearance cookie 与 formhash，有效期取挑战脚本声明的 cookie 有效期"""
+        if not self.use_cache or not self.formhash:
+            return
+        now = time.time()
+        ttl = self.clearance_ttl or CLEARANCE_DEFAULT_TTL
+        self._write_clearance_cache(self._cache_key, {
+            'clearance': self._current_clearance(),
+            'formhash': self.formhash,
+            'cached_at': int(now),
+            'expires_at': int(now + ttl - CLEARANCE_EXPIRE_MARGIN),
+        })
+
+    def clear_clearance_cache(self) -> None:
+        """删除当前账号的 clearance 缓存（缓存的 cookie 或 formhash 失效时调用）"""
+        if self.use_cache:
+            self._write_clearance_cache(self._cache_key, None)
+
     def get_headers(self) -> Dict[str, str]:
         """
         获取请求头
@@ -373,13 +547,15 @@ class EnshanAPI:
             'Sec-Fetch-Mode': 'cors',
             'Sec-Fetch-Dest': 'empty',
             'Referer': self.sign_in_page_url,
-            'Cookie': self.cookies
         }
 
     def sign_in(self) -> Dict:
         """
         执行签到
 
+        优先使用缓存的WAF cookie与formhash直接提交；缓存未命中、或提交时服务端重新下发了挑战页，
+        才访问签到页求解挑战并刷新 formhash。
+
         Returns:
             Dict: 签到结果
                 {
@@ -389,7 +565,9 @@ class EnshanAPI:
                 }
         """
         logger.info("开始执行恩山论坛签到...")
-        self._refresh_clearance_cookie()
+        cached = self._load_clearance_cache()
+        if not cached:
+            self._refresh_clearance_cookie()
         if not self.formhash:
             error_msg = "未获取到formhash，无法签到"
             logger.error(error_msg)
@@ -397,17 +575,32 @@ class EnshanAPI:
                 'success': False,
                 'error': error_msg
             }
+
+        result = self._submit_sign()
+        if cached and result.pop('challenge', False):
+            logger.info("服务端重新下发了WAF挑战，刷新cookie后重试签到")
+            self.clear_clearance_cache()
+            self._refresh_clearance_cookie()
+            result = self._submit_sign()
+        result.pop('challenge', None)
+        return result
+
+    def _submit_sign(self) -> Dict:
+        """提交签到请求；响应为WAF挑战页时返回 challenge=True"""
         headers = self.get_headers()
         data = {
             'formhash': self.formhash
         }
         try:
-            response = requests.post(
-                self.sign_url,
-                headers=headers,
-                data=data,
-                timeout=30
-            )
+            response = self._request('POST', self.sign_url, headers=headers, data=data)
+
+            # WAF重新下发挑战（可能伴随非200状态码）
+            if self._is_challenge(response.text):
+                return {
+                    'success': False,
+                    'challenge': True,
+                    'error': "签到请求被WAF拦截"
+                }
 
             # 检查响应状态
             response.raise_for_status()
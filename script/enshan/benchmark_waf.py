@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+恩山WAF挑战页解析回归与性能对比
+
+对 waf_samples/ 目录下保存的挑战页逐一校验：
+- 原多次 re.search 提取 + 逐字节解码实现（保留在本文件中作为对照）
+- api.EnshanAPI._parse_challenge 单遍解析 + 查表解码实现
+两者解出的脚本必须完全一致，并与 expected.json 中记录的 cookie 一致，然后对比两者耗时。
+
+遇到新的挑战页时，把页面 HTML 保存到 waf_samples/ 下（*.html），
+并在 expected.json 中补充 {"文件名": "https_ydclearance=..."} 即可纳入回归。
+
+使用方法：
+    python benchmark_waf.py [--rounds 200]
+    python benchmark_waf.py --generate 6    # 重新生成合成样本（会覆盖 synthetic_*.html）
+
+Author: ZaiZaiCat
+Date: 2026-10-17
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api import EnshanAPI
+
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "waf_samples")
+EXPECTED_FILE = os.path.join(SAMPLES_DIR, "expected.json")
+
+
+# ---------------- 原实现 ----------------
+
+def legacy_extract_oo(html: str) -> Optional[List[int]]:
+    match = re.search(r"oo\s*=\s*\[([^\]]+)\]", html)
+    if not match:
+        return None
+    tokens = re.findall(r"0x[0-9a-fA-F]+|\d+", match.group(1))
+    if not tokens:
+        return None
+    return [int(token, 16) if token.lower().startswith("0x") else int(token) for token in tokens]
+
+
+def legacy_extract_wi(html: str) -> Optional[int]:
+    match = re.search(r'setTimeout\("\w+\((\d+)\)"', html)
+    if match:
+        return int(match.group(1))
+    match = re.search(r"\b\w+\((\d+)\)", html)
+    if match:
+        return int(match.group(1))
+    return None
+
+
+def legacy_extract_loop1_params(html: str) -> Optional[Dict[str, int]]:
+    pattern = (
+        r"qo\s*=\s*(\d+);\s*do\{.*?oo\[qo\]=\(-oo\[qo\]\)&0xff;.*?"
+        r"oo\[qo\]=\(\(\(oo\[qo\]>>(\d+)\)\|\(\(oo\[qo\]<<(\d+)\)&0xff\)\)\-(\d+)\)&0xff;.*?"
+        r"\}\s*while\(--qo>=2\);"
+    )
+    match = re.search(pattern, html, re.S)
+    if not match:
+        return None
+    return {
+        "start": int(match.group(1)),
+        "shift_r": int(match.group(2)),
+        "shift_l": int(match.group(3)),
+        "sub": int(match.group(4)),
+    }
+
+
+def legacy_extract_loop2_start(html: str) -> Optional[int]:
+    match = re.search(
+        r"qo\s*=\s*(\d+);\s*do\s*\{[^}]*?oo\[qo\]\s*=\s*\(oo\[qo\]\s*-\s*oo\[qo\s*-\s*1\]\)\s*&\s*0xff;[^}]*?\}\s*while\s*\(\s*--\s*qo\s*>=\s*3\s*\)",
+        html,
+        re.S,
+    )
+    if not match:
+        return None
+    return int(match.group(1))
+
+
+def legacy_extract_loop3_params(html: str) -> Optional[Dict[str, int]]:
+    block_match = re.search(r"qo\s*=\s*1;\s*for\s*\(.*?\)\s*\{(.*?)\}\s*po\s*=", html, re.S)
+    if not block_match:
+        return None
+    block = block_match.group(1)
+    upper_match = re.search(r"qo\s*>\s*(\d+)\)\s*break", block)
+    if not upper_match:
+        return None
+    assign_match = re.search(r"oo\[qo\]\s*=\s*(.+?);", block, re.S)
+    if not assign_match:
+        return None
+    expr = assign_match.group(1)
+    add_nums = re.findall(r"\+\s*(\d+)", expr)
+    if len(add_nums) < 2:
+        return None
+    shifts = []
+    for left, right in re.findall(r"<<\s*(\d+)|>>\s*(\d+)", expr):
+        if left:
+            shifts.append(int(left))
+        if right:
+            shifts.append(int(right))
+    if len(shifts) < 2:
+        return None
+    return {"upper": int(upper_match.group(1)), "add1": int(add_nums[0]), "add2": int(add_nums[1]), "rot_l": shifts[0]}
+
+
+def legacy_extract_mod_skip(html: str) -> int:
+    match = re.search(r"qo\s*%\s*(\d+)", html)
+    return int(match.group(1)) if match else 7
+
+
+def legacy_decode_po(oo_hex: List[int], wi: int, params: Dict[str, int]) -> str:
+    oo = [b & 0xFF for b in oo_hex]
+    if len(oo) < 6:
+        return ""
+    last_index = len(oo) - 1
+
+    qo = min(params["loop1_start"], last_index - 1)
+    while True:
+        oo[qo] = (-oo[qo]) & 0xFF
+        if (params["shift_r"] + params["shift_l"]) == 8:
+            oo[qo] = (EnshanAPI._rotr8(oo[qo], params["shift_r"]) - params["sub"]) & 0xFF
+        else:
+            oo[qo] = (((oo[qo] >> params["shift_r"]) | ((oo[qo] << params["shift_l"]) & 0xFF)) - params["sub"]) & 0xFF
+        qo -= 1
+        if qo < 2:
+            break
+
+    qo = min(params["loop2_start"], last_index - 2)
+    while True:
+        oo[qo] = (oo[qo] - oo[qo - 1]) & 0xFF
+        qo -= 1
+        if qo < 3:
+            break
+
+    for qo in range(1, min(params["loop3_upper"], last_index - 1) + 1):
+        x = (oo[qo] + params["add1"]) & 0xFF
+        x = (x + params["add2"]) & 0xFF
+        oo[qo] = EnshanAPI._rotl8(x, params["rot_l"])
+
+    return "".join(
+        chr((oo[qo] ^ (wi & 0xFF)) & 0xFF) for qo in range(1, last_index) if qo % params["mod_skip"] != 0
+    )
+
+
+def legacy_solve(html: str) -> Optional[str]:
+    oo = legacy_extract_oo(html)
+    wi = legacy_extract_wi(html)
+    loop1 = legacy_extract_loop1_params(html)
+    loop2_start = legacy_extract_loop2_start(html)
+    loop3 = legacy_extract_loop3_params(html)
+    if not oo or wi is None or not loop1 or loop2_start is None or not loop3:
+        return None
+    params = {
+        "loop1_start": loop1["start"],
+        "loop2_start": loop2_start,
+        "loop3_upper": loop3["upper"],
+        "shift_r": loop1["shift_r"],
+        "shift_l": loop1["shift_l"],
+        "sub": loop1["sub"],
+        "add1": loop3["add1"],
+        "add2": loop3["add2"],
+        "rot_l": loop3["rot_l"],
+        "mod_skip": legacy_extract_mod_skip(html),
+    }
+    return legacy_decode_po(oo, wi, params)
+
+
+def current_solve(api: EnshanAPI, html: str) -> Optional[str]:
+    challenge = api._parse_challenge(html)
+    if not challenge:
+        return None
+    return api._decode_po(*challenge)
+
+
+# ---------------- 合成样本 ----------------
+
+def make_challenge_page(rng: random.Random) -> Tuple[str, str]:
+    """按挑战页的三段加密循环逆向生成页面，返回 (页面HTML, 预期cookie)"""
+    clearance = f"https_ydclearance={''.join(rng.choice('0123456789abcdef') for _ in range(40))}-{rng.randint(10**9, 10**10)}"
+    script = f"document.cookie='{clearance}; max-age={rng.choice([1800, 3600, 7200])}; path=/';location.reload();"
+
+    wi = rng.randint(100, 99999)
+    mod_skip = rng.randint(5, 11)
+    shift_r = rng.randint(1, 7)
+    shift_l = 8 - shift_r
+    sub = rng.randint(1, 250)
+    add1, add2 = rng.randint(1, 250), rng.randint(1, 250)
+    rot_l = rng.randint(1, 7)
+
+    # 解码后的数组：跳过位填随机字节，其余为脚本字符与 wi 异或
+    final = [rng.randint(0, 255)]
+    chars = iter(script.encode("latin-1"))
+    remaining = len(script)
+    qo = 1
+    while remaining:
+        if qo % mod_skip == 0:
+            final.append(rng.randint(0, 255))
+        else:
+            final.append(next(chars) ^ (wi & 0xFF))
+            remaining -= 1
+        qo += 1
+    final.append(rng.randint(0, 255))
+    last_index = len(final) - 1
+    loop1_start, loop2_start, loop3_upper = last_index - 1, last_index - 2, last_index - 1
+
+    # 逆第三段
+    oo = list(final)
+    for qo in range(1, loop3_upper + 1):
+        oo[qo] = (EnshanAPI._rotr8(oo[qo], rot_l) - add1 - add2) & 0xFF
+    # 逆第二段（正向倒序做差分，逆向正序做前缀和）
+    for qo in range(3, loop2_start + 1):
+        oo[qo] = (oo[qo] + oo[qo - 1]) & 0xFF
+    # 逆第一段
+    for qo in range(2, loop1_start + 1):
+        oo[qo] = (-EnshanAPI._rotl8((oo[qo] + sub) & 0xFF, shift_r)) & 0xFF
+
+    oo_text = ",".join(f"0x{b:02x}" if rng.random() < 0.7 else str(b) for b in oo)
+    func = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(6))
+    filler = "\n".join(f"<!-- {''.join(rng.choice('abcdefgh ') for _ in range(80))} -->" for _ in range(rng.randint(20, 60)))
+    html = (
+        f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>安全验证</title></head><body>\n{filler}\n"
+        f"<script>var oo=[{oo_text}];var qo,po;\n"
+        f"function {func}(wi){{\n"
+        f"qo={loop1_start};do{{oo[qo]=(-oo[qo])&0xff;"
+        f"oo[qo]=(((oo[qo]>>{shift_r})|((oo[qo]<<{shift_l})&0xff))-{sub})&0xff;}}while(--qo>=2);\n"
+        f"qo={loop2_start};do{{oo[qo]=(oo[qo]-oo[qo-1])&0xff;}}while(--qo>=3);\n"
+        f"qo=1;for(;;){{if(qo>{loop3_upper})break;"
+        f"oo[qo]=((((((oo[qo]+{add1})&0xff)+{add2})&0xff)<<{rot_l})&0xff)|(((((oo[qo]+{add1})&0xff)+{add2})&0xff)>>{8 - rot_l});qo++;}}\n"
+        f"po=\"\";for(qo=1;qo<oo.length-1;qo++)if(qo%{mod_skip})po+=String.fromCharCode(oo[qo]^wi);\n"
+        f"eval(po);}}\n"
+        f"setTimeout(\"{func}({wi})\",200);</script>\n</body></html>\n"
+    )
+    return html, clearance
+
+
+def generate_samples(count: int, seed: int) -> None:
+    os.makedirs(SAMPLES_DIR, exist_ok=True)
+    expected = load_expected()
+    rng = random.Random(seed)
+    for index in range(count):
+        html, clearance = make_challenge_page(rng)
+        name = f"synthetic_{index + 1:02d}.html"
+        with open(os.path.join(SAMPLES_DIR, name), "w", encoding="utf-8") as f:
+            f.write(html)
+        expected[name] = clearance
+    with open(EXPECTED_FILE, "w", encoding="utf-8") as f:
+        json.dump(expected, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"已生成 {count} 个合成样本: {SAMPLES_DIR}")
+
+
+def load_expected() -> Dict[str, str]:
+    if not os.path.exists(EXPECTED_FILE):
+        return {}
+    with open(EXPECTED_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="恩山WAF挑战页解析回归与性能对比")
+    parser.add_argument("--rounds", type=int, default=200, help="每个样本的计时轮数")
+    parser.add_argument("--generate", type=int, default=0, help="重新生成指定数量的合成样本")
+    parser.add_argument("--seed", type=int, default=20261017, help="合成样本随机种子")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_samples(args.generate, args.seed)
+
+    expected = load_expected()
+    pages = {}
+    for name in sorted(os.listdir(SAMPLES_DIR)) if os.path.isdir(SAMPLES_DIR) else []:
+        if name.endswith(".html"):
+            with open(os.path.join(SAMPLES_DIR, name), "r", encoding="utf-8") as f:
+                pages[name] = f.read()
+    if not pages:
+        print(f"没有样本，可使用 --generate 生成: {SAMPLES_DIR}")
+        return 1
+
+    api = EnshanAPI("")
+    failures = 0
+    for name, html in pages.items():
+        legacy = legacy_solve(html)
+        current = current_solve(api, html)
+        cookie = api._extract_cookie_kv(current or "")
+        if legacy != current:
+            failures += 1
+            print(f"❌ {name}: 新旧实现解码结果不一致")
+        elif name in expected and cookie != expected[name]:
+            failures += 1
+            print(f"❌ {name}: cookie 与预期不一致: {cookie}")
+        else:
+            print(f"✅ {name}: {cookie}")
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for html in pages.values():
+            legacy_solve(html)
+    legacy_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for html in pages.values():
+            current_solve(api, html)
+    current_elapsed = time.perf_counter() - start
+
+    calls = args.rounds * len(pages)
+    print(f"样本: {len(pages)} 个，每个 {args.rounds} 轮")
+    print(f"原实现:   {legacy_elapsed / calls * 1e6:.1f} µs/页")
+    print(f"单遍解析: {current_elapsed / calls * 1e6:.1f} µs/页")
+    print(f"提升:     {legacy_elapsed / current_elapsed:.1f} 倍")
+    print("✅ 全部样本一致" if failures == 0 else f"❌ {failures} 个样本不一致")
+    return 0 if failures == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
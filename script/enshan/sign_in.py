@@ -28,7 +28,9 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from account_runner import resolve_concurrency, run_accounts
 from notification import send_notification, NotificationSound
+from token_config import get_platform_config
 
 # 导入API模块（当前目录）
 from api import EnshanAPI
@@ -59,18 +61,19 @@ class EnshanSignInManager:
         self.config_path = config_path
         self.site_name = "恩山论坛"
         self.accounts = []
+        self.concurrency = 1
+        self.use_clearance_cache = True
         self.load_config()
 
     def load_config(self) -> None:
         """加载配置文件"""
         try:
             logger.info(f"正在读取配置文件: {self.config_path}")
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
             # 获取恩山论坛的配置
-            enshan_config = config.get('enshan', {})
+            enshan_config = get_platform_config('enshan', config_path=self.config_path)
             self.accounts = enshan_config.get('accounts', [])
+            self.concurrency = resolve_concurrency('enshan', enshan_config)
+            self.use_clearance_cache = bool(enshan_config.get('clearance_cache', True))
 
             if not self.accounts:
                 logger.warning("配置文件中没有找到恩山论坛账号信息")
@@ -115,7 +118,7 @@ class EnshanSignInManager:
 
         try:
             # 创建API实例并执行签到
-            api = EnshanAPI(cookies, formhash, user_agent)
+            api = EnshanAPI(cookies, formhash, user_agent, use_cache=self.use_clearance_cache)
             result = api.sign_in()
 
             # 添加账号名称到结果中
@@ -148,16 +151,12 @@ class EnshanSignInManager:
             logger.warning("没有可签到的账号")
             return []
 
-        results = []
-        for i, account in enumerate(self.accounts, 1):
-            logger.info(f"\n{'='*60}")
-            logger.info(f"正在处理第 {i}/{len(self.accounts)} 个账号")
-            logger.info(f"{'='*60}")
-
-            result = self.sign_in_single_account(account)
-            results.append(result)
-
-        return results
+        return run_accounts(
+            self.accounts,
+            self.sign_in_single_account,
+            concurrency=self.concurrency,
+            run_logger=logger
+        )
 
     def send_notification(self, results: List[Dict[str, Any]], start_time: datetime, end_time: datetime) -> None:
         """
@@ -31,7 +31,9 @@ project_root = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 # 导入需要的模块
+from account_runner import resolve_concurrency, run_accounts
 from notification import send_notification, NotificationSound
+from token_config import get_platform_config
 
 
 
@@ -52,6 +54,7 @@ class ErkeTasks:
             self.config_path = Path(config_path)
 
         self.accounts: List[Dict[str, Any]] = []
+        self.concurrency = 1
         self.logger = self._setup_logger()
         self._init_accounts()
         self.account_results: List[Dict[str, Any]] = []
@@ -90,11 +93,10 @@ class ErkeTasks:
             raise FileNotFoundError(f"配置文件不存在: {self.config_path}")
 
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
-                # 从统一配置文件的 erke 节点读取
-                erke_config = config_data.get('erke', {})
-                self.accounts = erke_config.get('accounts', [])
+            # 从统一配置文件的 erke 节点读取
+            erke_config = get_platform_config('erke', config_path=self.config_path)
+            self.accounts = erke_config.get('accounts', [])
+            self.concurrency = resolve_concurrency('erke', erke_config)
 
             if not self.accounts:
                 self.logger.warning("配置文件中没有找到 erke 账号信息")
@@ -220,10 +222,12 @@ class ErkeTasks:
             return
 
         # 处理每个账号
-        for account in self.accounts:
-            result = self.process_account(account)
-            self.account_results.append(result)
-
+        self.account_results.extend(run_accounts(
+            self.accounts,
+            self.process_account,
+            concurrency=self.concurrency,
+            run_logger=self.logger
+        ))
 
         # 输出统计信息
         self._print_summary()
@@ -6,8 +6,6 @@ cron: 1 1 1 1 1
 """
 文体未来荟签到脚本
 """
-import json
-import os
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -18,17 +16,14 @@ current_dir = Path(__file__).parent
 project_root = current_dir.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from account_runner import resolve_concurrency, run_accounts
 from notification import send_notification, NotificationSound
+from token_config import get_platform_config
 
 
 def load_config():
-    """加载统一配置文件"""
-    # 使用统一的 token.json 配置文件
-    # 从当前文件位置向上三级到达项目根目录，然后进入 config 目录
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    config_path = os.path.join(current_dir, '..', '..', '..', 'config', 'token.json')
-    with open(config_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """加载统一配置文件中的当前平台配置"""
+    return get_platform_config('huaruntong', 'wentiweilaihui')
 
 
 def process_account(account_config):
@@ -176,31 +171,33 @@ def main():
     print()
 
     # 加载配置
-    config = load_config()
-    accounts = config.get('huaruntong', {}).get('wentiweilaihui', {}).get('accounts', [])
+    platform_config = load_config()
+    accounts = platform_config.get('accounts', [])
 
     if not accounts:
         print("❌ 配置文件中没有找到账号信息")
         return
 
-    # 收集所有账号的结果
-    all_results = []
-
-    # 遍历所有账号
-    for account in accounts:
+    def run_account(account):
         if not account.get('token'):
             print(f"⚠️  跳过账号 {account.get('account_name', '未知')}: token 为空")
             print("=" * 50)
-            all_results.append({
+            return {
                 'account_name': account.get('account_name', '未知'),
                 'success': False,
                 'error': 'token为空'
-            })
-            continue
+            }
 
         result = process_account(account)
-        all_results.append(result)
         print("\n")
+        return result
+
+    # 处理所有账号并收集结果
+    all_results = run_accounts(
+        accounts,
+        run_account,
+        concurrency=resolve_concurrency('huaruntong_wentiweilaihui', platform_config)
+    )
 
     # 记录结束时间
     end_time = datetime.now()
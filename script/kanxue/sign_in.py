@@ -27,7 +27,9 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from account_runner import resolve_concurrency, run_accounts
 from notification import send_notification, NotificationSound
+from token_config import get_platform_config
 from api import KanxueAPI
 
 # 配置日志
@@ -56,21 +58,20 @@ class KanxueSignInManager:
         self.config_path = config_path
         self.site_name = "看雪论坛"
         self.accounts = []
+        self.concurrency = 1
         self.load_config()
 
     def load_config(self) -> None:
         """加载配置文件"""
         try:
             logger.info(f"正在读取配置文件: {self.config_path}")
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
             # 获取看雪论坛的配置
-            kanxue_config = config.get('kanxue', {})
+            kanxue_config = get_platform_config('kanxue', config_path=self.config_path)
             # 兼容嵌套结构
             if 'kanxue' in kanxue_config:
                 kanxue_config = kanxue_config.get('kanxue', {})
             self.accounts = kanxue_config.get('accounts', [])
+            self.concurrency = resolve_concurrency('kanxue', kanxue_config)
 
             if not self.accounts:
                 logger.warning("配置文件中没有找到看雪论坛账号信息")
@@ -148,16 +149,12 @@ class KanxueSignInManager:
             logger.warning("没有可签到的账号")
             return []
 
-        results = []
-        for i, account in enumerate(self.accounts, 1):
-            logger.info(f"\n{'='*60}")
-            logger.info(f"正在处理第 {i}/{len(self.accounts)} 个账号")
-            logger.info(f"{'='*60}")
-
-            result = self.sign_in_single_account(account)
-            results.append(result)
-
-        return results
+        return run_accounts(
+            self.accounts,
+            self.sign_in_single_account,
+            concurrency=self.concurrency,
+            run_logger=logger
+        )
 
     def send_notification(self, results: List[Dict[str, Any]], start_time: datetime, end_time: datetime) -> None:
         """
@@ -6,20 +6,64 @@
 提供顺丰快递积分任务相关的API接口
 """
 
+import base64
 import hashlib
 import logging
-import os
 import time
+import uuid
 from dataclasses import dataclass
 from http.cookies import SimpleCookie
 from typing import Any, Dict, List, Optional
 from urllib.parse import unquote
 
-import execjs
 import requests
 
 logger = logging.getLogger(__name__)
 
+SW8_KEY = "fb40817085be4e398e0b6f4b08177746"     # code.js 中的 key
+SW8_CHANNEL = "web"                              # code.js 中固定的渠道值
+SW8_PAGE_PATH = "/n/ryqq/toplist/4"              # code.js 中模拟的 location.pathname
+
+
+def _b64(text: str) -> str:
+    """对应 code.js 中的 V(t)：UTF-8 编码后做标准 Base64（保留填充）"""
+    return base64.b64encode(text.encode("utf-8")).decode("ascii")
+
+
+# sw8 中与请求无关的固定片段，只需计算一次
+_SW8_KEY_B64 = _b64(SW8_KEY)
+_SW8_CHANNEL_B64 = _b64(SW8_CHANNEL)
+_SW8_PAGE_PATH_B64 = _b64(SW8_PAGE_PATH)
+
+
+def generate_sw8(url_path: str, key: str = SW8_KEY) -> Dict[str, str]:
+    """
+    生成 sw8 请求头，等价于 code.js 中的 get_sw8 / ft 函数
+
+    格式：1-{traceId}-{segmentId}-0-{key}-{"web"}-{页面路径}-{接口路径}，各段均为 Base64，
+    traceId 和 segmentId 为随机 UUID 字符串。
+
+    Args:
+        url_path: 接口路径
+        key: 服务标识
+
+    Returns:
+        Dict: {"code": sw8 值, "traceId": 追踪ID}
+    """
+    trace_id = str(uuid.uuid4())
+    key_b64 = _SW8_KEY_B64 if key == SW8_KEY else _b64(key)
+    code = "-".join((
+        "1",
+        _b64(trace_id),
+        _b64(str(uuid.uuid4())),
+        "0",
+        key_b64,
+        _SW8_CHANNEL_B64,
+        _SW8_PAGE_PATH_B64,
+        _b64(url_path),
+    ))
+    return {"code": code, "traceId": trace_id}
+
 
 @dataclass(frozen=True)
 class ShareLoginInfo:
@@ -58,7 +102,6 @@ class SFExpressAPI:
             channel: 渠道
             device_id: 设备ID
         """
-        self.js_file_path = os.path.join(os.path.dirname(__file__), 'code.js')
         self.base_url = self.BASE_URL
         self.session = requests.Session()
         self.cookies = cookies
@@ -66,7 +109,6 @@ class SFExpressAPI:
         self.user_agent = user_agent or self.DEFAULT_WEB_USER_AGENT
         self.channel = channel
         self.device_id = device_id
-        self._init_js()
 
         self.default_headers = {
             "User-Agent": self.user_agent,
@@ -89,27 +131,9 @@ class SFExpressAPI:
             "priority": "u=1, i"
         }
 
-    def _init_js(self) -> None:
-        """初始化JavaScript环境"""
-        try:
-            with open(self.js_file_path, 'r', encoding='utf-8') as f:
-                js_code = f.read()
-            self.js_context = execjs.compile(js_code)
-        except Exception as e:
-            logger.error(f"初始化JavaScript环境失败: {e}")
-            self.js_context = None
-
     def get_sw8(self, url_path: str) -> Optional[Dict[str, Any]]:
-        """调用JavaScript中的get_sw8函数"""
-        if self.js_context is None:
-            raise RuntimeError("JavaScript context not initialized")
-
-        try:
-            result = self.js_context.call('get_sw8', url_path)
-            return result
-        except Exception as e:
-            logger.error(f"调用get_sw8函数时出错: {e}")
-            return None
+        """生成sw8请求头（code.js 中 get_sw8 的 Python 实现，无需启动 JS 运行时）"""
+        return generate_sw8(url_path)
 
     def generate_signature(self, timestamp: str, sys_code: str = None) -> str:
         """生成签名"""
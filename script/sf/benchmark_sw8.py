@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+sw8 生成性能对比
+
+对比 code.js（execjs 调用）与 api.generate_sw8（纯 Python）每秒可生成的 sw8 数量，
+并校验两者输出的结构一致：除两个随机 UUID 外，其余各段解码后完全相同。
+
+使用方法：
+    python benchmark_sw8.py [--calls 20]
+
+未安装 PyExecJS 或 Node.js 时只测试 Python 实现。
+
+Author: ZaiZaiCat
+Date: 2026-10-17
+"""
+
+import argparse
+import base64
+import os
+import re
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api import generate_sw8
+
+URL_PATH = "/mcs-mimp/commonPost/~memberEs~taskRecord~finishTask"
+UUID_PATTERN = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$")
+
+
+def decode_sw8(code: str) -> List[str]:
+    """把 sw8 按段解码，随机 UUID 段替换为占位符"""
+    parts = code.split("-")
+    decoded = []
+    for index, part in enumerate(parts):
+        if index in (0, 3):
+            decoded.append(part)
+            continue
+        text = base64.b64decode(part).decode("utf-8")
+        decoded.append("<uuid>" if UUID_PATTERN.match(text) else text)
+    return decoded
+
+
+def measure(func: Callable[[str], Dict[str, str]], calls: int) -> float:
+    """返回每秒调用次数"""
+    start = time.perf_counter()
+    for _ in range(calls):
+        func(URL_PATH)
+    return calls / (time.perf_counter() - start)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="sw8 生成性能对比")
+    parser.add_argument("--calls", type=int, default=20, help="execjs 调用次数（每次都会启动外部运行时，较慢）")
+    args = parser.parse_args()
+
+    python_result = generate_sw8(URL_PATH)
+    python_rate = measure(generate_sw8, max(args.calls, 1) * 1000)
+    print(f"Python generate_sw8: {python_rate:,.0f} 次/秒")
+
+    try:
+        import execjs
+        js_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "code.js")
+        with open(js_path, "r", encoding="utf-8") as f:
+            js_context = execjs.compile(f.read())
+        js_result = js_context.call("get_sw8", URL_PATH)
+    except Exception as e:
+        print(f"跳过 execjs 对比: {e}")
+        return 0
+
+    js_rate = measure(lambda path: js_context.call("get_sw8", path), max(args.calls, 1))
+    print(f"execjs get_sw8:      {js_rate:,.1f} 次/秒（运行时: {execjs.get().name}）")
+    print(f"提升: {python_rate / js_rate:,.0f} 倍")
+
+    if decode_sw8(python_result["code"]) != decode_sw8(js_result["code"]):
+        print("❌ 输出结构不一致")
+        print(f"   Python: {decode_sw8(python_result['code'])}")
+        print(f"   JS:     {decode_sw8(js_result['code'])}")
+        return 1
+    print("✅ 输出结构一致")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,23 +17,29 @@ Author: ZaiZaiCat
 Date: 2025-01-20
 """
 
+import hashlib
 import json
 import logging
+import os
 import random
 import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, unquote, urlparse
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from account_runner import resolve_concurrency, run_accounts
 from notification import send_notification, NotificationSound
+from token_config import get_platform_accounts, get_platform_config
 
 # 导入API模块（当前目录）
 from api import SFExpressAPI, ShareLoginInfo
@@ -42,6 +48,11 @@ from api import SFExpressAPI, ShareLoginInfo
 DELAY_BETWEEN_ACCOUNTS = (3, 8)      # 账号间切换延迟
 DELAY_AFTER_SIGN = (2, 5)           # 签到后延迟
 DELAY_BETWEEN_TASKS = (10, 15)      # 任务间延迟
+TASK_PACING_INTERVAL = (2, 4)       # 并发执行任务时，相邻两个任务开始的最小间隔
+
+# 登录态缓存配置
+LOGIN_CACHE_FILE = project_root / "config" / "sf_login_cache.json"
+LOGIN_CACHE_TTL = 12 * 3600         # 登录态最长复用时间（秒），可通过 sf.login_cache_ttl 覆盖，0 表示不缓存
 
 # 配置日志
 logging.basicConfig(
@@ -91,6 +102,36 @@ class SFAccountConfig:
         )
 
 
+class TaskPacer:
+    """
+    任务节奏控制器
+
+    多个线程共享同一个节奏：相邻两次任务开始之间至少间隔 interval_range 内的随机时长，
+    并发执行时请求频率不会高于串行执行。
+    """
+
+    def __init__(self, interval_range: Tuple[float, float]):
+        self.interval_range = interval_range
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> float:
+        """
+        等待到下一个可用的开始时间
+
+        Returns:
+            float: 实际等待的秒数
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + random.uniform(*self.interval_range)
+        delay = start - now
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
 class SFTasksManager:
     """顺丰积分任务管理器"""
 
@@ -109,26 +150,28 @@ class SFTasksManager:
         self.config_path = config_path
         self.site_name = "顺丰速运"
         self.accounts: List[SFAccountConfig] = []
+        self.concurrency = 1
+        self.login_cache_ttl = LOGIN_CACHE_TTL
+        self.task_concurrency = 1
         self.task_summary = []
+        self._login_cache_lock = threading.Lock()
         self.load_config()
 
     def load_config(self) -> None:
         """加载配置文件"""
         try:
             logger.info(f"正在读取配置文件: {self.config_path}")
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
             # 获取顺丰的配置
-            sf_config = config.get("sf", {})
-            raw_accounts = sf_config.get("accounts", [])
-
-            self.accounts = []
-            for raw_account in raw_accounts:
-                try:
-                    self.accounts.append(SFAccountConfig.from_dict(raw_account))
-                except ValueError as e:
-                    logger.error(f"账号配置异常: {e}")
+            sf_config = get_platform_config("sf", config_path=self.config_path)
+            self.concurrency = resolve_concurrency("sf", sf_config)
+            self.login_cache_ttl = int(sf_config.get("login_cache_ttl", LOGIN_CACHE_TTL))
+            self.task_concurrency = max(1, int(sf_config.get("task_concurrency", 1)))
+            self.accounts = get_platform_accounts(
+                "sf",
+                factory=SFAccountConfig.from_dict,
+                config_path=self.config_path,
+                load_logger=logger
+            )
 
             if not self.accounts:
                 logger.warning("配置文件中没有找到顺丰账号信息")
@@ -209,16 +252,137 @@ class SFTasksManager:
 
         return ""
 
+    @staticmethod
+    def _login_cache_key(sign: str) -> str:
+        """生成登录态缓存键（不直接落盘 sign）"""
+        return hashlib.sha256(sign.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _read_login_cache() -> Dict[str, Any]:
+        """读取磁盘上的登录态缓存"""
+        if not LOGIN_CACHE_FILE.exists():
+            return {}
+        try:
+            with open(LOGIN_CACHE_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"读取登录态缓存失败: {e}")
+            return {}
+
+    def _write_login_cache(self, cache_key: str, entry: Optional[Dict[str, Any]]) -> None:
+        """写入（或删除）磁盘上的登录态缓存，同时清理已过期的条目"""
+        with self._login_cache_lock:
+            now = time.time()
+            data = {
+                key: value for key, value in self._read_login_cache().items()
+                if isinstance(value, dict) and value.get('expires_at', 0) > now
+            }
+            if entry is None:
+                data.pop(cache_key, None)
+            else:
+                data[cache_key] = entry
+            tmp_path = f"{LOGIN_CACHE_FILE}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, LOGIN_CACHE_FILE)
+            except OSError as e:
+                logger.warning(f"写入登录态缓存失败: {e}")
+
+    def get_cached_login(self, account: SFAccountConfig) -> Optional[ShareLoginInfo]:
+        """
+        读取账号未过期的缓存登录态
+
+        Args:
+            account: 账号配置
+
+        Returns:
+            ShareLoginInfo | None: 缓存的登录信息
+        """
+        if self.login_cache_ttl <= 0:
+            return None
+
+        with self._login_cache_lock:
+            entry = self._read_login_cache().get(self._login_cache_key(account.sign))
+        if not isinstance(entry, dict) or entry.get('expires_at', 0) <= time.time():
+            return None
+        if not entry.get('user_id') or not entry.get('cookies'):
+            return None
+
+        return ShareLoginInfo(
+            success=True,
+            user_id=entry['user_id'],
+            token=entry.get('token', ''),
+            cookies=entry['cookies'],
+            raw={}
+        )
+
+    def save_cached_login(self, account: SFAccountConfig, login_info: Optional[ShareLoginInfo]) -> None:
+        """
+        保存（login_info 为 None 时删除）账号的缓存登录态
+
+        Args:
+            account: 账号配置
+            login_info: 分享登录返回的登录信息
+        """
+        if self.login_cache_ttl <= 0:
+            return
+
+        entry = None
+        if login_info is not None:
+            now = time.time()
+            entry = {
+                'user_id': login_info.user_id,
+                'token': login_info.token,
+                'cookies': login_info.cookies,
+                'cached_at': int(now),
+                'expires_at': int(now + self.login_cache_ttl),
+            }
+        self._write_login_cache(self._login_cache_key(account.sign), entry)
+
+    @staticmethod
+    def is_login_valid(account: SFAccountConfig, login_info: ShareLoginInfo) -> bool:
+        """
+        用查询积分接口探测登录态是否仍然有效
+
+        Args:
+            account: 账号配置
+            login_info: 待探测的登录信息
+
+        Returns:
+            bool: 登录态是否有效
+        """
+        probe_api = SFExpressAPI(
+            cookies=login_info.cookies,
+            device_id=account.device_id,
+            user_id=login_info.user_id,
+            user_agent=account.user_agent,
+            channel=account.channel
+        )
+        result = probe_api.query_user_info()
+        return bool(result.get("success"))
+
     def fetch_login_info(self, account: SFAccountConfig) -> Optional[ShareLoginInfo]:
         """
         获取账号登录信息（user_id + cookies）
 
+        优先复用缓存的登录态，探测失效后再请求分享登录接口。
+
         Args:
             account: 账号配置
 
         Returns:
             ShareLoginInfo | None: 登录信息
         """
+        cached_login = self.get_cached_login(account)
+        if cached_login is not None:
+            if self.is_login_valid(account, cached_login):
+                logger.info(f"[{account.account_name}] 复用缓存的登录态")
+                return cached_login
+            logger.info(f"[{account.account_name}] 缓存的登录态已失效，重新登录")
+            self.save_cached_login(account, None)
+
         logger.info(f"[{account.account_name}] 开始请求分享登录接口")
         login_info = SFExpressAPI.share_login(
             sign=account.sign,
@@ -234,6 +398,7 @@ class SFTasksManager:
             return None
 
         logger.info(f"[{account.account_name}] 分享登录成功，已获取用户信息")
+        self.save_cached_login(account, login_info)
         return login_info
 
     def auto_sign_and_fetch_package(self, sf_api: SFExpressAPI, account_name: str) -> Dict[str, Any]:
@@ -294,6 +459,23 @@ class SFTasksManager:
         Returns:
             Dict[str, Any]: 任务执行结果
         """
+        task_result = self.finish_single_task(task, sf_api, account_name)
+        if task_result.get('success'):
+            task_result['points'] = self.collect_task_rewards(sf_api, account_name)
+        return task_result
+
+    def finish_single_task(self, task: Dict[str, Any], sf_api: SFExpressAPI, account_name: str) -> Dict[str, Any]:
+        """
+        完成单个任务（不领取奖励）
+
+        Args:
+            task: 任务信息
+            sf_api: SF API实例
+            account_name: 账号名称
+
+        Returns:
+            Dict[str, Any]: 任务执行结果，points 固定为 0
+        """
         task_title = task.get('title', '未知任务')
         task_code = self.extract_task_code(task)
 
@@ -305,20 +487,7 @@ class SFTasksManager:
             finish_result = sf_api.finish_task(task_code)
             if finish_result and finish_result.get('success'):
                 logger.info(f"[{account_name}] 任务 {task_title} 完成成功")
-
-                # 获取任务奖励
-                reward_result = sf_api.fetch_tasks_reward()
-                logger.info(f"[{account_name}] 任务奖励获取结果: {reward_result}")
-
-                # 提取获得的积分
-                points = 0
-                if reward_result and reward_result.get('success'):
-                    obj_list = reward_result.get('obj', [])
-                    if isinstance(obj_list, list):
-                        for item in obj_list:
-                            points += item.get('point', 0)
-
-                return {'title': task_title, 'success': True, 'points': points}
+                return {'title': task_title, 'success': True, 'points': 0}
             else:
                 logger.warning(f"[{account_name}] 任务 {task_title} 完成失败或无返回结果")
                 return {'title': task_title, 'success': False, 'points': 0}
@@ -326,6 +495,64 @@ class SFTasksManager:
             logger.error(f"[{account_name}] 执行任务 {task_title} 时发生错误: {e}")
             return {'title': task_title, 'success': False, 'points': 0}
 
+    def collect_task_rewards(self, sf_api: SFExpressAPI, account_name: str) -> int:
+        """
+        领取所有已完成任务的奖励
+
+        Args:
+            sf_api: SF API实例
+            account_name: 账号名称
+
+        Returns:
+            int: 本次领取的积分
+        """
+        try:
+            reward_result = sf_api.fetch_tasks_reward()
+            logger.info(f"[{account_name}] 任务奖励获取结果: {reward_result}")
+        except Exception as e:
+            logger.error(f"[{account_name}] 领取任务奖励时发生错误: {e}")
+            return 0
+
+        # 提取获得的积分
+        points = 0
+        if reward_result and reward_result.get('success'):
+            obj_list = reward_result.get('obj', [])
+            if isinstance(obj_list, list):
+                for item in obj_list:
+                    points += item.get('point', 0)
+        return points
+
+    def run_tasks_concurrently(self, tasks: List[Dict[str, Any]], sf_api: SFExpressAPI,
+                               account_name: str) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        并发完成多个日常任务，结束后统一领取一次奖励
+
+        Args:
+            tasks: 待完成的任务列表
+            sf_api: SF API实例
+            account_name: 账号名称
+
+        Returns:
+            Tuple[List[Dict[str, Any]], int]: (各任务执行结果, 领取的积分)
+        """
+        pacer = TaskPacer(TASK_PACING_INTERVAL)
+        workers = min(self.task_concurrency, len(tasks))
+        logger.info(f"[{account_name}] 并发执行 {len(tasks)} 个日常任务，并发数 {workers}")
+
+        def run_task(task: Dict[str, Any]) -> Dict[str, Any]:
+            delay = pacer.wait()
+            if delay > 0:
+                logger.info(f"[{account_name}] 任务 {task.get('title', '未知任务')} 等待 {delay:.2f} 秒后执行")
+            return self.finish_single_task(task, sf_api, account_name)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sf-task") as executor:
+            task_results = list(executor.map(run_task, tasks))
+
+        points = 0
+        if any(result.get('success') for result in task_results):
+            points = self.collect_task_rewards(sf_api, account_name)
+        return task_results, points
+
     def process_account_tasks(self, account: SFAccountConfig) -> Dict[str, Any]:
         """
         处理单个账号的所有任务
@@ -390,6 +617,8 @@ class SFTasksManager:
             else:
                 logger.info(f"[{account_name}] 获取到 {len(task_list)} 个任务")
 
+                pending_tasks = []
+
                 # 处理每个任务
                 for i, task in enumerate(task_list, 1):
                     logger.info(f"[{account_name}] 开始处理第 {i}/{len(task_list)} 个任务")
@@ -405,6 +634,10 @@ class SFTasksManager:
                         logger.info(f"[{account_name}] 任务 {task.get('title', '未知任务')} 已完成，跳过")
                         continue
 
+                    if self.task_concurrency > 1:
+                        pending_tasks.append(task)
+                        continue
+
                     delay_time = random.uniform(*DELAY_BETWEEN_TASKS)
                     logger.info(f"[{account_name}] 准备执行任务 {task.get('title', '未知任务')}，延时 {delay_time:.2f} 秒...")
                     time.sleep(delay_time)
@@ -416,6 +649,12 @@ class SFTasksManager:
                         account_stat['completed_tasks'] += 1
                         account_stat['total_points'] += task_result.get('points', 0)
 
+                if pending_tasks:
+                    task_results, points = self.run_tasks_concurrently(pending_tasks, sf_api, account_name)
+                    account_stat['tasks'].extend(task_results)
+                    account_stat['completed_tasks'] += sum(1 for r in task_results if r.get('success'))
+                    account_stat['total_points'] += points
+
             # 查询账号积分信息（当前积分）
             user_info_result = sf_api.query_user_info()
             if user_info_result.get("success"):
@@ -441,20 +680,13 @@ class SFTasksManager:
 
         logger.info(f"开始执行任务，共 {len(self.accounts)} 个账号")
 
-        for i, account in enumerate(self.accounts, 1):
-            logger.info(f"\n{'='*60}")
-            logger.info(f"处理第 {i}/{len(self.accounts)} 个账号")
-            logger.info(f"{'='*60}")
-
-            account_stat = self.process_account_tasks(account)
-            self.task_summary.append(account_stat)
-            logger.info(f"账号 {i} 处理完成")
-
-            # 账号间添加延时，避免频繁切换
-            if i < len(self.accounts):
-                account_delay = random.uniform(*DELAY_BETWEEN_ACCOUNTS)
-                logger.info(f"账号切换延时 {account_delay:.2f} 秒...")
-                time.sleep(account_delay)
+        self.task_summary.extend(run_accounts(
+            self.accounts,
+            self.process_account_tasks,
+            concurrency=self.concurrency,
+            delay_range=DELAY_BETWEEN_ACCOUNTS,
+            run_logger=logger
+        ))
 
         logger.info("所有账号任务处理完成")
 
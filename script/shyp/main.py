@@ -49,7 +49,9 @@ notification_dir = os.path.dirname(parent_dir)
 if notification_dir not in sys.path:
     sys.path.insert(0, notification_dir)
 
+from account_runner import resolve_concurrency, run_accounts
 from notification import send_notification, NotificationSound
+from token_config import get_platform_config
 
 # ==================== 延迟时间常量配置 (秒) ====================
 # 账号级别延迟
@@ -100,6 +102,7 @@ class ShypTasks:
 
         self.config_file = config_file  # 保留用于兼容性
         self.accounts: List[Dict[str, Any]] = []
+        self.concurrency = 1
         self.logger = self._setup_logger()
         self._init_accounts()
         # 任务统计数据
@@ -145,12 +148,10 @@ class ShypTasks:
         """加载配置文件"""
         try:
             self.logger.info(f"正在读取配置文件: {self.config_path}")
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
             # 获取顺丰的配置
-            sf_config = config.get('shyp', {})
+            sf_config = get_platform_config('shyp', config_path=self.config_path)
             self.accounts = sf_config.get('accounts', [])
+            self.concurrency = resolve_concurrency('shyp', sf_config)
 
             if not self.accounts:
                 self.logger.warning("配置文件中没有找到账号信息")
@@ -833,19 +834,14 @@ class ShypTasks:
         self.logger.info(f"👥 账号数量: {len(self.accounts)}")
         self.logger.info(f"{'='*60}\n")
 
-        # 遍历所有账号
-        for index, account in enumerate(self.accounts, 1):
-            self.logger.info(f"\n处理第 {index}/{len(self.accounts)} 个账号")
-
-            # 执行账号任务并收集结果
-            result = self.check_account_tasks(account)
-            self.account_results.append(result)
-
-            # 账号间延迟（最后一个账号不需要延迟）
-            if index < len(self.accounts):
-                delay = random.uniform(DELAY_BETWEEN_ACCOUNTS[0], DELAY_BETWEEN_ACCOUNTS[1])
-                self.logger.info(f"⏳ 等待 {delay:.1f} 秒后处理下一个账号...\n")
-                time.sleep(delay)
+        # 遍历所有账号（按配置的并发数执行，结果按账号顺序收集）
+        self.account_results.extend(run_accounts(
+            self.accounts,
+            self.check_account_tasks,
+            concurrency=self.concurrency,
+            delay_range=DELAY_BETWEEN_ACCOUNTS,
+            run_logger=self.logger
+        ))
 
         # 计算成功和失败数量
         success_count = sum(1 for r in self.account_results if r.get('success'))
@@ -6,19 +6,86 @@
 """
 
 import base64
+import heapq
+import itertools
 import requests
 from typing import Dict, Optional, Any, List
 import logging
+import threading
 import time
 from io import BytesIO
 from PIL import Image
 from urllib.parse import unquote
 from typing import Optional, Dict, Any
 from .sign_calculator import calculate_sign_from_params,calculate_sign
+from .metadata_cache import metadata_cache, ACTIVITY_ID_TTL, ARTICLE_CHANNEL_TTL
 
 # 获取logger实例（由main.py统一配置）
 logger = logging.getLogger(__name__)
 
+REQUEST_MIN_INTERVAL = 1.0  # 同一账号相邻两次请求的最小间隔（秒），众测与互动流水线共用
+
+# 关注任务流水线
+FOLLOW_MAX_IN_FLIGHT = 3      # 同时处于"已关注、待取消"状态的用户数上限
+FOLLOW_MIN_DWELL = 2.0        # 关注成功后至少保持多久再取消关注（秒）
+FOLLOW_START_INTERVAL = 1.0   # 相邻两次发起关注的错开间隔（秒）
+FOLLOW_MAX_PAGES = 5          # 候选用户不足时最多翻到第几页
+
+
+class RequestPacer:
+    """单账号请求节流器：多个线程共用时按到达顺序依次排队，保证相邻请求间隔不小于 min_interval"""
+
+    def __init__(self, min_interval: float = REQUEST_MIN_INTERVAL):
+        """
+        初始化节流器
+
+        Args:
+            min_interval: 相邻两次请求的最小间隔（秒），<=0 表示不限制
+        """
+        self.min_interval = max(0.0, float(min_interval))
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self) -> None:
+        """占用下一个请求时间片，必要时阻塞到该时间片"""
+        if self.min_interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_cdn_session: Optional[requests.Session] = None
+_cdn_session_lock = threading.Lock()
+
+
+def _get_cdn_session() -> requests.Session:
+    """
+    获取进程内共享的匿名 Session（不带账号 Cookie、不经过账号节流器）
+
+    用于请求与账号无关的 CDN 元数据，多账号复用同一个连接池。
+    """
+    global _cdn_session
+    with _cdn_session_lock:
+        if _cdn_session is None:
+            _cdn_session = requests.Session()
+        return _cdn_session
+
+
+class _PacedSession(requests.Session):
+    """每次发请求前先经过节流器的 Session（get/post 最终都会走到 request）"""
+
+    def __init__(self, pacer: RequestPacer):
+        super().__init__()
+        self.pacer = pacer
+
+    def request(self, *args, **kwargs):
+        self.pacer.wait()
+        return super().request(*args, **kwargs)
+
 
 class SmzdmAPI:
     """什么值得买API类 - 封装所有API交互逻辑"""
@@ -32,19 +99,30 @@ class SmzdmAPI:
     DINGYUE_API_URL = "https://dingyue-api.smzdm.com"
     BAOLIAO_TASK_URL = "https://user-api.smzdm.com"
 
-    def __init__(self, cookie: str, user_agent: str, setting: str):
+    def __init__(
+        self,
+        cookie: str,
+        user_agent: str,
+        setting: str,
+        use_cache: bool = True,
+        request_interval: float = REQUEST_MIN_INTERVAL
+    ):
         """
         初始化API客户端
 
         Args:
             cookie: 账号Cookie
             user_agent: 用户代理字符串
+            use_cache: 是否使用多账号共享的每日元数据缓存（活动ID、文章channel_id）
+            request_interval: 本账号相邻两次请求的最小间隔（秒），多个任务线程共用
         """
         self.cookie = cookie
         self.user_agent = user_agent
-        self.session = requests.Session()
+        self.pacer = RequestPacer(request_interval)
+        self.session = _PacedSession(self.pacer)
         self._setup_headers()
         self.setting = setting
+        self.metadata_cache = metadata_cache if use_cache else None
         logger.debug("API客户端初始化完成")
 
     def _setup_headers(self):
@@ -126,6 +204,20 @@ class SmzdmAPI:
         Returns:
             活动ID，失败返回None
         """
+        if self.metadata_cache is None:
+            return self._fetch_activity_id(from_source)
+
+        cache_key = f"activity_id:{from_source}"
+        cached = self.metadata_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"✅ 使用缓存的活动ID: {cached}")
+            return cached
+        return self.metadata_cache.get_or_load(
+            cache_key, lambda: self._fetch_activity_id(from_source), ACTIVITY_ID_TTL
+        )
+
+    def _fetch_activity_id(self, from_source: str) -> Optional[str]:
+        """请求接口获取活动ID（不经过缓存）"""
         url = f"{self.BASE_URL}/task/task/ajax_get_activity_id"
         params = {'from': from_source}
 
@@ -368,13 +460,27 @@ class SmzdmAPI:
         Returns:
             channel_id,失败返回None
         """
+        if self.metadata_cache is None:
+            return self._fetch_article_channel_id(article_id)
+
+        cache_key = f"article_channel:{article_id}"
+        cached = self.metadata_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"✅ 使用缓存的channel_id: {cached} (article_id={article_id})")
+            return int(cached)
+        return self.metadata_cache.get_or_load(
+            cache_key, lambda: self._fetch_article_channel_id(article_id), ARTICLE_CHANNEL_TTL
+        )
+
+    def _fetch_article_channel_id(self, article_id: str) -> Optional[int]:
+        """请求文章预加载接口获取channel_id（不经过缓存，使用匿名共享 Session，不携带账号 Cookie）"""
         # 构建URL
         url = f"{self.ARTICLE_CDN_URL}/preload/{article_id}/fiphone/v11_1_35/wx1/im0/hcae67e467x7q/h5cc7e8ebddb8f0f73.json"
 
         logger.info(f"📌 正在获取文章channel_id (article_id={article_id})...")
 
         try:
-            response = requests.get(url, timeout=10)
+            response = _get_cdn_session().get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
 
@@ -1320,23 +1426,72 @@ class SmzdmAPI:
             logger.error(f"❌ 取消关注用户请求失败: {str(e)}")
             return False
 
-    def execute_follow_task(self, max_follow_count: int = 5) -> Dict[str, int]:
+    def _iter_follow_candidates(self, first_rows: List[Dict[str, Any]], max_pages: int):
+        """
+        逐个产出可关注的用户，当前页用完后才请求下一页
+
+        Args:
+            first_rows: 第一页的用户列表
+            max_pages: 最多翻到的页码
+
+        Yields:
+            (用户名, 用户ID)
+        """
+        seen = set()
+        rows, page = first_rows, 1
+        while True:
+            for user_row in rows:
+                article_title = user_row.get('article_title', '')
+                user_id = user_row.get('keyword_id', '')
+
+                if not article_title or not user_id:
+                    logger.warning(f"用户信息不完整，跳过: {user_row}")
+                    continue
+                if user_id in seen:
+                    continue
+                seen.add(user_id)
+                yield article_title, user_id
+
+            page += 1
+            if page > max_pages:
+                return
+            user_data = self.get_follow_user_list(page)
+            rows = (user_data or {}).get('rows', [])
+            if not rows:
+                return
+            logger.info(f"第 {page} 页获取到 {len(rows)} 个用户")
+
+    def execute_follow_task(
+        self,
+        max_follow_count: int = 5,
+        max_in_flight: int = FOLLOW_MAX_IN_FLIGHT,
+        min_dwell: float = FOLLOW_MIN_DWELL,
+        start_interval: float = FOLLOW_START_INTERVAL
+    ) -> Dict[str, int]:
         """
-        执行关注任务（关注用户后立即取消关注）
+        执行关注任务（关注用户后再取消关注）
+
+        多个"关注→取消关注"按 start_interval 错开发起、同时进行，
+        同一时刻处于已关注状态的用户不超过 max_in_flight 个，
+        每个用户关注后至少保持 min_dwell 秒再取消。
 
         Args:
             max_follow_count: 最大关注用户数量，默认为5
+            max_in_flight: 同时进行中的关注数量上限
+            min_dwell: 关注后到取消关注的最短间隔（秒）
+            start_interval: 相邻两次发起关注的间隔（秒）
 
         Returns:
             执行统计字典 {success: 成功数, fail: 失败数}
         """
-        logger.info(f"开始执行关注任务，最大关注用户数: {max_follow_count}")
+        logger.info(f"开始执行关注任务，最大关注用户数: {max_follow_count}，并行上限: {max_in_flight}")
 
         success_count = 0
         fail_count = 0
+        max_in_flight = max(1, int(max_in_flight))
 
         try:
-            # 获取用户列表
+            # 获取用户列表（后续页按需获取）
             user_data = self.get_follow_user_list()
             if not user_data:
                 logger.error("获取用户列表失败")
@@ -1350,45 +1505,55 @@ class SmzdmAPI:
 
             logger.info(f"获取到 {len(rows)} 个用户")
 
-            processed_count = 0
-            for user_row in rows:
-                if processed_count >= max_follow_count:
+            candidates = self._iter_follow_candidates(rows, FOLLOW_MAX_PAGES)
+            events = []  # 按到期时间排序: (到期时间, 序号, 动作, 编号, 用户名, 用户ID)
+            sequence = itertools.count()
+            started_count = 0
+            in_flight = 0
+            next_start = time.monotonic()
+            exhausted = False
+
+            while True:
+                # 有空位时发起新的关注
+                while not exhausted and started_count < max_follow_count and in_flight < max_in_flight:
+                    candidate = next(candidates, None)
+                    if candidate is None:
+                        exhausted = True
+                        break
+                    started_count += 1
+                    in_flight += 1
+                    due = max(next_start, time.monotonic())
+                    next_start = due + start_interval
+                    heapq.heappush(events, (due, next(sequence), 'follow', started_count) + candidate)
+
+                if not events:
                     break
 
-                # 提取用户信息
-                article_title = user_row.get('article_title', '')
-                # 从用户数据中提取用户ID，这里需要根据实际返回的数据结构调整
-                user_id = user_row.get('keyword_id', '')
-
-                if not article_title or not user_id:
-                    logger.warning(f"用户信息不完整，跳过: {user_row}")
-                    continue
-
-                logger.info(f"  [{processed_count + 1}] 处理用户: {article_title}")
-
-                # 执行关注
-                if self.follow_user(article_title, user_id):
-                    logger.info(f"    ✅ 关注成功")
-
-                    # 等待一下再取消关注
-                    time.sleep(2)
-
-                    # 取消关注
+                due, _, action, index, article_title, user_id = heapq.heappop(events)
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+                if action == 'follow':
+                    logger.info(f"  [{index}] 处理用户: {article_title}")
+                    if self.follow_user(article_title, user_id):
+                        logger.info(f"    ✅ [{index}] 关注成功")
+                        heapq.heappush(
+                            events,
+                            (time.monotonic() + min_dwell, next(sequence), 'unfollow', index, article_title, user_id)
+                        )
+                    else:
+                        logger.info(f"    ❌ [{index}] 关注失败")
+                        fail_count += 1
+                        in_flight -= 1
+                else:
                     if self.unfollow_user(article_title, user_id):
-                        logger.info(f"    ✅ 取消关注成功")
+                        logger.info(f"    ✅ [{index}] 取消关注成功")
                         success_count += 1
                     else:
-                        logger.info(f"    ❌ 取消关注失败")
+                        logger.info(f"    ❌ [{index}] 取消关注失败")
                         fail_count += 1
-                else:
-                    logger.info(f"    ❌ 关注失败")
-                    fail_count += 1
-
-                processed_count += 1
-
-                # 处理间隔
-                if processed_count < max_follow_count:
-                    time.sleep(3)
+                    in_flight -= 1
 
             logger.info(f"关注任务执行完成: 成功 {success_count} 个, 失败 {fail_count} 个")
             return {'success': success_count, 'fail': fail_count}
@@ -1397,10 +1562,6 @@ class SmzdmAPI:
             logger.error(f"执行关注任务时发生错误: {str(e)}")
             return {'success': success_count, 'fail': fail_count + 1}
 
-
-
-
-
     # ==================== 爆料相关API ====================
 
     def check_repeat_baoliao(self, url: str) -> Optional[Dict[str, Any]]:
@@ -0,0 +1,150 @@
+"""
+什么值得买元数据缓存模块
+功能：缓存与账号无关的全局数据（众测活动ID、文章channel_id等），
+      内存 + 磁盘两级，按自然日失效，多账号共享，第 2..N 个账号不再重复请求
+
+Author: ZaiZaiCat
+Date: 2026-10-17
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+METADATA_CACHE_FILE = Path(__file__).resolve().parent.parent.parent.parent / "config" / "smzdm_metadata_cache.json"
+ACTIVITY_ID_TTL = 6 * 3600          # 活动ID缓存时长（秒），跨日一律失效
+ARTICLE_CHANNEL_TTL = 24 * 3600     # 文章channel_id缓存时长（秒），跨日一律失效
+
+
+class MetadataCache:
+    """按自然日失效的全局元数据缓存（线程安全，多账号并发共享）"""
+
+    def __init__(self, cache_file: Path = METADATA_CACHE_FILE):
+        """
+        初始化缓存
+
+        Args:
+            cache_file: 磁盘缓存文件路径
+        """
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._day = ""
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def _today() -> str:
+        return date.today().isoformat()
+
+    def _ensure_loaded(self) -> None:
+        """首次使用或跨日时从磁盘重新加载（需持有 self._lock）"""
+        today = self._today()
+        if self._day == today:
+            return
+        self._day = today
+        self._entries = {}
+        if not self.cache_file.exists():
+            return
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"读取元数据缓存失败: {e}")
+            return
+        if isinstance(data, dict) and data.get("date") == today and isinstance(data.get("entries"), dict):
+            self._entries = data["entries"]
+
+    def _flush(self) -> None:
+        """写入磁盘，同时清理已过期的条目（需持有 self._lock）"""
+        now = time.time()
+        self._entries = {
+            key: entry
+            for key, entry in self._entries.items()
+            if isinstance(entry, dict) and entry.get("expires_at", 0) > now
+        }
+        tmp_path = f"{self.cache_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"date": self._day, "entries": self._entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            logger.warning(f"写入元数据缓存失败: {e}")
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        读取未过期的缓存值
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存值，不存在或已过期返回None
+        """
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(key)
+        if not isinstance(entry, dict) or entry.get("expires_at", 0) <= time.time():
+            return None
+        return entry.get("value")
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        """
+        写入缓存值（内存与磁盘同时更新）
+
+        Args:
+            key: 缓存键
+            value: 可JSON序列化的值
+            ttl: 有效期（秒）
+        """
+        with self._lock:
+            self._ensure_loaded()
+            self._entries[key] = {"value": value, "expires_at": time.time() + ttl}
+            self._flush()
+
+    def get_or_load(self, key: str, loader: Callable[[], Optional[Any]], ttl: int) -> Optional[Any]:
+        """
+        读取缓存，未命中时调用 loader 获取并写入缓存
+
+        同一个键同一时间只有一个线程执行 loader，并发的其他账号等待其结果，
+        loader 返回 None（请求失败）时不缓存。
+
+        Args:
+            key: 缓存键
+            loader: 未命中时获取数据的函数
+            ttl: 有效期（秒）
+
+        Returns:
+            缓存值或 loader 的返回值
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            value = self.get(key)
+            if value is not None:
+                return value
+            value = loader()
+            if value is not None:
+                self.set(key, value, ttl)
+            return value
+
+    def clear(self) -> None:
+        """清空内存与磁盘缓存"""
+        with self._lock:
+            self._day = self._today()
+            self._entries = {}
+            self._flush()
+
+
+# 进程内共享实例，所有 SmzdmAPI 默认使用
+metadata_cache = MetadataCache()
@@ -16,6 +16,7 @@ import time
 import random
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Any
 from datetime import datetime
@@ -33,10 +34,15 @@ if project_root not in sys.path:
 if smzdm_dir not in sys.path:
     sys.path.insert(0, smzdm_dir)
 
-from api.api import SmzdmAPI
+from api.api import SmzdmAPI, REQUEST_MIN_INTERVAL
 from service import SmzdmService
 
+from account_runner import resolve_concurrency, run_accounts
 from notification import send_notification, NotificationSound
+from token_config import get_platform_config
+
+# 账号间切换延迟 (秒)
+DELAY_BETWEEN_ACCOUNTS = (5, 5)
 
 # ==================== 日志配置 ====================
 def setup_logger():
@@ -95,6 +101,12 @@ class SmzdmTaskManager:
         self.config_path = config_path
         self.site_name = "什么值得买"
         self.accounts = []
+        self.concurrency = 1
+        self.use_metadata_cache = True  # 多账号共享每日元数据缓存（活动ID、文章channel_id）
+        self.pipeline_concurrent = True  # 众测与互动任务两条流水线并发执行
+        self.request_interval = REQUEST_MIN_INTERVAL  # 单账号相邻请求最小间隔（秒）
+        self.follow_in_flight = None  # 关注任务并行上限，None 使用默认值
+        self.follow_min_dwell = None  # 关注后到取消关注的最短间隔（秒），None 使用默认值
         self.account_results = []  # 收集每个账号的执行结果
         self.load_config()
 
@@ -107,17 +119,22 @@ class SmzdmTaskManager:
                 logger.error(f"❌ 配置文件不存在: {self.config_path}")
                 raise FileNotFoundError(f"配置文件不存在: {self.config_path}")
 
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-
-                # 获取什么值得买的配置
-                smzdm_config = config.get('smzdm', {})
-                self.accounts = smzdm_config.get('accounts', [])
-
-                if not self.accounts:
-                    logger.warning("配置文件中没有找到什么值得买账号信息")
-                else:
-                    logger.info(f"✅ 成功加载配置文件，共 {len(self.accounts)} 个账号\n")
+            # 获取什么值得买的配置
+            smzdm_config = get_platform_config('smzdm', config_path=self.config_path)
+            self.accounts = smzdm_config.get('accounts', [])
+            self.concurrency = resolve_concurrency('smzdm', smzdm_config)
+            self.use_metadata_cache = bool(smzdm_config.get('metadata_cache', True))
+            self.pipeline_concurrent = bool(smzdm_config.get('pipeline_concurrent', True))
+            self.request_interval = float(smzdm_config.get('request_interval', REQUEST_MIN_INTERVAL))
+            if smzdm_config.get('follow_in_flight') is not None:
+                self.follow_in_flight = int(smzdm_config['follow_in_flight'])
+            if smzdm_config.get('follow_min_dwell') is not None:
+                self.follow_min_dwell = float(smzdm_config['follow_min_dwell'])
+
+            if not self.accounts:
+                logger.warning("配置文件中没有找到什么值得买账号信息")
+            else:
+                logger.info(f"✅ 成功加载配置文件，共 {len(self.accounts)} 个账号\n")
         except json.JSONDecodeError as e:
             logger.error(f"❌ 配置文件JSON格式错误: {str(e)}")
             raise
@@ -203,6 +220,7 @@ class SmzdmTaskManager:
             success_count = 0
             fail_count = 0
             skip_count = 0
+            deferred_claims = []  # 已完成未领取的任务，统一在流水线末尾批量领取
 
             for task in tasks:
                 task_name = task.get('task_name', '未知任务')
@@ -212,6 +230,10 @@ class SmzdmTaskManager:
                 if task_status == 4:
                     skip_count += 1
                     continue
+                elif task_status == 3:
+                    logger.info(f"任务 [{task_name}] 已完成,稍后统一领取奖励")
+                    deferred_claims.append(task.get('task_id', ''))
+                    continue
 
                 # 执行任务 - 使用service层
                 try:
@@ -229,16 +251,21 @@ class SmzdmTaskManager:
                     logger.error(f"    ❌ 执行任务 [{task_name}] 时发生异常: {str(e)}")
                     fail_count += 1
 
+            # 领取任务奖励（含执行前就已完成的任务）
+            logger.info(f"💰 检查并领取众测任务奖励...")
+            claim_results = self.claim_task_rewards(api, activity_id)
+            for task_id in deferred_claims:
+                if claim_results.get(task_id):
+                    success_count += 1
+                else:
+                    fail_count += 1
+
             # 输出执行结果统计
             logger.info(f"📊 众测任务执行统计:")
             logger.info(f"    ✅ 成功: {success_count} 个")
             logger.info(f"    ⚠️  失败: {fail_count} 个")
             logger.info(f"    ⏭️  跳过: {skip_count} 个")
 
-            # 领取任务奖励
-            logger.info(f"💰 检查并领取众测任务奖励...")
-            self.claim_task_rewards(api, activity_id)
-
             return {'success': success_count, 'fail': fail_count, 'skip': skip_count}
 
         except Exception as e:
@@ -300,6 +327,7 @@ class SmzdmTaskManager:
             success_count = 0
             fail_count = 0
             skip_count = 0
+            deferred_claims = []  # 已完成未领取的任务，统一在流水线末尾批量领取
 
             for task in tasks:
                 task_id = task.get('task_id', '')
@@ -312,21 +340,9 @@ class SmzdmTaskManager:
                     skip_count += 1
                     continue
                 elif task_status == 3:
-                    # 已完成未领取,尝试领取奖励
-                    logger.info(f"  💰 任务 [{task_name}] 已完成,尝试领取奖励...")
-                    try:
-                        if api.receive_reward(task_id):
-                            logger.info(f"    ✅ 任务 [{task_name}] 奖励领取成功")
-                            success_count += 1
-                        else:
-                            logger.info(f"    ❌ 任务 [{task_name}] 奖励领取失败")
-                            fail_count += 1
-                    except Exception as e:
-                        logger.error(f"    ❌ 领取任务 [{task_name}] 奖励时发生异常: {str(e)}")
-                        fail_count += 1
-
-                    # 领取奖励后等待
-                    time.sleep(1)
+                    # 已完成未领取,留到流水线末尾统一领取
+                    logger.info(f"  💰 任务 [{task_name}] 已完成,稍后统一领取奖励")
+                    deferred_claims.append(task_id)
                     continue
 
                 # 执行任务 - 使用service层
@@ -360,7 +376,11 @@ class SmzdmTaskManager:
 
                         # 执行关注任务，数量不超过剩余需要的数量 - 使用service层
                         follow_count = min(remaining_count, 5)  # 每次最多关注5个用户
-                        result = service.execute_follow_task(follow_count)
+                        result = service.execute_follow_task(
+                            follow_count,
+                            max_in_flight=self.follow_in_flight,
+                            min_dwell=self.follow_min_dwell
+                        )
                         if result['success'] > 0:
                             success_count += 1
                             logger.info(f"    ✅ 任务 [{task_name}] 执行成功")
@@ -388,44 +408,53 @@ class SmzdmTaskManager:
                     logger.error(f"    ❌ 执行任务 [{task_name}] 时发生异常: {str(e)}")
                     fail_count += 1
 
+            # 重新获取任务列表并领取奖励（含执行前就已完成的任务）
+            logger.info(f"💰 重新获取互动任务状态并领取奖励...")
+            claim_results = self.claim_interactive_task_rewards(api, service)
+            for task_id in deferred_claims:
+                if claim_results.get(task_id):
+                    success_count += 1
+                else:
+                    fail_count += 1
+
             # 输出执行结果统计
             logger.info(f"📊 互动任务执行统计:")
             logger.info(f"    ✅ 成功: {success_count} 个")
             logger.info(f"    ⚠️  失败: {fail_count} 个")
             logger.info(f"    ⏭️  跳过: {skip_count} 个")
 
-            # 重新获取任务列表并领取奖励
-            logger.info(f"💰 重新获取互动任务状态并领取奖励...")
-            self.claim_interactive_task_rewards(api, service)
-
             return {'success': success_count, 'fail': fail_count, 'skip': skip_count}
 
         except Exception as e:
             logger.error(f"❌ 处理互动任务时发生错误: {str(e)}", exc_info=True)
             return {'success': 0, 'fail': 0, 'skip': 0}
 
-    def claim_task_rewards(self, api: SmzdmAPI, activity_id: str):
+    def claim_task_rewards(self, api: SmzdmAPI, activity_id: str) -> Dict[str, bool]:
         """
-        查询任务列表并领取所有可领取的奖励
+        查询任务列表并批量领取所有可领取的奖励（请求间隔由账号节流器控制）
 
         Args:
             api: SmzdmAPI实例
             activity_id: 活动ID
+
+        Returns:
+            领取结果 {task_id: 是否成功}
         """
+        claim_results = {}
         try:
             # 重新获取任务列表，查看最新状态
             tasks = api.get_task_list(activity_id)
 
             if not tasks:
                 logger.warning("    ⚠️  重新获取任务列表失败，无法领取奖励")
-                return
+                return claim_results
 
             # 筛选出已完成但未领取的任务（状态为3）
             claimable_tasks = [task for task in tasks if task.get('task_status') == 3]
 
             if not claimable_tasks:
                 logger.info("    ℹ️  没有可领取的任务奖励")
-                return
+                return claim_results
 
             logger.info(f"    🎁 发现 {len(claimable_tasks)} 个可领取奖励的任务")
 
@@ -444,49 +473,52 @@ class SmzdmTaskManager:
                     reward_text = ', '.join([f"{r.get('name', '')}{r.get('num', '')}" for r in rewards])
 
                 # 调用领取奖励接口
-                if api.receive_reward(task_id):
+                claim_results[task_id] = api.receive_reward(task_id)
+                if claim_results[task_id]:
                     claimed_count += 1
                     logger.info(f"      ✅ [{task_name}] 奖励领取成功: {reward_text}")
                 else:
                     failed_count += 1
 
-                # 领取间隔
-                time.sleep(1)
-
             # 统计信息
             if claimed_count > 0 or failed_count > 0:
                 logger.info(f"  📊 奖励领取结果: 成功 {claimed_count} 个, 失败 {failed_count} 个")
 
         except Exception as e:
             logger.error(f"    ❌ 领取奖励过程中发生错误: {str(e)}")
+        return claim_results
 
-    def claim_interactive_task_rewards(self, api: SmzdmAPI, service: SmzdmService):
+    def claim_interactive_task_rewards(self, api: SmzdmAPI, service: SmzdmService) -> Dict[str, bool]:
         """
-        重新获取互动任务列表并领取所有可领取的奖励
+        重新获取互动任务列表并批量领取所有可领取的奖励（请求间隔由账号节流器控制）
 
         Args:
             api: SmzdmAPI实例
             service: SmzdmService实例
+
+        Returns:
+            领取结果 {task_id: 是否成功}
         """
+        claim_results = {}
         try:
             # 重新获取互动任务列表
             task_data = api.get_interactive_task_list()
             if not task_data:
                 logger.warning("    ⚠️  重新获取互动任务列表失败，无法领取奖励")
-                return
+                return claim_results
 
             # 解析任务列表 - 使用service层
             tasks = service.parse_interactive_tasks(task_data)
             if not tasks:
                 logger.warning("    ⚠️  没有找到互动任务")
-                return
+                return claim_results
 
             # 筛选出已完成但未领取的任务（状态为'3'）
             claimable_tasks = [task for task in tasks if task.get('task_status') == '3']
 
             if not claimable_tasks:
                 logger.info("    ℹ️  没有可领取的互动任务奖励")
-                return
+                return claim_results
 
             logger.info(f"    🎁 发现 {len(claimable_tasks)} 个可领取奖励的互动任务")
 
@@ -499,22 +531,21 @@ class SmzdmTaskManager:
                 task_name = task.get('task_name', '未知任务')
 
                 # 调用领取奖励接口
-                if api.receive_reward(task_id):
+                claim_results[task_id] = api.receive_reward(task_id)
+                if claim_results[task_id]:
                     claimed_count += 1
                     logger.info(f"      ✅ [{task_name}] 奖励领取成功")
                 else:
                     failed_count += 1
                     logger.info(f"      ❌ [{task_name}] 奖励领取失败")
 
-                # 领取间隔
-                time.sleep(1)
-
             # 统计信息
             if claimed_count > 0 or failed_count > 0:
                 logger.info(f"  📊 互动任务奖励领取结果: 成功 {claimed_count} 个, 失败 {failed_count} 个")
 
         except Exception as e:
             logger.error(f"    ❌ 领取互动任务奖励过程中发生错误: {str(e)}")
+        return claim_results
 
     def send_task_notification(self, start_time: datetime, end_time: datetime) -> None:
         """
@@ -649,7 +680,13 @@ class SmzdmTaskManager:
         logger.info(f"{'='*60}")
 
         # 创建API客户端
-        api = SmzdmAPI(cookie, user_agent, setting)
+        api = SmzdmAPI(
+            cookie,
+            user_agent,
+            setting,
+            use_cache=self.use_metadata_cache,
+            request_interval=self.request_interval
+        )
 
         try:
             # 创建服务实例
@@ -673,16 +710,24 @@ class SmzdmTaskManager:
             # 等待一下再处理下一个模块
             time.sleep(2)
 
-            # 1. 处理众测任务
-            zhongce_stats = self.process_zhongce_tasks(api, account_name)
-            result['zhongce'] = zhongce_stats
+            if self.pipeline_concurrent:
+                # 1+2. 众测与互动任务属于不同活动，两条流水线并发执行，共用本账号的请求节流器
+                with ThreadPoolExecutor(max_workers=2, thread_name_prefix="smzdm-pipeline") as executor:
+                    zhongce_future = executor.submit(self.process_zhongce_tasks, api, account_name)
+                    interactive_future = executor.submit(self.process_interactive_tasks, api, account_name)
+                    zhongce_stats = zhongce_future.result()
+                    interactive_stats = interactive_future.result()
+            else:
+                # 1. 处理众测任务
+                zhongce_stats = self.process_zhongce_tasks(api, account_name)
 
-            # 等待一下再处理下一个模块
-            delay_time = random.uniform(10, 15)
-            logger.info(f"[{account_name}] 更换任务模块 {delay_time}，等待 {delay_time:.2f} 秒...")
+                # 等待一下再处理下一个模块
+                delay_time = random.uniform(10, 15)
+                logger.info(f"[{account_name}] 更换任务模块 {delay_time}，等待 {delay_time:.2f} 秒...")
 
-            # 2. 处理互动任务
-            interactive_stats = self.process_interactive_tasks(api, account_name)
+                # 2. 处理互动任务
+                interactive_stats = self.process_interactive_tasks(api, account_name)
+            result['zhongce'] = zhongce_stats
             result['interactive'] = interactive_stats
 
             # 输出总统计
@@ -725,32 +770,19 @@ class SmzdmTaskManager:
 
         logger.info(f"📝 共配置 {len(self.accounts)} 个账号\n")
 
-        # 处理每个账号
-        for idx, account in enumerate(self.accounts, 1):
-            try:
-                logger.info(f"\n{'#'*60}")
-                logger.info(f"# 处理第 {idx}/{len(self.accounts)} 个账号")
-                logger.info(f"{'#'*60}\n")
-
-                # 处理账号并收集结果
-                result = self.process_account(account)
-                self.account_results.append(result)
-
-                # 如果不是最后一个账号,等待一段时间
-                if idx < len(self.accounts):
-                    wait_time = 5
-                    logger.info(f"⏳ 等待 {wait_time} 秒后处理下一个账号...\n")
-                    time.sleep(wait_time)
-
-            except Exception as e:
-                logger.error(f"❌ 处理第 {idx} 个账号时发生错误: {str(e)}\n", exc_info=True)
-                # 记录失败的账号
-                self.account_results.append({
-                    'account_name': account.get('name', f'账号{idx}'),
-                    'success': False,
-                    'error': str(e)
-                })
-                continue
+        # 处理每个账号（按配置的并发数执行，结果按账号顺序收集）
+        self.account_results.extend(run_accounts(
+            self.accounts,
+            self.process_account,
+            concurrency=self.concurrency,
+            delay_range=DELAY_BETWEEN_ACCOUNTS,
+            on_error=lambda account, idx, e: {
+                'account_name': account.get('name', f'账号{idx}'),
+                'success': False,
+                'error': str(e)
+            },
+            run_logger=logger
+        ))
 
         end_time = datetime.now()
         duration = end_time - start_time
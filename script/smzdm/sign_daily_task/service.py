@@ -385,81 +385,29 @@ class SmzdmService:
 
     # ==================== 关注用户业务逻辑 ====================
 
-    def execute_follow_task(self, max_follow_count: int = 5) -> Dict[str, int]:
+    def execute_follow_task(
+        self,
+        max_follow_count: int = 5,
+        max_in_flight: Optional[int] = None,
+        min_dwell: Optional[float] = None
+    ) -> Dict[str, int]:
         """
-        执行关注任务（关注用户后立即取消关注）
+        执行关注任务（关注用户后再取消关注），多个用户流水线并行处理
 
         Args:
             max_follow_count: 最大关注用户数量，默认为5
+            max_in_flight: 同时进行中的关注数量上限，None 使用API默认值
+            min_dwell: 关注后到取消关注的最短间隔（秒），None 使用API默认值
 
         Returns:
             执行统计字典 {success: 成功数, fail: 失败数}
         """
-        logger.info(f"开始执行关注任务，最大关注用户数: {max_follow_count}")
-
-        success_count = 0
-        fail_count = 0
-
-        try:
-            # 获取用户列表
-            user_data = self.api.get_follow_user_list()
-            if not user_data:
-                logger.error("获取用户列表失败")
-                return {'success': 0, 'fail': 1}
-
-            # 解析用户列表
-            rows = user_data.get('rows', [])
-            if not rows:
-                logger.warning("用户列表为空")
-                return {'success': 0, 'fail': 1}
-
-            logger.info(f"获取到 {len(rows)} 个用户")
-
-            processed_count = 0
-            for user_row in rows:
-                if processed_count >= max_follow_count:
-                    break
-
-                # 提取用户信息
-                article_title = user_row.get('article_title', '')
-                user_id = user_row.get('keyword_id', '')
-
-                if not article_title or not user_id:
-                    logger.warning(f"用户信息不完整，跳过: {user_row}")
-                    continue
-
-                logger.info(f"  [{processed_count + 1}] 处理用户: {article_title}")
-
-                # 执行关注
-                if self.api.follow_user(article_title, user_id):
-                    logger.info(f"    ✅ 关注成功")
-
-                    # 等待一下再取消关注
-                    time.sleep(2)
-
-                    # 取消关注
-                    if self.api.unfollow_user(article_title, user_id):
-                        logger.info(f"    ✅ 取消关注成功")
-                        success_count += 1
-                    else:
-                        logger.info(f"    ❌ 取消关注失败")
-                        fail_count += 1
-                else:
-                    logger.info(f"    ❌ 关注失败")
-                    fail_count += 1
-
-                processed_count += 1
-
-                # 处理间隔
-                if processed_count < max_follow_count:
-                    time.sleep(3)
-
-            logger.info(f"关注任务执行完成: 成功 {success_count} 个, 失败 {fail_count} 个")
-            return {'success': success_count, 'fail': fail_count}
-
-        except Exception as e:
-            logger.error(f"执行关注任务时发生错误: {str(e)}")
-            return {'success': success_count, 'fail': fail_count + 1}
+        options = {}
+        if max_in_flight is not None:
+            options['max_in_flight'] = max_in_flight
+        if min_dwell is not None:
+            options['min_dwell'] = min_dwell
+        return self.api.execute_follow_task(max_follow_count, **options)
 
     # ==================== 每日签到业务逻辑 ====================
 
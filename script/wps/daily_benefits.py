@@ -42,6 +42,7 @@ from logging_utils import (
     log_task_result,
 )
 from notification import send_notification, NotificationSound
+from token_config import get_platform_config
 
 
 class DailyBenefitsAPI:
@@ -784,12 +785,10 @@ class DailyBenefitsTasks:
             raise FileNotFoundError(f"配置文件不存在: {self.config_path}")
 
         try:
-            with open(self.config_path, "r", encoding="utf-8") as file:
-                config_data = json.load(file)
+            wps_config = get_platform_config("wps", config_path=self.config_path)
         except json.JSONDecodeError as exc:
             raise ValueError(f"配置文件 JSON 解析失败: {exc}") from exc
 
-        wps_config = config_data.get("wps", {})
         self.accounts = wps_config.get("accounts", [])
 
         if self.accounts:
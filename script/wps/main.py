@@ -18,7 +18,6 @@ Date: 2026-03-11
 
 import logging
 import random
-import json
 import sys
 import time
 from pathlib import Path
@@ -39,7 +38,9 @@ from logging_utils import (
     log_page_switch,
     log_startup,
 )
+from account_runner import resolve_concurrency, run_accounts
 from notification import send_notification, NotificationSound
+from token_config import get_platform_config
 from task_center import WPSTaskCenterPage
 
 
@@ -53,6 +54,7 @@ class WPSMultiPageRunner:
             self.config_path = Path(config_path)
 
         self.logger = self._setup_logger()
+        self.concurrency = 1
         self.accounts: List[Dict[str, Any]] = self._load_accounts()
         self.account_results: List[Dict[str, Any]] = []
         self.page_tasks: List[Tuple[str, Type]] = [
@@ -69,11 +71,9 @@ class WPSMultiPageRunner:
         if not self.config_path.exists():
             raise FileNotFoundError(f"配置文件不存在: {self.config_path}")
 
-        with open(self.config_path, "r", encoding="utf-8") as file:
-            config_data = json.load(file)
-
-        wps_config = config_data.get("wps", {})
+        wps_config = get_platform_config("wps", config_path=self.config_path)
         accounts = wps_config.get("accounts", [])
+        self.concurrency = resolve_concurrency("wps", wps_config)
         if accounts:
             self.logger.info("成功加载 %s 个 WPS 账号", len(accounts))
         else:
@@ -90,8 +90,54 @@ class WPSMultiPageRunner:
         keywords = ("Token已过期", "ErrNotLogin", "userNotLogin", "未登录", "请重新登录")
         return any(keyword in message for keyword in keywords)
 
+    def _process_account(self, account_info: Dict[str, Any], page_runners: List[Tuple[str, Any]]) -> Dict[str, Any]:
+        """按页面顺序执行单个账号的所有页面任务。"""
+        account_name = account_info.get("account_name", "未命名账号")
+        account_result = {
+            "account_name": account_name,
+            "success": True,
+            "pages": []
+        }
+
+        account_logger = bind_logger(self.logger, account=account_name)
+        log_account_start(self.logger, account_name)
+
+        for page_index, (page_name, page_runner) in enumerate(page_runners):
+            page_logger = bind_logger(account_logger, step=page_name)
+            try:
+                page_result = page_runner.process_account(account_info)
+            except Exception as exc:
+                page_result = {
+                    "account_name": account_name,
+                    "success": False,
+                    "message": f"{page_name}执行异常: {exc}"
+                }
+                self.logger.error("%s 页面执行失败: %s", page_name, exc)
+                import traceback
+                traceback.print_exc()
+
+            account_result["pages"].append({
+                "page_name": page_name,
+                "result": page_result
+            })
+
+            if not page_result.get("success", False):
+                account_result["success"] = False
+
+            if self._is_auth_expired_result(page_result):
+                self.logger.warning("[%s] 登录态已失效，停止执行该账号后续页面任务", account_name)
+                break
+
+            if page_index < len(page_runners) - 1:
+                delay = random.uniform(1, 2)
+                self.logger.info("")
+                time.sleep(delay)
+
+        log_account_end(self.logger, account_name, account_result["success"])
+        return account_result
+
     def run(self) -> None:
-        """按账号顺序执行所有页面任务。"""
+        """按配置的并发数执行所有账号的页面任务。"""
         log_startup(self.logger, len(self.accounts))
         self.logger.info("")
 
@@ -107,56 +153,13 @@ class WPSMultiPageRunner:
             for page_name, task_class in self.page_tasks
         ]
 
-        for account_index, account_info in enumerate(self.accounts):
-            account_name = account_info.get("account_name", "未命名账号")
-            account_result = {
-                "account_name": account_name,
-                "success": True,
-                "pages": []
-            }
-
-            account_logger = bind_logger(self.logger, account=account_name)
-            log_account_start(self.logger, account_name)
-
-            for page_index, (page_name, page_runner) in enumerate(page_runners):
-                page_logger = bind_logger(account_logger, step=page_name)
-                try:
-                    page_result = page_runner.process_account(account_info)
-                except Exception as exc:
-                    page_result = {
-                        "account_name": account_name,
-                        "success": False,
-                        "message": f"{page_name}执行异常: {exc}"
-                    }
-                    self.logger.error("%s 页面执行失败: %s", page_name, exc)
-                    import traceback
-                    traceback.print_exc()
-
-                account_result["pages"].append({
-                    "page_name": page_name,
-                    "result": page_result
-                })
-
-                if not page_result.get("success", False):
-                    account_result["success"] = False
-
-                if self._is_auth_expired_result(page_result):
-                    self.logger.warning("[%s] 登录态已失效，停止执行该账号后续页面任务", account_name)
-                    break
-
-                if page_index < len(page_runners) - 1:
-                    delay = random.uniform(1, 2)
-                    self.logger.info("")
-                    time.sleep(delay)
-
-            self.account_results.append(account_result)
-            if account_index < len(self.accounts) - 1:
-                delay = random.uniform(3, 6)
-                log_account_end(self.logger, account_name, account_result["success"], delay)
-                self.logger.info("")
-                time.sleep(delay)
-            else:
-                log_account_end(self.logger, account_name, account_result["success"])
+        self.account_results.extend(run_accounts(
+            self.accounts,
+            lambda account_info: self._process_account(account_info, page_runners),
+            concurrency=self.concurrency,
+            delay_range=(3, 6),
+            run_logger=self.logger
+        ))
 
         self._print_summary()
         self._send_notification()
@@ -41,6 +41,7 @@ project_root = Path(__file__).resolve().parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from notification import send_notification, NotificationSound
+from token_config import get_platform_config
 
 
 class WPSTaskCenterPage:
@@ -72,8 +73,7 @@ class WPSTaskCenterPage:
             raise FileNotFoundError(f"配置文件不存在: {self.config_path}")
 
         try:
-            with open(self.config_path, "r", encoding="utf-8") as file:
-                config_data = json.load(file)
+            wps_config = get_platform_config("wps", config_path=self.config_path)
         except json.JSONDecodeError as exc:
             self.logger.error("配置文件 JSON 解析失败: %s", exc)
             raise
@@ -81,7 +81,6 @@ class WPSTaskCenterPage:
             self.logger.error("读取配置文件失败: %s", exc)
             raise
 
-        wps_config = config_data.get("wps", {})
         self.accounts = wps_config.get("accounts", [])
 
         if self.accounts:
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+账号配置读取模块
+
+统一读取 config/token.json：
+- 同一进程内只解析一次，按文件修改时间缓存，文件更新后自动重新读取
+- 按平台节点返回配置副本，各平台修改自己的配置不会影响其他平台
+- 可传入账号配置类的构造函数，把账号字典校验为类型化的账号对象，校验失败的账号记录日志后跳过
+
+使用示例：
+    from token_config import get_platform_accounts, get_platform_config
+
+    sf_config = get_platform_config("sf")
+    accounts = get_platform_accounts("sf", factory=SFAccountConfig.from_dict)
+    wx_config = get_platform_config("huaruntong", "huaruntong_wx")
+
+Author: ZaiZaiCat
+Date: 2026-10-17
+"""
+
+import copy
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+logger = logging.getLogger("TokenConfig")
+
+T = TypeVar("T")
+
+TOKEN_CONFIG_FILE = Path(__file__).parent / "config" / "token.json"
+
+# 已解析的配置缓存：{文件绝对路径: (修改时间, 配置内容)}
+_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_token_config(config_path: Union[str, Path, None] = None) -> Dict[str, Any]:
+    """
+    读取 token.json，文件未修改时直接返回缓存
+
+    返回的字典在调用方之间共享，请勿修改；需要修改时使用 get_platform_config 获取副本。
+
+    Args:
+        config_path: 配置文件路径，默认为项目根目录下的config/token.json
+
+    Returns:
+        Dict: 配置内容
+
+    Raises:
+        FileNotFoundError: 配置文件不存在
+        json.JSONDecodeError: 配置文件格式错误
+    """
+    path = Path(config_path) if config_path else TOKEN_CONFIG_FILE
+    key = str(path.resolve())
+    mtime = path.stat().st_mtime_ns
+
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        _cache[key] = (mtime, config)
+        logger.debug(f"已解析配置文件: {path}")
+        return config
+
+
+def get_platform_config(*keys: str, config_path: Union[str, Path, None] = None) -> Dict[str, Any]:
+    """
+    获取平台配置节点的副本
+
+    Args:
+        *keys: 配置节点路径，如 "sf" 或 "huaruntong", "999"
+        config_path: 配置文件路径
+
+    Returns:
+        Dict: 平台配置节点副本，不存在时返回空字典
+    """
+    section: Any = load_token_config(config_path)
+    for key in keys:
+        section = section.get(key, {}) if isinstance(section, dict) else {}
+    if not isinstance(section, dict):
+        return {}
+    return copy.deepcopy(section)
+
+
+def get_platform_accounts(
+    *keys: str,
+    factory: Optional[Callable[[Dict[str, Any]], T]] = None,
+    config_path: Union[str, Path, None] = None,
+    load_logger: Optional[logging.Logger] = None,
+) -> List[Any]:
+    """
+    获取平台的账号列表
+
+    Args:
+        *keys: 配置节点路径
+        factory: 账号配置类的构造函数，如 SFAccountConfig.from_dict；为 None 时返回账号字典
+        config_path: 配置文件路径
+        load_logger: 记录账号校验失败的日志器
+
+    Returns:
+        List: 账号列表，校验失败的账号会被跳过
+    """
+    accounts = get_platform_config(*keys, config_path=config_path).get("accounts", [])
+    if factory is None:
+        return accounts
+
+    log = load_logger or logger
+    result = []
+    for raw_account in accounts:
+        try:
+            result.append(factory(raw_account))
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            log.error(f"账号配置异常: {e}")
+    return result
+
+
+def clear_cache() -> None:
+    """清空配置缓存"""
+    with _cache_lock:
+        _cache.clear()